@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures encoding and decoding of deeply nested documents, which the
+builtin json package rejects with a ``RecursionError``.
+
+Run it from the repository root (or with *Jsoner* installed)::
+
+    $ PYTHONPATH=. python benchmarks/bench_deep.py
+"""
+
+import json
+import timeit
+
+import jsoner
+
+
+class Node:
+    def __init__(self, child):
+        self.child = child
+
+    def to_dict(self) -> dict:
+        return {'child': self.child}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Node':
+        return cls(d['child'])
+
+
+def nested_lists(depth: int) -> list:
+    doc = inner = []  # type: list
+    for _ in range(depth):
+        inner.append([])
+        inner = inner[0]
+    return doc
+
+
+def linked_nodes(depth: int) -> Node:
+    node = None
+    for _ in range(depth):
+        node = Node(node)
+    return node
+
+
+def measure(label: str, func) -> None:
+    try:
+        seconds = min(timeit.repeat(func, number=1, repeat=3))
+    except RecursionError:
+        print('{:<40} RecursionError'.format(label))
+        return
+    print('{:<40} {:8.2f} ms'.format(label, seconds * 1000))
+
+
+def main() -> None:
+    for depth in (500, 10000, 100000):
+        lists, nodes = nested_lists(depth), linked_nodes(depth)
+        lists_data, nodes_data = jsoner.dumps(lists), jsoner.dumps(nodes)
+        print('depth {}'.format(depth))
+
+        measure('json.dumps lists', lambda: json.dumps(lists))
+        measure('jsoner.dumps lists', lambda: jsoner.dumps(lists))
+        measure('jsoner.dumps lists, iterative', lambda: jsoner.dumps(lists, iterative=True))
+        measure('jsoner.dumps objects', lambda: jsoner.dumps(nodes))
+        measure('json.loads lists', lambda: json.loads(lists_data))
+        measure('jsoner.loads lists', lambda: jsoner.loads(lists_data))
+        measure('jsoner.loads lists, iterative', lambda: jsoner.loads(lists_data, iterative=True))
+        measure('jsoner.loads objects', lambda: jsoner.loads(nodes_data))
+        print()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures writing UTF-8 encoded json into a reused buffer with
+``dump_into`` against ``dumps`` followed by ``encode``.
+
+Run it from the repository root (or with *Jsoner* installed)::
+
+    $ PYTHONPATH=. python benchmarks/bench_dump_into.py
+"""
+
+import timeit
+
+import jsoner
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def to_dict(self) -> dict:
+        return {'x': self.x, 'y': self.y}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Point':
+        return cls(**d)
+
+
+def message(i: int) -> dict:
+    return {'id': i, 'name': 'sensor-{}'.format(i), 'value': i * 0.5, 'point': Point(i, -i), 'tags': ['a', 'ä']}
+
+
+def measure(label: str, func, number: int) -> None:
+    seconds = min(timeit.repeat(func, number=number, repeat=3))
+    print('{:<40} {:8.2f} ms'.format(label, seconds * 1000))
+
+
+def main() -> None:
+    small = message(1)
+    big = [message(i) for i in range(100000)]
+    buffer = bytearray()
+    view = memoryview(bytearray(len(jsoner.dumps_bytes(big)) + 1))
+
+    def extend(obj):
+        buffer.clear()
+        buffer.extend(jsoner.dumps(obj).encode('utf-8'))
+
+    def dump(obj):
+        buffer.clear()
+        jsoner.dump_into(obj, buffer)
+
+    for label, obj, number in (('small message x 20000', small, 20000), ('100000 messages', big, 1)):
+        print(label)
+        measure('dumps(obj).encode() + extend', lambda: extend(obj), number)
+        measure('dump_into(obj, bytearray)', lambda: dump(obj), number)
+        measure('dump_into(obj, memoryview)', lambda: jsoner.dump_into(obj, view), number)
+
+
+if __name__ == '__main__':
+    main()
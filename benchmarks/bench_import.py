@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the time of ``import jsoner`` with ``python -X importtime`` and
+checks that no heavy module is imported with it. The script exits with
+status 1 if one of them is imported or if the import takes longer than the
+budget.
+
+Run it from the repository root (or with *Jsoner* installed)::
+
+    $ PYTHONPATH=. python benchmarks/bench_import.py --budget 40
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+
+HEAVY_MODULES = ('pydoc', 'inspect', 'ast', 'dataclasses', 'hashlib', 'asyncio', 'multiprocessing',
+                 'concurrent.futures', 'numpy')
+
+
+def import_times(module: str, env: dict) -> dict:
+    """
+    Returns the cumulative import time in microseconds of every module which
+    is imported by ``import module``.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+                            env=env, stderr=subprocess.PIPE, universal_newlines=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--budget', type=float, default=None, help='the maximum import time in ms')
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache:
+        # the bytecode is cached like in an installed package
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+        env.pop('PYTHONDONTWRITEBYTECODE', None)
+        import_times('jsoner', env)
+        runs = [import_times('jsoner', env) for _ in range(args.repeat)]
+
+    best = min(runs, key=lambda times: times['jsoner'])
+    print('import jsoner {:8.2f} ms'.format(best['jsoner'] / 1000))
+    for name, cumulative in sorted(best.items(), key=lambda item: -item[1])[:10]:
+        print('  {:<32} {:8.2f} ms'.format(name, cumulative / 1000))
+
+    failed = False
+    heavy = [name for name in HEAVY_MODULES if name in best]
+    if heavy:
+        print('heavy modules are imported: {}'.format(', '.join(heavy)))
+        failed = True
+    if args.budget is not None and best['jsoner'] / 1000 > args.budget:
+        print('the import takes longer than {} ms'.format(args.budget))
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
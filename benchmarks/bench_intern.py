@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+
+"""
+Measures the memory of decoded payloads with and without string interning.
+
+Run it from the repository root (or with *Jsoner* installed)::
+
+    $ PYTHONPATH=. python benchmarks/bench_intern.py
+"""
+
+import json
+import timeit
+import tracemalloc
+
+import jsoner
+
+
+def payload(n: int = 100000) -> str:
+    statuses = ['pending', 'paid', 'shipped', 'cancelled']
+    currencies = ['EUR', 'USD', 'GBP', 'CHF', 'JPY']
+    rows = [{'id': i, 'status': statuses[i % 4], 'currency': currencies[i % 5],
+             'tags': ['priority-{}'.format(i % 3), 'region-{}'.format(i % 7)]} for i in range(n)]
+    return json.dumps(rows)
+
+
+def measure(label: str, func) -> None:
+    tracemalloc.start()
+    result = func()
+    size, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    seconds = min(timeit.repeat(func, number=1, repeat=3))
+    print('{:<32} {:8.2f} ms {:8.1f} MB retained {:8.1f} MB peak'.format(
+        label, seconds * 1000, size / 2 ** 20, peak / 2 ** 20))
+
+
+def main() -> None:
+    data = payload()
+    print('payload ({} bytes)'.format(len(data)))
+    measure('json.loads', lambda: json.loads(data))
+    measure('jsoner.loads', lambda: jsoner.loads(data))
+    measure('jsoner.loads(intern=True)', lambda: jsoner.loads(data, intern=True))
+
+
+if __name__ == '__main__':
+    main()
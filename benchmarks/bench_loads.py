@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compares the decoding speed of :func:`json.loads` and :func:`jsoner.loads`.
+
+Run it from the repository root (or with *Jsoner* installed)::
+
+    $ PYTHONPATH=. python benchmarks/bench_loads.py
+"""
+
+import json
+import timeit
+
+import jsoner
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def to_dict(self) -> dict:
+        return {'x': self.x, 'y': self.y}
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'Point':
+        return cls(**data)
+
+
+def plain_payload(n: int = 20000) -> str:
+    rows = [{'id': i, 'name': 'row {}'.format(i), 'tags': {'a': i, 'b': [i, i]}} for i in range(n)]
+    return json.dumps(rows)
+
+
+def object_payload(n: int = 20000) -> str:
+    rows = [{'id': i, 'point': Point(i, i)} for i in range(n)]
+    return jsoner.dumps(rows)
+
+
+def bench(label: str, func, number: int = 10) -> float:
+    seconds = min(timeit.repeat(func, number=number, repeat=3)) / number
+    print('{:<40} {:8.2f} ms'.format(label, seconds * 1000))
+    return seconds
+
+
+def main() -> None:
+    for name, payload in (('without envelopes', plain_payload()), ('with envelopes', object_payload())):
+        print('payload {} ({} bytes)'.format(name, len(payload)))
+        bench('json.loads', lambda: json.loads(payload))
+        bench('jsoner.loads', lambda: jsoner.loads(payload))
+        bench('jsoner.loads(fast_path=True)', lambda: jsoner.loads(payload, fast_path=True))
+        print()
+
+
+if __name__ == '__main__':
+    main()
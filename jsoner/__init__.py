@@ -10,16 +10,26 @@ __version__ = '0.2.0'
 
 from .registry import decoders
 from .registry import encoders
+from .serialization import digest
 from .serialization import dump
+from .serialization import dump_into
 from .serialization import dumps
+from .serialization import dumps_bytes
+from .serialization import estimate_size
 from .serialization import load
 from .serialization import loads
+from .stream import load_path
 
 __all__ = (
     'decoders',
     'encoders',
+    'digest',
     'dumps',
+    'dumps_bytes',
+    'estimate_size',
     'loads',
     'dump',
-    'load'
+    'dump_into',
+    'load',
+    'load_path'
 )
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+
+"""
+Concurrent resolution of ``async`` decoders.
+
+Decoders which perform I/O, e.g. to load a model by its primary key, can be
+coroutine functions::
+
+    @decoders.register(Model)
+    async def from_primary_key(pk: int, model_cls: type) -> Model:
+        return await model_cls.objects.aget(pk=pk)
+
+    obj = await async_loads(data, limit=16)
+
+:func:`async_loads` collects the awaitables returned by the decoders of a
+document and awaits them concurrently, instead of one after another. If the
+data of an object contains objects with ``async`` decoders, the object is
+revived after them. Objects which are decoded into with ``into`` and batch
+decoders are not awaited.
+"""
+
+import typing as T
+
+from .serialization import JsonDecoder
+from .serialization import _contains_pending
+from .serialization import maybe_convert_to_obj
+from .serialization import splice_pending
+
+_MISSING = object()
+
+
+class Awaiting:
+    """
+    Placeholder for an object whose decoder returned an awaitable, or whose
+    data contains such placeholders. After the document is resolved,
+    :attr:`value` holds the object.
+    """
+    __slots__ = ('primitive', 'awaitable', 'value', 'done')
+
+    def __init__(self, primitive: dict, awaitable: T.Any = None) -> None:
+        self.primitive = primitive
+        self.awaitable = awaitable
+        self.value = None  # type: T.Any
+        self.done = False
+
+
+def _is_awaitable(value: T.Any) -> bool:
+    return hasattr(type(value), '__await__')
+
+
+def _contains_awaiting(data: T.Any, unresolved: bool = False) -> bool:
+    """
+    Returns ``True`` if any :class:`Awaiting` is found within the dicts and
+    lists of ``data``. If ``unresolved`` is ``True``, resolved placeholders
+    are ignored.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Awaiting):
+            if not (unresolved and value.done):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
+def splice_awaiting(data: T.Any) -> T.Any:
+    """
+    Replaces all resolved :class:`Awaiting` placeholders within the dicts
+    and lists of ``data`` by their values. The containers are changed in
+    place.
+
+    :param data:
+    :return: The data with all placeholders replaced.
+    """
+    if isinstance(data, Awaiting):
+        return data.value
+
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()  # type: T.Iterable[T.Tuple[T.Any, T.Any]]
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, Awaiting):
+                container[key] = value.value
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return data
+
+
+class AsyncJsonDecoder(JsonDecoder):
+    """
+    Works like :class:`jsoner.serialization.JsonDecoder`, but puts
+    :class:`Awaiting` placeholders in place of the objects whose decoders
+    return awaitables. :meth:`resolve` awaits them.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.awaiting = []  # type: T.List[Awaiting]
+
+    def _convert(self, primitive: dict) -> T.Any:
+        # the objects are revived bottom-up, thus the placeholders are only
+        # searched for once there are any. Objects whose data contains
+        # objects of batch decoders are revived after the batch queue, since
+        # their decoders may return awaitables, too.
+        data = primitive.get('__json_data__')
+        if '__cls__' not in primitive and (self.awaiting and _contains_awaiting(data) or
+                                           self._batch and _contains_pending(data)):
+            item = Awaiting(primitive)
+            self.awaiting.append(item)
+            return item
+
+        obj = super()._convert(primitive)
+        if _is_awaitable(obj):
+            item = Awaiting(primitive, obj)
+            self.awaiting.append(item)
+            return item
+        return obj
+
+    async def resolve(self, obj: T.Any, limit: T.Optional[int] = None) -> T.Any:
+        """
+        Awaits the placeholders within ``obj`` and puts their values in
+        place. All awaitables which do not depend on other placeholders are
+        awaited at once.
+
+        :param obj: A document decoded by this decoder.
+        :param limit: The maximum number of awaitables which are awaited at
+            the same time. ``None`` means unlimited.
+        :return: The object with all placeholders replaced.
+        """
+        import asyncio
+
+        semaphore = asyncio.Semaphore(limit) if limit else None
+
+        async def limited(awaitable: T.Any, semaphore: asyncio.Semaphore) -> T.Any:
+            async with semaphore:
+                return await awaitable
+
+        while self.awaiting:
+            items, self.awaiting = self.awaiting, []
+            ready = [item for item in items if item.awaitable is not None]
+            awaitables = [item.awaitable if semaphore is None else limited(item.awaitable, semaphore) for item in ready]
+            for item, value in zip(ready, await asyncio.gather(*awaitables)):
+                item.awaitable = None
+                item.value = value
+                item.done = True
+
+            # the placeholders were created bottom-up, thus the data of an
+            # object is resolved before the object itself
+            for item in items:
+                if item.done:
+                    continue
+                if _contains_awaiting(item.primitive.get('__json_data__'), unresolved=True):
+                    self.awaiting.append(item)
+                    continue
+                # the batch queue of the document is resolved already
+                value = maybe_convert_to_obj(splice_pending(splice_awaiting(item.primitive)))
+                if _is_awaitable(value):
+                    item.awaitable = value
+                    self.awaiting.append(item)
+                else:
+                    item.value = value
+                    item.done = True
+
+        return splice_awaiting(obj)
+
+
+async def async_loads(s: T.Union[str, bytes], limit: T.Optional[int] = None, **kwargs) -> T.Any:
+    """
+    Deserializes ``s`` and awaits the awaitables which are returned by the
+    decoders concurrently.
+
+    Usage::
+        >>> import asyncio
+        >>> from jsoner.aio import async_loads
+        >>> asyncio.run(async_loads('{"a": [1, 2]}'))
+        {'a': [1, 2]}
+
+    :param s:
+    :param limit: The maximum number of awaitables which are awaited at the
+        same time. ``None`` means unlimited.
+    :param kwargs: Passed to :class:`AsyncJsonDecoder`. A
+        :class:`jsoner.cache.DecodeCache` keeps the resolved objects.
+    :return:
+    """
+    cache = kwargs.pop('cache', None)
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode('utf-8')
+
+    if cache is not None:
+        key = cache.key(s)
+        obj = cache.get(key, _MISSING)
+        if obj is not _MISSING:
+            return cache.copy(obj)
+
+    decoder = AsyncJsonDecoder(**kwargs)
+    obj = await decoder.resolve(decoder.decode(s), limit)
+
+    if cache is not None:
+        cache.set(key, obj, weight=len(s))
+        obj = cache.copy(obj)
+    return obj
@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+Compact numeric arrays for decoded documents.
+
+A list of numbers takes about 40 bytes per element, since every number is
+a separate object. :class:`NumericArrays` turns homogeneous lists of
+numbers into :class:`array.array`, or numpy arrays, with 8 bytes per
+element::
+
+    >>> from jsoner import loads
+    >>> from jsoner.arrays import NumericArrays
+    >>> loads('{"t": [1, 2, 3], "v": [0.5, 1]}', arrays=NumericArrays(['/*'], min_length=1))
+    {'t': array('q', [1, 2, 3]), 'v': array('d', [0.5, 1.0])}
+
+:class:`jsoner.serialization.JsonEncoder` writes these arrays as lists
+again.
+"""
+
+import typing as T
+from array import array
+
+BACKENDS = ('array', 'numpy', 'auto')
+
+
+def to_array(values: list, backend: str = 'array') -> T.Any:
+    """
+    Returns the numbers of ``values`` as array of 64 bit integers, if all
+    of them are integers, or of doubles, if they are integers or floats.
+    Other lists are returned unchanged.
+
+    Usage::
+        >>> from jsoner.arrays import to_array
+        >>> to_array([1, 2])
+        array('q', [1, 2])
+        >>> to_array([1, 'a'])
+        [1, 'a']
+
+    :param values:
+    :param backend: ``'array'`` for :class:`array.array`, ``'numpy'`` for
+        numpy arrays and ``'auto'`` for numpy arrays if numpy is installed.
+    :return:
+    """
+    types = set(map(type, values))
+    if types <= {int}:
+        code = 'q'
+    elif types <= {int, float}:
+        code = 'd'
+    else:
+        return values
+
+    if backend != 'array':
+        numpy = _import_numpy(required=backend == 'numpy')
+        if numpy is not None:
+            try:
+                return numpy.array(values, dtype=numpy.int64 if code == 'q' else numpy.float64)
+            except OverflowError:
+                return values
+
+    try:
+        return array(code, values)
+    except OverflowError:
+        # integers which do not fit into 64 bits
+        return values
+
+
+def _import_numpy(required: bool) -> T.Any:
+    try:
+        import numpy  # type: ignore
+    except ImportError:
+        if required:
+            raise
+        return None
+    return numpy
+
+
+class NumericArrays:
+    """
+    Selects the lists which :class:`jsoner.serialization.JsonDecoder`
+    turns into arrays.
+
+    :param paths: JSON pointers of the lists in the decoded document, e.g.
+        ``'/series/0/values'``. ``*`` matches every key or index, e.g.
+        ``'/series/*/values'``. The document itself is ``''``. Lists within
+        revived objects cannot be reached by a path.
+    :param types: Classes, or their paths, whose object data is converted
+        before it is passed to ``from_dict`` or to the registered decoder:
+        the data itself if it is a list or its values which are lists.
+    :param min_length: Shorter lists are kept.
+    :param backend: See :func:`to_array`.
+    """
+
+    def __init__(self, paths: T.Iterable[str] = (), types: T.Iterable[T.Union[type, str]] = (),
+                 min_length: int = 8, backend: str = 'array') -> None:
+        if backend not in BACKENDS:
+            raise ValueError('backend must be one of {}.'.format(', '.join(BACKENDS)))
+        if backend == 'numpy':
+            _import_numpy(required=True)
+
+        from .serialization import obj_spec
+        self.paths = [self._split(path) for path in paths]
+        self.types = {tp if isinstance(tp, str) else obj_spec(tp) for tp in types}
+        self.min_length = min_length
+        self.backend = backend
+
+    @staticmethod
+    def _split(path: str) -> T.List[str]:
+        if not path:
+            return []
+        if not path.startswith('/'):
+            raise ValueError('Invalid json pointer `{}`.'.format(path))
+        return [key.replace('~1', '/').replace('~0', '~') for key in path[1:].split('/')]
+
+    def convert(self, value: T.Any) -> T.Any:
+        """
+        Returns the value as array if it is a list of numbers which is long
+        enough.
+        """
+        if type(value) is list and len(value) >= self.min_length:
+            return to_array(value, self.backend)
+        return value
+
+    def apply(self, doc: T.Any) -> T.Any:
+        """
+        Converts the lists at :attr:`paths` in place and returns the
+        document.
+        """
+        for keys in self.paths:
+            doc = self._apply(doc, keys)
+        return doc
+
+    def _apply(self, value: T.Any, keys: T.List[str]) -> T.Any:
+        if not keys:
+            return self.convert(value)
+
+        key, rest = keys[0], keys[1:]
+        if isinstance(value, dict):
+            selected = list(value) if key == '*' else [key] if key in value else []  # type: T.List[T.Any]
+        elif isinstance(value, list):
+            if key == '*':
+                selected = list(range(len(value)))
+            else:
+                selected = [int(key)] if key.isdigit() and int(key) < len(value) else []
+        else:
+            return value
+
+        for selected_key in selected:
+            value[selected_key] = self._apply(value[selected_key], rest)
+        return value
+
+    def convert_envelope(self, primitive: dict) -> dict:
+        """
+        Converts the object data of an ``__obj_cls__`` envelope, if its class
+        is one of :attr:`types`.
+        """
+        if primitive.get('__obj_cls__') not in self.types:
+            return primitive
+
+        obj_data = primitive.get('__json_data__')
+        if isinstance(obj_data, dict):
+            for key, value in obj_data.items():
+                obj_data[key] = self.convert(value)
+        else:
+            primitive['__json_data__'] = self.convert(obj_data)
+        return primitive
@@ -0,0 +1,186 @@
+# -*- coding: utf-8 -*-
+
+import typing as T
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    The :class:`LRUCache` is a bounded mapping which discards the least
+    recently used entry once it holds more than ``maxsize`` entries. It
+    counts the hits and misses of :meth:`get`.
+
+    Usage::
+        >>> from jsoner.cache import LRUCache
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache['a'] = 1
+        >>> cache['b'] = 2
+        >>> cache.get('a')
+        1
+        >>> cache['c'] = 3
+        >>> cache.get('b') is None
+        True
+        >>> len(cache), cache.hits, cache.misses
+        (2, 1, 1)
+
+    :param maxsize: The maximum number of entries.
+    :param maxweight: The maximum total weight of the entries, see
+        :meth:`set`. ``None`` means unlimited.
+    """
+
+    def __init__(self, maxsize: int = 1024, maxweight: T.Optional[int] = None) -> None:
+        if maxsize < 1:
+            raise ValueError('maxsize must be at least 1.')
+        self.maxsize = maxsize
+        self.maxweight = maxweight
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()  # type: OrderedDict
+        self._weights = {}  # type: T.Dict[T.Hashable, int]
+
+    def get(self, key: T.Hashable, default: T.Any = None) -> T.Any:
+        """
+        Returns the value for ``key`` and marks it as recently used.
+
+        :param key:
+        :param default: Returned if the key is not in the cache.
+        :return:
+        """
+        try:
+            value = self._data[key]
+            self._data.move_to_end(key)
+        except KeyError:
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key: T.Hashable, value: T.Any) -> None:
+        self.set(key, value)
+
+    def set(self, key: T.Hashable, value: T.Any, weight: int = 1) -> None:
+        """
+        Adds the entry and discards the least recently used entries while
+        there are more than ``maxsize`` entries or their total weight
+        exceeds ``maxweight``. An entry which is heavier than ``maxweight``
+        is not kept at all.
+
+        :param key:
+        :param value:
+        :param weight: The weight of the entry, e.g. its size.
+        """
+        if self.maxweight is not None and weight > self.maxweight:
+            # the other entries are kept, only an outdated value is removed
+            if key in self._data:
+                del self._data[key]
+                self.weight -= self._weights.pop(key)
+            return
+        self.weight += weight - self._weights.get(key, 0)
+        self._weights[key] = weight
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while self._data and (len(self._data) > self.maxsize or
+                              self.maxweight is not None and self.weight > self.maxweight):
+            old_key, _ = self._data.popitem(last=False)
+            self.weight -= self._weights.pop(old_key)
+
+    def __contains__(self, key: T.Hashable) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def clear(self) -> None:
+        """
+        Removes all entries and resets the counters.
+        """
+        self._data.clear()
+        self._weights.clear()
+        self.weight = 0
+        self.hits = 0
+        self.misses = 0
+
+
+class DecodeCache(LRUCache):
+    """
+    The :class:`DecodeCache` keeps the results of :func:`jsoner.loads` for
+    repeated payloads, keyed by the BLAKE2 digest of the payload. The
+    weight of an entry is the length of its payload.
+
+    Usage::
+        >>> from jsoner import loads
+        >>> from jsoner.cache import DecodeCache
+        >>> cache = DecodeCache(maxsize=128, maxbytes=1 << 20)
+        >>> loads('{"a": [1, 2]}', cache=cache)
+        {'a': [1, 2]}
+        >>> loads('{"a": [1, 2]}', cache=cache)
+        {'a': [1, 2]}
+        >>> cache.hits, cache.misses
+        (1, 1)
+
+    A cache must only be used with decoders of the same options.
+
+    :param maxsize: The maximum number of entries.
+    :param maxbytes: The maximum total length of the cached payloads.
+    :param deep_copy: By default all callers get the same result, which
+        must not be changed. If ``True``, a deep copy of the cached result
+        is returned, so callers can change it. Copying takes about as long
+        as decoding the payload again.
+    """
+
+    def __init__(self, maxsize: int = 1024, maxbytes: T.Optional[int] = None, deep_copy: bool = False) -> None:
+        super().__init__(maxsize, maxweight=maxbytes)
+        self.deep_copy = deep_copy
+
+    @staticmethod
+    def key(s: T.Union[str, bytes]) -> bytes:
+        """
+        Returns the digest of the payload.
+
+        :param s:
+        :return:
+        """
+        from hashlib import blake2b
+        if isinstance(s, str):
+            s = s.encode('utf-8', 'surrogatepass')
+        return blake2b(s, digest_size=16).digest()
+
+    def copy(self, value: T.Any) -> T.Any:
+        """
+        Returns the value which is handed out to the caller.
+
+        :param value: The cached value.
+        :return: The value itself or a deep copy of it if the cache was
+            created with ``deep_copy=True``.
+        """
+        if not self.deep_copy:
+            return value
+        return _deep_copy(value)
+
+
+def _deep_copy(value: T.Any) -> T.Any:
+    """
+    Returns a deep copy of ``value`` like :func:`copy.deepcopy`. The lists
+    and dicts are walked with an explicit stack, so their depth is not
+    limited by the recursion limit. Other objects are copied by
+    :func:`copy.deepcopy`.
+    """
+    import copy
+    memo = {}  # type: T.Dict[int, T.Any]
+    root = [value]
+    # the containers and keys of the values which are still to be copied
+    stack = [(root, 0)]  # type: T.List[T.Tuple[T.Any, T.Any]]
+    while stack:
+        container, index = stack.pop()
+        value = container[index]
+        if type(value) is dict or type(value) is list:
+            result = memo.get(id(value))
+            if result is None:
+                result = memo[id(value)] = value.copy()
+                keys = result.keys() if type(result) is dict else range(len(result))
+                stack.extend((result, key) for key in keys)
+            container[index] = result
+        elif not (value is None or type(value) in (str, int, float, bool)):
+            container[index] = copy.deepcopy(value, memo)
+    return root[0]
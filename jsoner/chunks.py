@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+
+"""
+Splitting of large lists into documents under a size limit.
+
+Message brokers reject messages above a size limit. :func:`dump_chunks`
+encodes the elements of a list one by one and packs them into json arrays
+whose UTF-8 encoding stays within ``max_bytes``. :func:`load_chunks` joins
+them again::
+
+    >>> from jsoner.chunks import dump_chunks, load_chunks
+    >>> chunks = list(dump_chunks(range(10), max_bytes=12))
+    >>> chunks
+    [b'[0, 1, 2, 3]', b'[4, 5, 6, 7]', b'[8, 9]']
+    >>> load_chunks(chunks)
+    [0, 1, 2, 3, 4, 5, 6, 7, 8, 9]
+
+Each chunk is a complete *Jsoner* document, which can be decoded on its own
+with :func:`jsoner.loads`. The order of the chunks must be kept.
+:func:`jsoner.serialization.estimate_size` tells whether a payload needs to
+be split at all.
+"""
+
+import typing as T
+
+from .errors import JsonDecodingError
+from .errors import JsonEncodingError
+from .serialization import JsonDecoder
+from .serialization import JsonEncoder
+
+
+def dump_chunks(objs: T.Iterable, max_bytes: int, **kwargs) -> T.Iterator[bytes]:
+    """
+    Yields the elements of ``objs`` as UTF-8 encoded json arrays, each of
+    which takes at most ``max_bytes``. The arrays are filled in order and as
+    far as possible. The elements are encoded on their own, so batch
+    encoders and ``columnar`` only apply within an element.
+
+    :param objs:
+    :param max_bytes:
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonEncoder`.
+        ``indent`` only applies within the elements.
+    :return:
+    :raise JsonEncodingError: If an element alone exceeds ``max_bytes``.
+    """
+    encoder = JsonEncoder(**kwargs)
+    separator = encoder.item_separator.encode('utf-8')
+    parts = []  # type: T.List[bytes]
+    size = 2
+
+    for obj in objs:
+        part = encoder.encode(obj).encode('utf-8')
+        if len(part) + 2 > max_bytes:
+            msg = 'An element takes {} bytes as json array, which exceeds the limit of {} bytes.'.format(
+                len(part) + 2, max_bytes)
+            raise JsonEncodingError(msg)
+
+        added = len(part) + (len(separator) if parts else 0)
+        if size + added > max_bytes:
+            yield b'[' + separator.join(parts) + b']'
+            parts, size, added = [], 2, len(part)
+        parts.append(part)
+        size += added
+
+    if parts:
+        yield b'[' + separator.join(parts) + b']'
+
+
+def load_chunks(chunks: T.Iterable[T.Union[str, bytes]], **kwargs) -> list:
+    """
+    Decodes the chunks written by :func:`dump_chunks` and returns all
+    elements as one list.
+
+    :param chunks: The chunks in the order they were written.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    :return:
+    :raise JsonDecodingError: If a chunk is not a json array.
+    """
+    decoder = JsonDecoder(**kwargs)
+    objs = []  # type: list
+    for chunk in chunks:
+        if isinstance(chunk, (bytes, bytearray)):
+            chunk = chunk.decode('utf-8')
+        elements = decoder.decode(chunk)
+        if not isinstance(elements, list):
+            raise JsonDecodingError('The chunk is not a json array.')
+        objs.extend(elements)
+    return objs
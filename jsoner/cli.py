@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+
+"""
+The command line interface, ``python -m jsoner``.
+
+The files are streamed, i.e. top-level arrays and `JSON Lines`_ files are
+processed element by element. Files ending with ``.gz``, ``.bz2`` or ``.xz``
+are compressed, ``-`` stands for stdin or stdout::
+
+    $ python -m jsoner validate payload.json.gz
+    $ python -m jsoner convert payload.json payload.jsonl.gz --to jsonl
+    $ python -m jsoner stats payload.jsonl
+    $ python -m jsoner bench payload.json
+
+The objects are not revived, except by ``bench``, so no classes are imported
+for ``convert`` and ``stats``.
+
+.. _JSON Lines: http://jsonlines.org
+"""
+
+import argparse
+import io
+import json
+import sys
+import time
+import typing as T
+from collections import Counter
+
+from .errors import JsonerException
+from .registry import import_object
+from .serialization import _count_envelope
+from .serialization import dumps
+from .serialization import loads
+from .stream import DEFAULT_CHUNK_SIZE
+from .stream import iterload
+from .stream import iterload_lines
+
+FORMATS = ('pretty', 'compact', 'jsonl')
+
+COMPRESSIONS = {'.gz': 'gzip', '.bz2': 'bz2', '.xz': 'lzma'}
+
+_LINES_SUFFIXES = ('.jsonl', '.ndjson')
+
+
+def main(argv: T.Optional[T.List[str]] = None) -> int:
+    """
+    Runs the command line interface.
+
+    :param argv: The arguments, defaults to :data:`sys.argv`.
+    :return: The exit status.
+    """
+    parser = _parser()
+    args = parser.parse_args(argv)
+    if not hasattr(args, 'command'):
+        parser.print_help()
+        return 2
+
+    try:
+        return args.command(args)
+    except (JsonerException, ValueError, OSError) as error:
+        print('error: {}'.format(error), file=sys.stderr)
+        return 1
+
+
+def _parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m jsoner', description='Inspect and convert jsoner payloads.')
+    subparsers = parser.add_subparsers()
+
+    validate_parser = subparsers.add_parser('validate', help='check the syntax and the classes of the envelopes')
+    validate_parser.add_argument('input')
+    validate_parser.add_argument('--lines', action='store_true', help='the input is a JSON Lines file')
+    validate_parser.set_defaults(command=validate)
+
+    convert_parser = subparsers.add_parser('convert', help='convert between pretty, compact and JSON Lines')
+    convert_parser.add_argument('input')
+    convert_parser.add_argument('output')
+    convert_parser.add_argument('--to', choices=FORMATS, default='compact')
+    convert_parser.add_argument('--lines', action='store_true', help='the input is a JSON Lines file')
+    convert_parser.add_argument('--compress', choices=sorted(COMPRESSIONS.values()),
+                                help='defaults to the suffix of the output')
+    convert_parser.set_defaults(command=convert)
+
+    stats_parser = subparsers.add_parser('stats', help='count the records and objects per class')
+    stats_parser.add_argument('input')
+    stats_parser.add_argument('--lines', action='store_true', help='the input is a JSON Lines file')
+    stats_parser.set_defaults(command=stats)
+
+    bench_parser = subparsers.add_parser('bench', help='measure the decoding and encoding throughput')
+    bench_parser.add_argument('input')
+    bench_parser.add_argument('--number', type=int, default=3, help='the number of runs')
+    bench_parser.add_argument('--lines', action='store_true', help='the input is a JSON Lines file')
+    bench_parser.set_defaults(command=bench)
+
+    return parser
+
+
+def validate(args: argparse.Namespace) -> int:
+    """
+    Checks that the input is valid json and that the classes of all
+    envelopes can be imported.
+    """
+    counter = _EnvelopeCounter()
+    with _open_input(args.input) as fp:
+        records = sum(1 for _ in _records(fp, _is_lines(args), counter))
+
+    missing = []
+    for path in sorted(counter.classes):
+        try:
+            import_object(path)
+        except ImportError:
+            missing.append(path)
+
+    for path in missing:
+        print('cannot import `{}` ({} objects)'.format(path, counter.classes[path]))
+    print('{} records, {} objects, {} classes, {} not importable'.format(
+        records, sum(counter.classes.values()), len(counter.classes), len(missing)))
+    return 1 if missing else 0
+
+
+def convert(args: argparse.Namespace) -> int:
+    """
+    Converts the input into pretty or compact json or into JSON Lines.
+    """
+    indent = 2 if args.to == 'pretty' else None
+    separators = (',', ': ') if args.to == 'pretty' else (',', ':')
+
+    with _open_input(args.input) as fp, _open_output(args.output, args.compress) as out:
+        kind, records = _read(fp, _is_lines(args))
+        if args.to == 'jsonl':
+            if kind == 'document':
+                records = iter([next(records)])
+            for record in records:
+                out.write(json.dumps(record, separators=separators, ensure_ascii=False))
+                out.write('\n')
+        elif kind == 'document':
+            out.write(json.dumps(next(records), indent=indent, separators=separators, ensure_ascii=False))
+            out.write('\n')
+        else:
+            _write_array(out, records, indent, separators)
+    return 0
+
+
+def stats(args: argparse.Namespace) -> int:
+    """
+    Prints the number of records and the number of objects per class.
+    """
+    counter = _EnvelopeCounter()
+    with _open_input(args.input) as fp:
+        records = sum(1 for _ in _records(fp, _is_lines(args), counter))
+
+    print('{} records'.format(records))
+    if counter.classes:
+        width = max(len(path) for path in counter.classes)
+        for path, count in counter.classes.most_common():
+            print('{:<{}} {:>10}'.format(path, width, count))
+    return 0
+
+
+def bench(args: argparse.Namespace) -> int:
+    """
+    Measures how fast the input is decoded and encoded again.
+    """
+    with _open_input(args.input) as fp:
+        data = fp.read().decode('utf-8-sig')
+
+    lines = _is_lines(args)
+    documents = [line for line in data.splitlines() if line.strip()] if lines else [data]
+    size = len(data.encode('utf-8'))
+
+    def decode_json() -> T.List[T.Any]:
+        return [json.loads(document) for document in documents]
+
+    def decode_jsoner() -> T.List[T.Any]:
+        return [loads(document) for document in documents]
+
+    objs = decode_jsoner()
+
+    def encode_jsoner() -> T.List[str]:
+        return [dumps(obj) for obj in objs]
+
+    print('{} documents, {} bytes'.format(len(documents), size))
+    for label, func in (('json.loads', decode_json), ('jsoner.loads', decode_jsoner),
+                        ('jsoner.dumps', encode_jsoner)):
+        seconds = min(_timed(func) for _ in range(args.number))
+        print('{:<16} {:10.2f} ms {:10.2f} MB/s'.format(label, seconds * 1000, size / 2 ** 20 / seconds))
+    return 0
+
+
+def _timed(func: T.Callable) -> float:
+    start = time.perf_counter()
+    func()
+    return time.perf_counter() - start
+
+
+class _EnvelopeCounter:
+    """
+    An object hook which counts the objects per class without reviving them.
+    """
+
+    def __init__(self) -> None:
+        self.classes = Counter()  # type: Counter
+
+    def __call__(self, primitive: dict) -> dict:
+        counted = _count_envelope(primitive)
+        if counted is not None:
+            self.classes[counted[0]] += counted[1]
+        return primitive
+
+
+def _records(fp: io.BufferedReader, lines: bool,
+             object_hook: T.Optional[T.Callable] = None) -> T.Iterator[T.Any]:
+    return _read(fp, lines, object_hook)[1]
+
+
+def _read(fp: io.BufferedReader, lines: bool,
+          object_hook: T.Optional[T.Callable] = None) -> T.Tuple[str, T.Iterator[T.Any]]:
+    """
+    Returns the kind of the input, ``'lines'``, ``'array'`` or
+    ``'document'``, and an iterator over its records. The records are not
+    revived.
+    """
+    kwargs = {'object_hook': object_hook or _keep}  # type: T.Dict[str, T.Any]
+    if lines:
+        return 'lines', iterload_lines(fp, **kwargs)
+
+    if fp.peek(3)[:3] == b'\xef\xbb\xbf':
+        fp.read(3)
+    head = fp.peek(DEFAULT_CHUNK_SIZE).lstrip()
+    if head.startswith(b'['):
+        return 'array', iterload(fp, **kwargs)
+    return 'document', iter([loads(fp.read().decode('utf-8'), **kwargs)])
+
+
+def _keep(primitive: dict) -> dict:
+    return primitive
+
+
+def _write_array(out: T.TextIO, records: T.Iterator[T.Any], indent: T.Optional[int],
+                 separators: T.Tuple[str, str]) -> None:
+    prefix = '\n' + ' ' * indent if indent else ''
+    out.write('[')
+    first = True
+    for record in records:
+        if not first:
+            out.write(separators[0])
+        first = False
+        text = json.dumps(record, indent=indent, separators=separators, ensure_ascii=False)
+        # json strings cannot contain line breaks, thus all of them are indentation
+        out.write(prefix + text.replace('\n', prefix))
+    out.write('\n]\n' if indent and not first else ']\n')
+
+
+def _is_lines(args: argparse.Namespace) -> bool:
+    path = args.input
+    for suffix in COMPRESSIONS:
+        if path.endswith(suffix):
+            path = path[:-len(suffix)]
+    return args.lines or path.endswith(_LINES_SUFFIXES)
+
+
+def _compression(path: str) -> T.Optional[str]:
+    for suffix, compression in COMPRESSIONS.items():
+        if path.endswith(suffix):
+            return compression
+    return None
+
+
+def _open_input(path: str) -> io.BufferedReader:
+    if path == '-':
+        return io.BufferedReader(_Unclosable(sys.stdin.buffer), DEFAULT_CHUNK_SIZE)  # type: ignore
+
+    compression = _compression(path)
+    if compression is None:
+        return open(path, 'rb', buffering=DEFAULT_CHUNK_SIZE)  # type: ignore
+    module = __import__(compression)
+    return io.BufferedReader(module.open(path, 'rb'), DEFAULT_CHUNK_SIZE)
+
+
+def _open_output(path: str, compression: T.Optional[str] = None) -> T.TextIO:
+    compression = compression or (None if path == '-' else _compression(path))
+    if path == '-':
+        fp = _Unclosable(sys.stdout.buffer)  # type: T.Any
+        if compression is not None:
+            fp = __import__(compression).open(fp, 'wb')
+    elif compression is not None:
+        fp = __import__(compression).open(path, 'wb')
+    else:
+        fp = open(path, 'wb')
+    return io.TextIOWrapper(fp, encoding='utf-8', newline='\n')
+
+
+class _Unclosable(io.RawIOBase):
+    """
+    Wraps stdin or stdout, so they stay open when the wrapping file object
+    is closed.
+    """
+
+    def __init__(self, fp: T.BinaryIO) -> None:
+        self.fp = fp
+
+    def readable(self) -> bool:
+        return self.fp.readable()
+
+    def writable(self) -> bool:
+        return self.fp.writable()
+
+    def readinto(self, buffer: T.Any) -> int:
+        data = self.fp.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def write(self, data: T.Any) -> int:
+        self.fp.write(data)
+        return len(data)
+
+    def close(self) -> None:
+        self.fp.flush()
+        super().close()
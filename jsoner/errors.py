@@ -12,3 +12,16 @@ class JsonEncodingError(JsonerException):
     """
     This error occurs if *Jsoner* cannot encode your object to json.
     """
+
+
+class JsonDecodingError(JsonerException):
+    """
+    This error occurs if *Jsoner* cannot decode your json to objects.
+    """
+
+
+class LimitExceededError(JsonDecodingError):
+    """
+    This error occurs if a document exceeds one of the
+    :class:`jsoner.limits.Limits` it is decoded with.
+    """
@@ -0,0 +1,177 @@
+# -*- coding: utf-8 -*-
+
+"""
+Random access to the records of JSON Lines files.
+
+:func:`build_index` writes the byte offset of each record into a compact
+sidecar file. :class:`JsonLinesReader` uses it to seek to a record and only
+decodes the requested records::
+
+    with JsonLinesReader('archive.jsonl') as reader:
+        record = reader[7000000]
+        records = reader[100:200]
+"""
+
+import os
+import struct
+import sys
+import tempfile
+import typing as T
+from array import array
+
+from .errors import JsonDecodingError
+from .serialization import JsonDecoder
+
+INDEX_SUFFIX = '.idx'
+"""
+The suffix which is appended to the path of a JSON Lines file to get the
+path of its index.
+"""
+
+_MAGIC = b'JSNRIDX2'
+# the magic, the size and the modification time in nanoseconds of the file
+_HEADER = struct.Struct('<8sQq')
+_OFFSET_SIZE = 8
+
+
+def build_index(path: str, index_path: T.Optional[str] = None) -> array:
+    """
+    Builds the index of the JSON Lines file at ``path`` and writes it to
+    ``index_path``. Empty lines are not indexed.
+
+    The index consists of a header with the size and the modification time
+    of the indexed file and the offsets of the records as little-endian
+    unsigned 64 bit integers.
+
+    :param path:
+    :param index_path: Defaults to ``path`` + :data:`INDEX_SUFFIX`.
+    :return: The offsets of the records.
+    """
+    offsets = array('Q')
+    position = 0
+    with open(path, 'rb') as fp:
+        # taken before the file is read, so changes while it is read make
+        # the index outdated
+        mtime = os.fstat(fp.fileno()).st_mtime_ns
+        for line in fp:
+            if line.strip():
+                offsets.append(position)
+            position += len(line)
+
+    _write_index(index_path or path + INDEX_SUFFIX, position, mtime, offsets)
+    return offsets
+
+
+def read_index(path: str, index_path: T.Optional[str] = None) -> T.Optional[array]:
+    """
+    Reads the index of the JSON Lines file at ``path``.
+
+    :param path:
+    :param index_path: Defaults to ``path`` + :data:`INDEX_SUFFIX`.
+    :return: The offsets of the records or ``None`` if there is no index,
+        if the index is damaged or if the size or the modification time of
+        the file changed since the index was built.
+    """
+    try:
+        with open(index_path or path + INDEX_SUFFIX, 'rb') as fp:
+            data = fp.read()
+    except FileNotFoundError:
+        return None
+
+    if len(data) < _HEADER.size or (len(data) - _HEADER.size) % _OFFSET_SIZE:
+        return None
+    magic, size, mtime = _HEADER.unpack_from(data)
+    stat = os.stat(path)
+    if magic != _MAGIC or size != stat.st_size or mtime != stat.st_mtime_ns:
+        return None
+
+    offsets = array('Q')
+    offsets.frombytes(data[_HEADER.size:])
+    if sys.byteorder == 'big':
+        offsets.byteswap()
+    if offsets and offsets[-1] >= size:
+        return None
+    return offsets
+
+
+def _write_index(index_path: str, size: int, mtime: int, offsets: array) -> None:
+    if sys.byteorder == 'big':
+        offsets = array('Q', offsets)
+        offsets.byteswap()
+    # written to a temporary file first, so a crash never leaves a partial
+    # index behind
+    directory, name = os.path.split(os.path.abspath(index_path))
+    fd, temp_path = tempfile.mkstemp(prefix=name + '.', suffix='.tmp', dir=directory)
+    try:
+        with os.fdopen(fd, 'wb') as fp:
+            fp.write(_HEADER.pack(_MAGIC, size, mtime))
+            fp.write(offsets.tobytes())
+        os.replace(temp_path, index_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class JsonLinesReader:
+    """
+    Gives random access to the records of a JSON Lines file. The index is
+    read from the sidecar file, or built and written if it is missing or
+    outdated.
+
+    :param path:
+    :param index_path: Defaults to ``path`` + :data:`INDEX_SUFFIX`.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    """
+
+    def __init__(self, path: str, index_path: T.Optional[str] = None, **kwargs) -> None:
+        self.path = path
+        offsets = read_index(path, index_path)
+        if offsets is None:
+            offsets = build_index(path, index_path)
+        self.offsets = offsets
+        self._decoder = JsonDecoder(**kwargs)
+        self._fp = open(path, 'rb')
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, index: T.Union[int, slice]) -> T.Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[i] for i in range(start, stop, step)]
+            return list(self._read(start, stop))
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('Record index out of range.')
+        return next(self._read(index, index + 1))
+
+    def __iter__(self) -> T.Iterator[T.Any]:
+        # a separate file object, so records can be accessed while iterating
+        with open(self.path, 'rb') as fp:
+            yield from self._read(0, len(self), fp)
+
+    def _read(self, start: int, stop: int, fp: T.Optional[T.BinaryIO] = None) -> T.Iterator[T.Any]:
+        if start >= stop:
+            return
+        fp = fp or self._fp
+        fp.seek(self.offsets[start])
+        count = stop - start
+        while count:
+            line = fp.readline()
+            if not line:
+                raise JsonDecodingError('The file `{}` is shorter than its index.'.format(self.path))
+            if line.strip():
+                yield self._decoder.decode(line.decode('utf-8'))
+                count -= 1
+
+    def close(self) -> None:
+        self._fp.close()
+
+    def __enter__(self) -> 'JsonLinesReader':
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
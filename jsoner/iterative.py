@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+
+"""
+A json parser for deeply nested documents.
+
+The builtin parser is implemented recursively and raises a
+:exc:`RecursionError` for documents which are nested deeper than about
+1000 levels. This parser keeps the open arrays and objects on an explicit
+stack instead, so the nesting depth is only limited by memory. It calls the
+hooks of the given decoder like the builtin parser does, i.e. objects are
+revived bottom-up::
+
+    >>> from jsoner.iterative import decode
+    >>> from jsoner.serialization import JsonDecoder
+    >>> decode(JsonDecoder(), '{"a": [1, 2.5, null]}')
+    {'a': [1, 2.5, None]}
+    >>> doc = decode(JsonDecoder(), '[' * 100000 + ']' * 100000)
+
+:class:`jsoner.serialization.JsonDecoder` falls back to it if the builtin
+parser hits the recursion limit, or always uses it with ``iterative=True``.
+Since it is written in Python, it is more than ten times slower than the
+builtin parser for documents which the builtin parser can handle.
+"""
+
+import json
+import typing as T
+from json.decoder import WHITESPACE  # type: ignore
+from json.decoder import JSONDecodeError
+from json.decoder import scanstring  # type: ignore
+from json.scanner import NUMBER_RE
+
+# marks the frame of an array on the stack, objects hold their current key
+_ARRAY = object()
+
+_CONSTANTS = (('null', None), ('true', True), ('false', False))
+_SPECIAL_FLOATS = ('NaN', 'Infinity', '-Infinity')
+
+
+def raw_decode(decoder: json.JSONDecoder, s: str, idx: int = 0) -> T.Tuple[T.Any, int]:
+    """
+    Parses the json value which starts at ``idx`` like
+    :meth:`json.JSONDecoder.raw_decode` and returns it together with the
+    index where it ends.
+
+    :param decoder: Its hooks and options are used.
+    :param s:
+    :param idx:
+    :return:
+    :raise json.JSONDecodeError:
+    """
+    object_hook = decoder.object_hook
+    object_pairs_hook = decoder.object_pairs_hook
+    parse_float = decoder.parse_float
+    parse_int = decoder.parse_int
+    parse_constant = decoder.parse_constant
+    strict = decoder.strict
+    whitespace = WHITESPACE.match
+    memo = {}  # type: T.Dict[str, str]
+    # the values of the open arrays and the key-value pairs of the open
+    # objects, each together with the current key or _ARRAY
+    stack = []  # type: T.List[list]
+
+    while True:
+        # parse a single value, or open a container and parse its first value
+        char = s[idx:idx + 1]
+        if char == '"':
+            value, idx = scanstring(s, idx + 1, strict)
+        elif char == '[':
+            idx = whitespace(s, idx + 1).end()
+            if s[idx:idx + 1] == ']':
+                value, idx = [], idx + 1
+            else:
+                stack.append([[], _ARRAY])
+                continue
+        elif char == '{':
+            idx = whitespace(s, idx + 1).end()
+            if s[idx:idx + 1] == '}':
+                value, idx = _object([], object_hook, object_pairs_hook), idx + 1
+            else:
+                frame = [[], None]  # type: list
+                frame[1], idx = _key(s, idx, strict, memo)
+                stack.append(frame)
+                continue
+        else:
+            value, idx = _scalar(s, idx, parse_float, parse_int, parse_constant)
+
+        # add the value to the open containers and close them
+        while stack:
+            frame = stack[-1]
+            values, key = frame
+            values.append(value if key is _ARRAY else (key, value))
+            idx = whitespace(s, idx).end()
+            char = s[idx:idx + 1]
+            if char == ',':
+                idx = whitespace(s, idx + 1).end()
+                if key is not _ARRAY:
+                    frame[1], idx = _key(s, idx, strict, memo)
+                break
+            elif char == (']' if key is _ARRAY else '}'):
+                idx += 1
+                stack.pop()
+                value = values if key is _ARRAY else _object(values, object_hook, object_pairs_hook)
+            else:
+                raise JSONDecodeError("Expecting ',' delimiter", s, idx)
+        else:
+            return value, idx
+
+
+def decode(decoder: json.JSONDecoder, s: str) -> T.Any:
+    """
+    Parses the json document ``s`` like :meth:`json.JSONDecoder.decode`.
+
+    :param decoder: Its hooks and options are used.
+    :param s:
+    :return:
+    :raise json.JSONDecodeError:
+    """
+    obj, end = raw_decode(decoder, s, WHITESPACE.match(s, 0).end())
+    end = WHITESPACE.match(s, end).end()
+    if end != len(s):
+        raise JSONDecodeError('Extra data', s, end)
+    return obj
+
+
+def _key(s: str, idx: int, strict: bool, memo: T.Dict[str, str]) -> T.Tuple[str, int]:
+    """
+    Parses the key of an object member and the colon and returns the key and
+    the index of the value.
+    """
+    if s[idx:idx + 1] != '"':
+        raise JSONDecodeError('Expecting property name enclosed in double quotes', s, idx)
+    key, idx = scanstring(s, idx + 1, strict)
+    key = memo.setdefault(key, key)
+    idx = WHITESPACE.match(s, idx).end()
+    if s[idx:idx + 1] != ':':
+        raise JSONDecodeError("Expecting ':' delimiter", s, idx)
+    return key, WHITESPACE.match(s, idx + 1).end()
+
+
+def _scalar(s: str, idx: int, parse_float: T.Callable, parse_int: T.Callable,
+            parse_constant: T.Callable) -> T.Tuple[T.Any, int]:
+    match = NUMBER_RE.match(s, idx)
+    if match is not None:
+        integer, frac, exp = match.groups()
+        if frac or exp:
+            return parse_float(integer + (frac or '') + (exp or '')), match.end()
+        return parse_int(integer), match.end()
+
+    for name, value in _CONSTANTS:
+        if s.startswith(name, idx):
+            return value, idx + len(name)
+    for name in _SPECIAL_FLOATS:
+        if s.startswith(name, idx):
+            return parse_constant(name), idx + len(name)
+    raise JSONDecodeError('Expecting value', s, idx)
+
+
+def _object(pairs: T.List[T.Tuple[str, T.Any]], object_hook: T.Optional[T.Callable],
+            object_pairs_hook: T.Optional[T.Callable]) -> T.Any:
+    if object_pairs_hook is not None:
+        return object_pairs_hook(pairs)
+    obj = dict(pairs)
+    if object_hook is not None:
+        return object_hook(obj)
+    return obj
@@ -0,0 +1,139 @@
+# -*- coding: utf-8 -*-
+
+"""
+Resource limits for decoding untrusted documents.
+
+Pass :class:`Limits` to :func:`jsoner.loads` and documents which exceed
+one of them are rejected with a :class:`jsoner.errors.LimitExceededError`
+as early as possible::
+
+    >>> from jsoner import loads
+    >>> from jsoner.limits import Limits
+    >>> loads('[[[1]]]', limits=Limits(max_depth=2))
+    Traceback (most recent call last):
+    ...
+    jsoner.errors.LimitExceededError: The document is nested deeper than 2 levels.
+
+The size, the nesting depth and the length of the strings are checked
+before the document is parsed. The objects and classes are counted while
+they are revived, so no class is imported after the limit is reached.
+"""
+
+import re
+import typing as T
+from json.decoder import WHITESPACE  # type: ignore
+
+from .errors import LimitExceededError
+
+# the start of a string or a bracket
+_TOKENS = re.compile(r'["\[\]{}]')
+# a complete string, whose escape sequences are skipped
+_STRING = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+
+class Limits:
+    """
+    The limits for a single document. ``None`` means unlimited.
+
+    :param max_bytes: The maximum size of the document in UTF-8 encoded
+        bytes.
+    :param max_depth: The maximum nesting depth of arrays and objects.
+    :param max_objects: The maximum number of objects which are revived.
+        Each element of a column-wise encoded list counts.
+    :param max_classes: The maximum number of distinct class paths.
+    :param max_string_length: The maximum length of strings and keys as
+        written in the document, i.e. escape sequences count with all their
+        characters.
+    """
+
+    __slots__ = ('max_bytes', 'max_depth', 'max_objects', 'max_classes', 'max_string_length')
+
+    def __init__(self, max_bytes: T.Optional[int] = None, max_depth: T.Optional[int] = None,
+                 max_objects: T.Optional[int] = None, max_classes: T.Optional[int] = None,
+                 max_string_length: T.Optional[int] = None) -> None:
+        self.max_bytes = max_bytes
+        self.max_depth = max_depth
+        self.max_objects = max_objects
+        self.max_classes = max_classes
+        self.max_string_length = max_string_length
+
+    def __repr__(self) -> str:
+        args = ', '.join('{}={!r}'.format(name, getattr(self, name)) for name in self.__slots__)
+        return '{}({})'.format(type(self).__name__, args)
+
+    def check_size(self, s: T.Union[str, bytes]) -> None:
+        """
+        :param s:
+        :raise LimitExceededError: If ``s`` is larger than ``max_bytes``.
+        """
+        if self.max_bytes is None:
+            return
+        size = len(s)
+        # a character takes at most four bytes, thus most texts are never encoded
+        if isinstance(s, str) and self.max_bytes < size * 4 and size <= self.max_bytes:
+            size = len(s.encode('utf-8', 'surrogatepass'))
+        if size > self.max_bytes:
+            raise LimitExceededError('The document is larger than {} bytes.'.format(self.max_bytes))
+
+    def check_structure(self, s: str, idx: int = 0) -> None:
+        """
+        Checks the nesting depth and the length of the strings of the json
+        value which starts at ``idx``. The text after the value is not
+        scanned.
+
+        :param s:
+        :param idx:
+        :raise LimitExceededError:
+        """
+        max_depth, max_length = self.max_depth, self.max_string_length
+        if max_depth is None and max_length is None:
+            return
+
+        start = WHITESPACE.match(s, idx).end()
+        if s[start:start + 1] not in ('[', '{', '"'):
+            return
+
+        depth = 0
+        pos = start
+        while True:
+            match = _TOKENS.search(s, pos)
+            if match is None:
+                return
+            char = match.group()
+            pos = match.end()
+            if char == '"':
+                string = _STRING.match(s, match.start())
+                if string is None:
+                    # an unterminated string, which the parser reports; every
+                    # string is matched once, so the scan stays linear
+                    return
+                pos = string.end()
+                if max_length is not None and pos - match.start() - 2 > max_length:
+                    msg = 'The document contains a string longer than {} characters at character {}.'
+                    raise LimitExceededError(msg.format(max_length, match.start()))
+                if not depth:
+                    return
+            elif char in '[{':
+                depth += 1
+                if max_depth is not None and depth > max_depth:
+                    raise LimitExceededError('The document is nested deeper than {} levels.'.format(max_depth))
+            else:
+                depth -= 1
+                if not depth:
+                    return
+
+    def check_objects(self, count: int) -> None:
+        """
+        :param count: The number of revived objects.
+        :raise LimitExceededError: If ``count`` exceeds ``max_objects``.
+        """
+        if self.max_objects is not None and count > self.max_objects:
+            raise LimitExceededError('The document contains more than {} objects.'.format(self.max_objects))
+
+    def check_classes(self, count: int) -> None:
+        """
+        :param count: The number of distinct class paths.
+        :raise LimitExceededError: If ``count`` exceeds ``max_classes``.
+        """
+        if self.max_classes is not None and count > self.max_classes:
+            raise LimitExceededError('The document refers to more than {} classes.'.format(self.max_classes))
@@ -0,0 +1,464 @@
+# -*- coding: utf-8 -*-
+
+"""
+Parallel encoding and decoding of very large collections.
+
+:func:`dump_sharded` splits an iterable into shards. Each shard is written
+as JSON Lines file by a worker process. A manifest records the shards, their
+boundaries and the classes of the encoded objects. :class:`ShardedReader`
+loads the shards individually or all of them in parallel.
+
+:func:`loads_parallel` decodes a single large document: the elements of the
+top-level array or object are split into parts, which are parsed and revived
+by worker processes.
+
+The objects are passed to and from the worker processes with :mod:`pickle`,
+thus they must be picklable.
+"""
+
+import itertools
+import json
+import os
+import re
+import typing as T
+from concurrent.futures import FIRST_COMPLETED
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import wait
+from json.decoder import WHITESPACE  # type: ignore
+from json.decoder import scanstring  # type: ignore
+
+from .serialization import BatchQueue
+from .serialization import JsonDecoder
+from .serialization import JsonEncoder
+from .serialization import splice_pending
+from .stream import iterload_lines
+
+MANIFEST_NAME = 'manifest.json'
+"""
+The file name of the manifest within the directory of the shards.
+"""
+
+MANIFEST_FORMAT = 'jsoner-shards'
+
+PARALLEL_MIN_SIZE = 1 << 20
+"""
+Smaller documents are decoded by :func:`loads_parallel` in this process.
+"""
+
+_STRING = r'"[^"\\]*(?:\\.[^"\\]*)*"'
+# skips everything but brackets, strings are skipped as a whole
+_SKIP = re.compile(r'(?:[^"\[\]{}]+|' + _STRING + ')*', re.DOTALL)
+_SKIP_TO_COMMA = re.compile(r'(?:[^"\[\]{},]+|' + _STRING + ')*', re.DOTALL)
+_STRING_RE = re.compile(_STRING, re.DOTALL)
+
+
+def dump_sharded(iterable: T.Iterable, directory: str, shards: T.Optional[int] = None,
+                 shard_size: T.Optional[int] = None, processes: T.Optional[int] = None,
+                 prefix: str = 'shard', **kwargs) -> dict:
+    """
+    Writes the elements of ``iterable`` into JSON Lines files in
+    ``directory``, one file per shard, and writes the manifest.
+
+    Either the number of ``shards`` or the number of elements per shard
+    (``shard_size``) is given. The number of shards can only be used with
+    iterables which have a length. At most two shards per process are held
+    in memory at once.
+
+    The manifest looks like this::
+
+        {
+            "format": "jsoner-shards",
+            "version": 1,
+            "count": 2500,
+            "classes": ["myapp.models.Person"],
+            "shards": [
+                {"path": "shard-00000.jsonl", "start": 0, "stop": 1000, "count": 1000,
+                 "classes": ["myapp.models.Person"]},
+                ...
+            ]
+        }
+
+    :param iterable:
+    :param directory: The directory is created if it does not exist.
+    :param shards: The number of shards.
+    :param shard_size: The number of elements per shard.
+    :param processes: The number of worker processes, defaults to the number
+        of CPUs. With ``processes=1`` the shards are written in this process.
+    :param prefix: The prefix of the shard file names.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonEncoder`.
+    :return: The manifest.
+    :raise ValueError: If neither ``shards`` nor ``shard_size`` is given
+        or if an indent is given.
+    """
+    if kwargs.get('indent') is not None:
+        raise ValueError('JSON Lines cannot be indented.')
+    if shard_size is None:
+        if shards is None:
+            raise ValueError('Either shards or shard_size is required.')
+        total = len(iterable)  # type: ignore
+        shard_size = max(1, -(-total // shards))
+    if shard_size < 1:
+        raise ValueError('shard_size must be at least 1.')
+
+    os.makedirs(directory, exist_ok=True)
+    processes = processes or os.cpu_count() or 1
+
+    iterator = iter(iterable)
+    chunks = iter(lambda: list(itertools.islice(iterator, shard_size)), [])
+    jobs = ((os.path.join(directory, '{}-{:05d}.jsonl'.format(prefix, index)), chunk)
+            for index, chunk in enumerate(chunks))
+
+    if processes == 1:
+        results = [_write_shard(path, chunk, kwargs) for path, chunk in jobs]
+    else:
+        results = _run_bounded(_write_shard, jobs, processes, kwargs)
+
+    entries = []
+    classes = set()  # type: T.Set[str]
+    start = 0
+    for path, count, shard_classes in results:
+        entries.append({
+            'path': os.path.basename(path),
+            'start': start,
+            'stop': start + count,
+            'count': count,
+            'classes': shard_classes
+        })
+        classes.update(shard_classes)
+        start += count
+
+    manifest = {
+        'format': MANIFEST_FORMAT,
+        'version': 1,
+        'count': start,
+        'classes': sorted(classes),
+        'shards': entries
+    }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as fp:
+        json.dump(manifest, fp, indent=2)
+    return manifest
+
+
+class ShardedReader:
+    """
+    Reads the shards written by :func:`dump_sharded`.
+
+    Usage::
+
+        reader = ShardedReader('path/to/shards')
+        len(reader)              # the number of elements
+        reader.load_shard(0)     # the elements of the first shard
+        reader.load()            # all elements, loaded in parallel
+        for obj in reader:       # all elements, one shard after another
+            ...
+
+    :param path: The directory of the shards or the path of the manifest.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    """
+
+    def __init__(self, path: str, **kwargs) -> None:
+        if os.path.isdir(path):
+            path = os.path.join(path, MANIFEST_NAME)
+        with open(path, encoding='utf-8') as fp:
+            self.manifest = json.load(fp)
+        if self.manifest.get('format') != MANIFEST_FORMAT:
+            raise ValueError('`{}` is not a manifest of jsoner shards.'.format(path))
+        self.directory = os.path.dirname(path)
+        self.kwargs = kwargs
+
+    @property
+    def shards(self) -> T.List[dict]:
+        """
+        The entries of the shards in the manifest.
+        """
+        return self.manifest['shards']
+
+    @property
+    def classes(self) -> T.List[str]:
+        """
+        The paths of all classes of the encoded objects.
+        """
+        return self.manifest['classes']
+
+    def __len__(self) -> int:
+        return self.manifest['count']
+
+    def shard_path(self, index: int) -> str:
+        return os.path.join(self.directory, self.shards[index]['path'])
+
+    def load_shard(self, index: int) -> list:
+        """
+        Returns the elements of a single shard.
+
+        :param index:
+        :return:
+        """
+        return _load_shard(self.shard_path(index), self.kwargs)
+
+    def load(self, processes: T.Optional[int] = None) -> list:
+        """
+        Loads all shards in parallel and returns the elements in order.
+
+        :param processes: The number of worker processes, defaults to the
+            number of CPUs. With ``processes=1`` the shards are loaded in
+            this process.
+        :return:
+        """
+        paths = [self.shard_path(index) for index in range(len(self.shards))]
+        processes = processes or os.cpu_count() or 1
+
+        if processes == 1 or len(paths) < 2:
+            results = [_load_shard(path, self.kwargs) for path in paths]
+        else:
+            with ProcessPoolExecutor(max_workers=processes) as pool:
+                results = list(pool.map(_load_shard, paths, itertools.repeat(self.kwargs)))
+
+        return [obj for result in results for obj in result]
+
+    def __iter__(self) -> T.Iterator[T.Any]:
+        for index in range(len(self.shards)):
+            with open(self.shard_path(index), encoding='utf-8') as fp:
+                yield from iterload_lines(fp, **self.kwargs)
+
+
+class _RecordingEncoder(JsonEncoder):
+    """
+    Records the paths of the classes of all encoded objects.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.classes = set()  # type: T.Set[str]
+
+    def _default(self, obj: T.Any) -> T.Any:
+        obj_dict = super()._default(obj)
+        if isinstance(obj_dict, dict) and '__obj_cls__' in obj_dict:
+            self.classes.add(obj_dict['__obj_cls__'])
+        return obj_dict
+
+    def _encode_columnar(self, objs: T.Sequence) -> T.Any:
+        columnar = super()._encode_columnar(objs)
+        if isinstance(columnar, dict) and '__columnar_cls__' in columnar:
+            self.classes.add(columnar['__columnar_cls__'])
+        return columnar
+
+
+def _write_shard(path: str, objs: list, kwargs: dict) -> T.Tuple[str, int, T.List[str]]:
+    encoder = _RecordingEncoder(**kwargs)
+    with open(path, 'w', encoding='utf-8') as fp:
+        for obj in objs:
+            fp.write(encoder.encode(obj))
+            fp.write('\n')
+    return path, len(objs), sorted(encoder.classes)
+
+
+def _load_shard(path: str, kwargs: dict) -> list:
+    with open(path, encoding='utf-8') as fp:
+        return list(iterload_lines(fp, **kwargs))
+
+
+def _run_bounded(func: T.Callable, jobs: T.Iterable[T.Tuple[str, list]], processes: int,
+                 kwargs: dict) -> T.List[T.Any]:
+    """
+    Runs ``func`` for each job in a process pool, but only submits new jobs
+    while less than two jobs per process are pending. The results are
+    returned in the order of the jobs.
+    """
+    results = []  # type: T.List[T.Any]
+    pending = {}  # type: T.Dict[T.Any, int]
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        for index, (path, chunk) in enumerate(jobs):
+            while len(pending) >= 2 * processes:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    results.append((pending.pop(future), future.result()))
+            pending[pool.submit(func, path, chunk, kwargs)] = index
+
+        for future in pending:
+            results.append((pending[future], future.result()))
+
+    return [result for _, result in sorted(results, key=lambda item: item[0])]
+
+
+def loads_parallel(s: T.Union[str, bytes], processes: T.Optional[int] = None,
+                   min_size: int = PARALLEL_MIN_SIZE, **kwargs) -> T.Any:
+    """
+    Decodes a large json document with several processes.
+
+    The elements of the top-level array, or the members of the top-level
+    object, are split into one part per process at the commas between them.
+    Only the brackets and strings are scanned for this, the parts are
+    parsed and revived by the worker processes and the results are joined
+    in order. Other documents, documents smaller than ``min_size`` and
+    ``processes=1`` are decoded in this process.
+
+    The positions in the messages of decoding errors are relative to the
+    part in which the error occurred. The :class:`jsoner.limits.Limits` of
+    ``kwargs`` apply to the whole document: its size is checked before it
+    is split, the objects and classes are counted by the workers and the
+    totals are checked once the parts are decoded. Top-level objects are
+    not split if they are decoded with ``into``.
+
+    :param s: The document. Bytes are decoded as UTF-8.
+    :param processes: The number of worker processes, defaults to the number
+        of CPUs.
+    :param min_size: The minimum length of a document which is split.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    :return:
+    """
+    decoder = JsonDecoder(**kwargs)
+    if decoder.limits is not None:
+        decoder.limits.check_size(s)
+    if isinstance(s, (bytes, bytearray)):
+        s = s.decode('utf-8')
+    processes = processes or os.cpu_count() or 1
+
+    start = WHITESPACE.match(s, 0).end()
+    kind = s[start:start + 1]
+    boundaries = []  # type: T.List[int]
+    if processes > 1 and len(s) >= min_size and (kind == '[' or kind == '{' and kwargs.get('into') is None):
+        boundaries = _find_boundaries(s, start, processes)
+    if not boundaries:
+        return JsonDecoder(**kwargs).decode(s)
+
+    closing = ']' if kind == '[' else '}'
+    positions = [start] + boundaries + [len(s)]
+    parts = []
+    for i, (begin, end) in enumerate(zip(positions, positions[1:])):
+        part = s[begin:end] if i == 0 else kind + s[begin + 1:end]
+        parts.append(part if end == len(s) else part + closing)
+
+    with ProcessPoolExecutor(max_workers=processes) as pool:
+        results = list(pool.map(_decode_part, parts, itertools.repeat(kwargs)))
+
+    for _, objects, classes in results:
+        decoder._objects += objects
+        decoder._classes.update(classes)
+    if decoder.limits is not None:
+        decoder.limits.check_classes(len(decoder._classes))
+        decoder.limits.check_objects(decoder._objects)
+
+    if kind == '[':
+        return [obj for result, _, _ in results for obj in result]
+
+    members = {}  # type: T.Dict[str, T.Any]
+    for result, _, _ in results:
+        members.update(result)
+    # the members were revived by the workers, the object itself is revived here
+    obj = decoder.json_hook(members)
+    if decoder._batch.used:
+        decoder._batch.resolve()
+        obj = splice_pending(obj)
+    return obj
+
+
+def _skip(pattern: T.Pattern, s: str, pos: int, endpos: T.Optional[int] = None) -> int:
+    """
+    Returns the end of the match of ``pattern``, which matches the empty
+    string as well, at ``pos``.
+    """
+    match = pattern.match(s, pos, len(s) if endpos is None else endpos)
+    return pos if match is None else match.end()
+
+
+def _find_boundaries(s: str, start: int, parts: int) -> T.List[int]:
+    """
+    Returns the positions of the commas between the elements of the array
+    or object at ``start`` which split it into at most ``parts`` parts of
+    about the same length.
+    """
+    targets = [start + (len(s) - start) * i // parts for i in range(1, parts)]
+    boundaries = []  # type: T.List[int]
+    depth = 0
+    pos = start
+
+    for target in targets:
+        while True:
+            if depth == 1 and pos >= target:
+                pos = _skip(_SKIP_TO_COMMA, s, pos)
+                if s.startswith(',', pos):
+                    boundaries.append(pos)
+                    pos += 1
+                    break
+            elif depth == 1:
+                # elements without brackets are skipped up to the target
+                pos = _skip(_SKIP, s, pos, target)
+                if pos == target:
+                    continue
+                if s.startswith('"', pos):
+                    # a string which continues after the target
+                    match = _STRING_RE.match(s, pos)
+                    if match is None:
+                        return boundaries
+                    pos = match.end()
+                    continue
+            else:
+                pos = _skip(_SKIP, s, pos)
+
+            char = s[pos:pos + 1]
+            if char == '[' or char == '{':
+                depth += 1
+            elif char == ']' or char == '}':
+                depth -= 1
+                if not depth:
+                    return boundaries
+            else:
+                # the end of an invalid document, the decoder reports the error
+                return boundaries
+            pos += 1
+
+    return boundaries
+
+
+def _decode_part(part: str, kwargs: dict) -> T.Tuple[T.Any, int, T.Set[str]]:
+    """
+    Decodes a part of a document and returns it together with the number of
+    revived objects and the paths of their classes.
+    """
+    decoder = JsonDecoder(**kwargs)
+    if part.lstrip().startswith('['):
+        obj = decoder.decode(part)
+    else:
+        obj = _decode_members(decoder, part)
+    return obj, decoder._objects, decoder._classes
+
+
+def _decode_members(decoder: JsonDecoder, part: str) -> T.Dict[str, T.Any]:
+    """
+    Decodes the members of an object, but does not revive the object
+    itself. The members share a batch queue, thus each batch decoder is
+    called once per part.
+    """
+    if decoder.limits is not None:
+        decoder.limits.check_structure(part)
+    decoder._batch = BatchQueue()
+    members = {}
+    pos = WHITESPACE.match(part, part.index('{') + 1).end()
+    closed = part.startswith('}', pos)
+    if closed:
+        pos += 1
+    while not closed:
+        if not part.startswith('"', pos):
+            raise json.JSONDecodeError('Expecting property name enclosed in double quotes', part, pos)
+        key, pos = scanstring(part, pos + 1)
+        pos = WHITESPACE.match(part, pos).end()
+        if not part.startswith(':', pos):
+            raise json.JSONDecodeError("Expecting ':' delimiter", part, pos)
+        pos = WHITESPACE.match(part, pos + 1).end()
+        members[key], pos = decoder._parse(decoder, part, pos)
+        pos = WHITESPACE.match(part, pos).end()
+        char = part[pos:pos + 1]
+        if char == ',':
+            pos = WHITESPACE.match(part, pos + 1).end()
+        elif char == '}':
+            closed = True
+            pos += 1
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", part, pos)
+
+    if WHITESPACE.match(part, pos).end() != len(part):
+        raise json.JSONDecodeError('Extra data', part, pos)
+    if decoder._interned is not None:
+        members = decoder._intern_values(members)
+    return decoder._complete(members)
@@ -0,0 +1,410 @@
+# -*- coding: utf-8 -*-
+
+"""
+Delta encoding of successive states of the same object.
+
+The jsoner-encoded form of the new state is compared with the previous
+state and the difference is written as a `JSON Patch`_ (RFC 6902). The
+receiver applies the patch to its copy of the encoded state and revives the
+objects from it.
+
+Usage::
+    >>> from jsoner.patch import DeltaDecoder, DeltaEncoder
+    >>> sender, receiver = DeltaEncoder(), DeltaDecoder()
+
+    >>> receiver.apply(sender.encode({'a': 1, 'b': [1, 2]}))
+    {'a': 1, 'b': [1, 2]}
+
+    >>> patch = sender.encode({'a': 1, 'b': [1, 2, 3]})
+    >>> patch
+    '[{"op": "add", "path": "/b/2", "value": 3}]'
+    >>> receiver.apply(patch)
+    {'a': 1, 'b': [1, 2, 3]}
+
+.. _JSON Patch: https://tools.ietf.org/html/rfc6902
+"""
+
+import json
+import re
+import sys
+import typing as T
+
+from .errors import JsonDecodingError
+from .serialization import JsonDecoder
+from .serialization import dumps
+
+_ARRAY_INDEX = re.compile(r'0|[1-9][0-9]*')
+
+_PLAIN = json.JSONDecoder()
+# parses the numbers into tuples of their characters, so equal numbers of
+# different types, e.g. 1, 1.0 and true, differ and whole subtrees can be
+# compared at once
+_TOKENS = json.JSONDecoder(parse_int=tuple, parse_float=tuple, parse_constant=tuple)
+
+
+def make_patch(old: T.Any, new: T.Any, path: str = '') -> T.List[dict]:
+    """
+    Returns the list of patch operations which turn ``old`` into ``new``.
+    Both arguments must be json primitives, i.e. dicts, lists, strings,
+    numbers, booleans or ``None``.
+
+    Usage::
+        >>> from jsoner.patch import make_patch
+        >>> make_patch({'a': 1, 'b': 2}, {'a': 1, 'c': 3})
+        [{'op': 'remove', 'path': '/b'}, {'op': 'add', 'path': '/c', 'value': 3}]
+
+    :param old:
+    :param new:
+    :param path: The json pointer of ``old`` and ``new``.
+    :return:
+    """
+    return _diff(old, new, path, False)
+
+
+def _diff(old: T.Any, new: T.Any, path: str, tokens: bool) -> T.List[dict]:
+    """
+    Implements :func:`make_patch`. If ``tokens`` is ``True``, the numbers
+    of ``old`` and ``new`` were parsed by :data:`_TOKENS`. Equal values are
+    then skipped after a single comparison and the values of the operations
+    are converted back.
+    """
+    skip = _compare(old, new, 0, tokens)
+    if skip is None:
+        return []
+    value_of = _untokenize if tokens else _identity
+    ops = []  # type: T.List[dict]
+    # the pairs of values which are still to be compared, and the operations
+    # which are written after the operations of the pairs before them
+    stack = [(old, new, path, skip)]  # type: T.List[T.Any]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, dict):
+            ops.append(item)
+            continue
+
+        old, new, path, skip = item
+        if type(old) is not type(new):
+            ops.append({'op': 'replace', 'path': path, 'value': value_of(new)})
+
+        elif isinstance(old, dict):
+            work = []  # type: T.List[T.Any]
+            for key in old:
+                if key not in new:
+                    work.append({'op': 'remove', 'path': _join(path, key)})
+            for key, value in new.items():
+                if key not in old:
+                    work.append({'op': 'add', 'path': _join(path, key), 'value': value_of(value)})
+                else:
+                    child = _compare(old[key], value, skip, tokens)
+                    if child is not None:
+                        work.append((old[key], value, _join(path, key), child))
+            stack.extend(reversed(work))
+
+        elif isinstance(old, list):
+            common = min(len(old), len(new))
+            work = []
+            for i in range(common):
+                child = _compare(old[i], new[i], skip, tokens)
+                if child is not None:
+                    work.append((old[i], new[i], _join(path, i), child))
+            # remove from the end, so the indices stay valid
+            for i in reversed(range(common, len(old))):
+                work.append({'op': 'remove', 'path': _join(path, i)})
+            for i in range(common, len(new)):
+                work.append({'op': 'add', 'path': _join(path, i), 'value': value_of(new[i])})
+            stack.extend(reversed(work))
+
+        elif old != new:
+            ops.append({'op': 'replace', 'path': path, 'value': value_of(new)})
+
+    return ops
+
+
+def apply_patch(doc: T.Any, patch: T.List[dict]) -> T.Any:
+    """
+    Applies the patch operations ``add``, ``remove``, ``replace`` and
+    ``test`` to the json primitive ``doc``. ``doc`` is not changed: the
+    containers on the paths of the operations are copied, the others are
+    shared with the patched document. Thus ``doc`` stays valid if an
+    operation fails.
+
+    Usage::
+        >>> from jsoner.patch import apply_patch
+        >>> apply_patch({'a': [1]}, [{'op': 'add', 'path': '/a/-', 'value': 2}])
+        {'a': [1, 2]}
+
+    :param doc:
+    :param patch:
+    :return: The patched document.
+    :raise JsonDecodingError: If the patch is invalid or an operation cannot be
+        applied.
+    """
+    # the copied containers by their id, which also keeps them alive, so the
+    # ids are not reused
+    if not isinstance(patch, list):
+        raise JsonDecodingError('A patch must be a list of operations, got {!r}.'.format(patch))
+    copies = {}  # type: T.Dict[int, T.Any]
+    doc = _copy(doc, copies)
+
+    for operation in patch:
+        _validate(operation)
+        op = operation['op']
+        keys = _split(operation['path'])
+
+        if not keys:
+            if op in ('add', 'replace'):
+                doc = _copy(operation['value'], copies)
+            elif op == 'test':
+                _test(doc, operation)
+            else:
+                raise JsonDecodingError('Cannot apply `{}` to the whole document.'.format(op))
+            continue
+
+        parent = doc
+        try:
+            for key in keys[:-1]:
+                index = _index(parent, key)
+                parent[index] = _copy(parent[index], copies)
+                parent = parent[index]
+            key = keys[-1]
+
+            if op == 'add':
+                if isinstance(parent, list):
+                    parent.insert(_index(parent, key, add=True), operation['value'])
+                else:
+                    parent[key] = operation['value']
+            elif op == 'remove':
+                del parent[_index(parent, key)]
+            elif op == 'replace':
+                index = _index(parent, key)
+                if isinstance(parent, dict) and index not in parent:
+                    raise KeyError(key)
+                parent[index] = operation['value']
+            elif op == 'test':
+                _test(parent[_index(parent, key)], operation)
+            else:
+                raise JsonDecodingError('Unsupported patch operation `{}`.'.format(op))
+        except (KeyError, IndexError, ValueError, TypeError) as error:
+            msg = 'Cannot apply {}: {}'.format(operation, error)
+            raise JsonDecodingError(msg) from error
+
+    return doc
+
+
+class DeltaEncoder:
+    """
+    The :class:`DeltaEncoder` remembers the last encoded state and returns
+    the patch from this state to the new state as json string. The first
+    call returns a patch which replaces the whole document.
+
+    Each state is encoded by :func:`jsoner.dumps` and parsed again to be
+    compared, which takes about one and a half times as long as
+    :func:`jsoner.dumps`. The unchanged parts are compared by the builtin
+    comparison of lists and dicts, so this hardly depends on the number of
+    changes.
+
+    :param kwargs: Passed to :func:`jsoner.dumps`.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        # the last state, parsed by _TOKENS
+        self._state = None  # type: T.Any
+        self._started = False
+
+    def diff(self, obj: T.Any) -> T.List[dict]:
+        """
+        Returns the patch operations from the last state to ``obj`` and
+        remembers the encoded form of ``obj``.
+
+        :param obj:
+        :return:
+        """
+        s = dumps(obj, **self.kwargs)
+        new = _parse(s, _TOKENS)
+        if self._started:
+            patch = _diff(self._state, new, '', True)
+        else:
+            patch = [{'op': 'replace', 'path': '', 'value': _parse(s)}]
+            self._started = True
+        self._state = new
+        return patch
+
+    def encode(self, obj: T.Any) -> str:
+        """
+        Like :meth:`diff`, but returns the patch as json string.
+
+        :param obj:
+        :return:
+        """
+        return dumps(self.diff(obj))
+
+    def reset(self) -> None:
+        """
+        Forgets the last state, so the next patch contains the whole
+        document again.
+        """
+        self._state = None
+        self._started = False
+
+
+class DeltaDecoder:
+    """
+    The :class:`DeltaDecoder` is the counterpart of :class:`DeltaEncoder`.
+    It keeps the encoded state, applies the patches and revives the objects
+    from the patched state with :meth:`jsoner.serialization.JsonDecoder.revive`.
+
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`. The size and
+        structure limits apply to the patches which are passed as strings.
+    """
+
+    def __init__(self, **kwargs) -> None:
+        self.kwargs = kwargs
+        self.state = None  # type: T.Any
+        self._decoder = JsonDecoder(**kwargs)
+
+    def apply(self, patch: T.Union[str, bytes, T.List[dict]]) -> T.Any:
+        """
+        Applies the patch and returns the revived objects of the new state.
+
+        :param patch: The patch as json string, as UTF-8 encoded json or as list
+            of operations.
+        :return:
+        """
+        if isinstance(patch, bytes):
+            patch = patch.decode('utf-8')
+        if isinstance(patch, str):
+            limits = self._decoder.limits
+            if limits is not None:
+                limits.check_size(patch)
+                limits.check_structure(patch)
+            operations = _parse(patch)
+        else:
+            operations = patch
+        # the state is only replaced if all operations succeed
+        self.state = apply_patch(self.state, operations)
+        return self._decoder.revive(self.state)
+
+
+def _parse(s: T.Union[str, bytes], decoder: json.JSONDecoder = _PLAIN) -> T.Any:
+    """
+    Parses json without reviving the objects. Documents which are nested
+    too deeply for the builtin parser are parsed by :mod:`jsoner.iterative`.
+    """
+    if isinstance(s, bytes):
+        s = s.decode('utf-8')
+    try:
+        return decoder.decode(s)
+    except RecursionError:
+        from . import iterative
+        return iterative.decode(decoder, s)
+
+
+def _compare(old: T.Any, new: T.Any, skip: int, tokens: bool) -> T.Optional[int]:
+    """
+    Compares two values parsed by :data:`_TOKENS` at once.
+
+    :param old:
+    :param new:
+    :param skip: The number of levels of the parent which are still nested
+        too deeply to be compared at once.
+    :param tokens: Whether the values were parsed by :data:`_TOKENS`.
+    :return: ``None`` if the values are equal, otherwise the number of
+        levels of ``old`` and ``new`` which are not compared at once.
+    """
+    if not tokens:
+        return 0
+    if skip:
+        return skip - 1
+    try:
+        return None if old == new else 0
+    except RecursionError:
+        return sys.getrecursionlimit()
+
+
+def _identity(value: T.Any) -> T.Any:
+    return value
+
+
+def _untokenize(value: T.Any) -> T.Any:
+    """
+    Returns a copy of a value parsed by :data:`_TOKENS` with the numbers
+    converted back.
+    """
+    root = [value]
+    # the containers and keys of the values which are still to be converted
+    stack = [(root, 0)]  # type: T.List[T.Tuple[T.Any, T.Any]]
+    while stack:
+        container, index = stack.pop()
+        value = container[index]
+        if type(value) is tuple:
+            container[index] = _PLAIN.decode(''.join(value))
+        elif type(value) is dict:
+            value = container[index] = dict(value)
+            stack.extend((value, key) for key in value)
+        elif type(value) is list:
+            value = container[index] = list(value)
+            stack.extend((value, i) for i in range(len(value)))
+    return root[0]
+
+
+def _join(path: str, key: T.Union[str, int]) -> str:
+    key = str(key).replace('~', '~0').replace('/', '~1')
+    return path + '/' + key
+
+
+def _split(path: str) -> T.List[str]:
+    if not path:
+        return []
+    if not path.startswith('/'):
+        raise JsonDecodingError('Invalid json pointer `{}`.'.format(path))
+    return [key.replace('~1', '/').replace('~0', '~') for key in path[1:].split('/')]
+
+
+def _copy(value: T.Any, copies: T.Dict[int, T.Any]) -> T.Any:
+    """
+    Returns a shallow copy of a dict or list, which is only made once.
+    """
+    if id(value) in copies or not isinstance(value, (dict, list)):
+        return value
+    value = value.copy()
+    copies[id(value)] = value
+    return value
+
+
+def _index(container: T.Any, key: str, add: bool = False) -> T.Any:
+    """
+    Returns the list index or the dict key of a reference token. Indices
+    must be written without leading zeros and refer to an element, or, if
+    ``add`` is ``True``, to the end of the list, which is also written as
+    ``-``.
+    """
+    if not isinstance(container, list):
+        return key
+    if add and key == '-':
+        return len(container)
+    if _ARRAY_INDEX.fullmatch(key) is None:
+        raise IndexError('invalid array index `{}`'.format(key))
+    index = int(key)
+    if index > len(container) or index == len(container) and not add:
+        raise IndexError('array index {} out of range'.format(index))
+    return index
+
+
+def _validate(operation: T.Any) -> None:
+    """
+    Checks that ``operation`` is a dict with the members which its ``op``
+    requires. Unsupported operations are reported when they are applied.
+    """
+    if not isinstance(operation, dict):
+        raise JsonDecodingError('Invalid patch operation {!r}.'.format(operation))
+    for member in ('op', 'path'):
+        if not isinstance(operation.get(member), str):
+            raise JsonDecodingError('The patch operation {} has no `{}` string.'.format(operation, member))
+    if operation['op'] in ('add', 'replace', 'test') and 'value' not in operation:
+        raise JsonDecodingError('The patch operation {} has no `value`.'.format(operation))
+
+
+def _test(value: T.Any, operation: dict) -> None:
+    if value != operation['value']:
+        raise JsonDecodingError('Test failed: {}'.format(operation))
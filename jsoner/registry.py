@@ -1,8 +1,11 @@
 # -*- coding: utf-8 -*-
 
-import pydoc
+import builtins
+import sys
 import typing as T
 from collections import UserDict
+from functools import lru_cache
+from importlib import import_module
 from typing import Callable
 
 
@@ -70,6 +73,35 @@ class Registry(UserDict):
 
         return inner
 
+    def register_batch(self, key: T.Any) -> Callable:
+        """
+        :meth:`register_batch` works like :meth:`register`, but marks the
+        function as a batch function. A batch function is called once with
+        a list of values instead of once per value and must return a list
+        of results in the same order.
+
+        Usage::
+            >>> from jsoner.registry import Registry
+            >>> reg = Registry()
+            >>> @reg.register_batch('foo')
+            ... def foo(values):
+            ...     return [v * 2 for v in values]
+
+            >>> reg.get('foo')([1, 2])
+            [2, 4]
+            >>> isinstance(reg.get('foo'), BatchFunction)
+            True
+
+        :param key:
+        :return: Callable
+        """
+
+        def inner(func):
+            self.add(key, BatchFunction(func))
+            return func
+
+        return inner
+
     def __contains__(self, item) -> bool:
         in_regestry = super().__contains__(item)
         if not in_regestry:
@@ -81,6 +113,22 @@ class Registry(UserDict):
         return in_regestry
 
 
+class BatchFunction:
+    """
+    Wraps a function which was registered with
+    :meth:`Registry.register_batch`. Calling the wrapper calls the function.
+    """
+
+    def __init__(self, func: Callable) -> None:
+        self.func = func
+
+    def __call__(self, *args, **kwargs) -> T.Any:
+        return self.func(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return 'BatchFunction({!r})'.format(self.func)
+
+
 class SubclassRegistry(Registry):
     """
     The :class:`SubclassRegistry` will not only map a single key-value pair,
@@ -182,20 +230,56 @@ class SubclassRegistry(Registry):
             raise KeyError(msg)
 
 
+IMPORT_CACHE_SIZE = 1024
+"""
+The number of paths :func:`import_object` keeps the found objects for. The
+paths come from the decoded documents, thus the cache is bounded.
+"""
+
+
 def import_object(path: str) -> T.Any:
     """
     Import the object or raise an :exc:`ImportError` if the object is not
-    found.
+    found. Like :func:`pydoc.locate`, the longest importable prefix of the
+    path is imported as module and the rest are attributes. Paths without a
+    module refer to builtins. The objects of the :data:`IMPORT_CACHE_SIZE`
+    most recently used paths are cached.
 
     :param path: The path to the object.
     :return: The imported object.
     :raise ImportError:
     """
-    t = pydoc.locate(path)
-    if t is None:
-        msg = 'Object `{}` could not be found'.format(path)
+    if not isinstance(path, str):
+        raise ImportError('Object `{}` could not be found'.format(path))
+    return _import_object(path)
+
+
+@lru_cache(maxsize=IMPORT_CACHE_SIZE)
+def _import_object(path: str) -> T.Any:
+    msg = 'Object `{}` could not be found'.format(path)
+    parts = path.split('.')
+    if not all(parts):
         raise ImportError(msg)
-    return t
+
+    module = None
+    n = 0
+    while n < len(parts):
+        name = '.'.join(parts[:n + 1])
+        next_module = sys.modules.get(name)
+        if next_module is None:
+            try:
+                next_module = import_module(name)
+            except ImportError:
+                break
+        module, n = next_module, n + 1
+
+    obj = module if module is not None else builtins
+    for part in parts[n:]:
+        try:
+            obj = getattr(obj, part)
+        except AttributeError:
+            raise ImportError(msg)
+    return obj
 
 
 encoders = SubclassRegistry()
@@ -204,10 +288,18 @@ encoders = SubclassRegistry()
 encoding function takes an argument and returns a value which should be
 json serializable. The function which is defined in :attr:`decoders`
 must be able to recreate the object from the returned value.
+
+Encoders which are registered with :meth:`Registry.register_batch` take a
+list of objects and return the list of encoded values. They are called once
+per document with all objects found in its lists, tuples and dicts.
 """
 
 decoders = SubclassRegistry()
 """
 :attr:`decoders` contains the inverse functions-type mapping for
 :attr:`encoders`.
+
+Decoders which are registered with :meth:`Registry.register_batch` receive
+the data of all objects of a class within one document at once and return
+the list of objects. This allows to resolve all of them with a single query.
 """
@@ -2,10 +2,20 @@
 
 import abc
 import json
+import sys
 import typing as T
+from array import array
+from collections.abc import Iterator
 from functools import partial
-from inspect import signature
+from itertools import islice
 
+from .arrays import NumericArrays
+from .cache import DecodeCache
+from .cache import LRUCache
+from .errors import JsonDecodingError
+from .errors import JsonEncodingError
+from .limits import Limits
+from .registry import BatchFunction
 from .registry import decoders
 from .registry import encoders
 from .registry import import_object
@@ -57,6 +67,48 @@ class StrConvertible(abc.ABC):
         return is_str_convertible
 
 
+class ItemsConvertible(abc.ABC):
+    """
+    This abstract class implements the :meth:`iter_json_items` and
+    :meth:`from_json_items`. Every class implementing those two methods will
+    be a subclass of :class:`ItemsConvertible`. It is not necessary to
+    inherit from this class.
+
+    :meth:`iter_json_items` yields the key-value pairs of the encoded dict.
+    The values may be iterators themselves. The pairs are consumed while the
+    json is written, so objects with a large state never build a second
+    copy of it, e.g.::
+
+        class Table:
+            def iter_json_items(self):
+                yield 'name', self.name
+                yield 'rows', (row.to_dict() for row in self.rows)
+
+            @classmethod
+            def from_json_items(cls, items):
+                ...
+
+    :meth:`from_json_items` receives an iterator over the key-value pairs of
+    the decoded dict. If a class also implements :meth:`to_dict` and
+    :meth:`from_dict`, :meth:`iter_json_items` and :meth:`from_json_items`
+    are preferred.
+    """
+    @abc.abstractmethod
+    def iter_json_items(self):
+        raise NotImplementedError
+
+    @classmethod
+    @abc.abstractmethod
+    def from_json_items(cls, items: T.Iterator[T.Tuple[str, T.Any]]):
+        raise NotImplementedError
+
+    @classmethod
+    def __subclasshook__(cls, other_cls: type):
+        is_items_convertible = (hasattr(other_cls, 'iter_json_items') and
+                                hasattr(other_cls, 'from_json_items'))
+        return is_items_convertible
+
+
 class JsonerSerializable(abc.ABC):
     """
     The :class:`JsonerSerializable` serves as an abstract class
@@ -76,7 +128,8 @@ class JsonerSerializable(abc.ABC):
 
         if not is_serializable:
             is_serializable |= (issubclass(other_cls, StrConvertible) or
-                                issubclass(other_cls, DictConvertible))
+                                issubclass(other_cls, DictConvertible) or
+                                issubclass(other_cls, ItemsConvertible))
 
         return is_serializable
 
@@ -98,6 +151,22 @@ def _is_instance_of_type(obj_or_type: T.Union[object, type]) -> bool:
     return is_a_cls
 
 
+def _is_dataclass_instance(obj: T.Any) -> bool:
+    """
+    Returns ``True`` if the argument is an instance of a dataclass. The
+    :mod:`dataclasses` module is not imported for this check.
+    """
+    return hasattr(type(obj), '__dataclass_fields__') and not isinstance(obj, type)
+
+
+def _is_numpy_array(obj: T.Any) -> bool:
+    """
+    Returns ``True`` if the argument is a numpy array. numpy is not imported
+    for this check.
+    """
+    return type(obj).__name__ == 'ndarray' and type(obj).__module__ == 'numpy'
+
+
 def obj_spec(obj_or_type: T.Union[object, type]) -> str:
     """
     This function returns the path of the argument class.
@@ -127,6 +196,142 @@ def obj_spec(obj_or_type: T.Union[object, type]) -> str:
     return path
 
 
+def _canonical(value: T.Any) -> T.Any:
+    """
+    Returns a copy of the lists, tuples and dicts in ``value`` with
+    normalized numbers and string keys. Other objects are kept, they are
+    normalized after they were converted by :meth:`JsonEncoder.default`.
+    The containers are walked with an explicit stack, so the depth is not
+    limited by the recursion limit.
+
+    :raise ValueError: If a container contains itself.
+    """
+    root = [value]
+    # the containers and keys of the values which are still to be normalized,
+    # or _MISSING and the id of a container whose values were normalized
+    stack = [(root, 0)]  # type: T.List[T.Tuple[T.Any, T.Any]]
+    # the ids of the containers on the path to the current value
+    markers = set()  # type: T.Set[int]
+    while stack:
+        container, index = stack.pop()
+        if container is _MISSING:
+            markers.discard(index)
+            continue
+        value = container[index]
+        if isinstance(value, (dict, list, tuple)):
+            if id(value) in markers:
+                raise ValueError('Circular reference detected')
+            markers.add(id(value))
+            stack.append((_MISSING, id(value)))
+        if isinstance(value, dict):
+            result = {}
+            for key, item in value.items():
+                key = _canonical_key(key)
+                if key in result:
+                    raise JsonEncodingError('The key `{}` occurs more than once.'.format(key))
+                result[key] = item
+            container[index] = result
+            stack.extend((result, key) for key, item in result.items() if not _is_scalar(item))
+        elif isinstance(value, (list, tuple)):
+            items = list(value)
+            container[index] = items
+            stack.extend((items, i) for i, item in enumerate(items) if not _is_scalar(item))
+        elif isinstance(value, float):
+            if value.is_integer() and abs(value) < 2 ** 53:
+                container[index] = int(value)
+        elif isinstance(value, _JsonItems):
+            container[index] = _JsonItems((_canonical_key(key), _canonical(item)) for key, item in value)
+        elif isinstance(value, Iterator):
+            container[index] = map(_canonical, value)
+    return root[0]
+
+
+def _is_scalar(value: T.Any) -> bool:
+    """
+    Returns ``True`` for the values which are encoded as they are, i.e.
+    strings, integers, booleans and ``None``.
+    """
+    return value is None or type(value) is str or type(value) is int or type(value) is bool
+
+
+def _canonical_key(key: T.Any) -> T.Any:
+    if isinstance(key, str):
+        return key
+    elif key is True:
+        return 'true'
+    elif key is False:
+        return 'false'
+    elif key is None:
+        return 'null'
+    elif isinstance(key, (int, float)):
+        return json.dumps(_canonical(key))
+    return key
+
+
+class _JsonItems(Iterator):
+    """
+    Wraps the key-value pairs of :meth:`ItemsConvertible.iter_json_items`,
+    which are encoded lazily as dict.
+    """
+
+    __slots__ = ('items',)
+
+    def __init__(self, items: T.Iterable[T.Tuple[T.Any, T.Any]]) -> None:
+        self.items = iter(items)
+
+    def __next__(self) -> T.Tuple[T.Any, T.Any]:
+        return next(self.items)
+
+
+def _holds_iterator(obj_dict: T.Any) -> bool:
+    """
+    Returns ``True`` if the result of :meth:`JsonEncoder.default` is an
+    iterator or an envelope of one, which can only be encoded once.
+    """
+    if isinstance(obj_dict, dict):
+        obj_dict = obj_dict.get('__json_data__')
+    return isinstance(obj_dict, Iterator)
+
+
+def _utf8_length(s: str) -> int:
+    return len(s.encode('utf-8', 'surrogatepass'))
+
+
+class _LazyValue(Exception):
+    """
+    Raised by :class:`JsonEncoder` if the builtin encoder hits an iterator,
+    which must be encoded lazily.
+    """
+
+
+# the types which the builtin encoder writes as they are
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+ESTIMATE_SLICE_SIZE = 1024
+"""
+The number of strings and numbers which :meth:`JsonEncoder.estimate_size`
+encodes at once to measure them.
+"""
+
+COLUMNAR_MIN_ROWS = 2
+"""
+The minimum length of a list of objects before it is encoded in the
+columnar representation.
+"""
+
+_MISSING = object()
+
+INTERN_MAX_SIZE = 1 << 16
+"""
+The default number of distinct strings a :class:`JsonDecoder` interns.
+"""
+
+INTERN_MAX_LENGTH = 64
+"""
+Longer strings are never interned.
+"""
+
+
 class JsonEncoder(json.JSONEncoder):
     """
     JsonEncoder will decode all objects, which implement either `to_dict`
@@ -143,30 +348,577 @@ class JsonEncoder(json.JSONEncoder):
     no access to the class definition, you can use
     :func:`jsoner.registry.encoders` and :func:`jsoner.registry.decoders`.
 
+    :param columnar: If ``True``, lists which only contain instances of the
+        same :class:`DictConvertible` class are encoded column-wise. The
+        class and the field names are written once and each field is
+        stored as a single array::
+
+            {"__columnar_cls__": "...", "__columns__": ["a", "b"],
+             "__json_data__": [[a_1, a_2, ...], [b_1, b_2, ...]]}
+
+        :func:`maybe_convert_to_obj` turns this representation back into a
+        list of objects.
+
+    :param memo: An optional :class:`jsoner.cache.LRUCache`. Hashable
+        objects are encoded only once and their encoded form is taken from
+        the cache afterwards. Objects which are hashed by their identity,
+        i.e. which do not define ``__hash__``, are always encoded. The
+        cache can be shared between calls, so only use it for immutable
+        objects whose encoded form never changes.
+
+    :param envelope: If ``False``, objects are written without the
+        ``__obj_cls__`` envelope, i.e. only their data is written.
+        Dataclasses are written as dict of their fields. Such documents
+        can be decoded if the type is passed to :func:`loads` with
+        ``into``, see :mod:`jsoner.typed`.
+
+    :param canonical: If ``True``, equal objects are always encoded to the
+        same string: the keys are sorted, there is no whitespace, non-ASCII
+        characters are not escaped, keys are converted to strings before
+        they are sorted, ``-0.0`` and floats without fraction are written as
+        integers and ``NaN`` and infinity raise a ``ValueError``. See
+        :func:`digest`.
+
+    :param iterative: If ``True``, the builtin encoder, which is implemented
+        recursively, is only used for numbers and strings and all
+        containers are walked with an explicit stack. Otherwise this only
+        happens for values which are nested too deeply for the builtin
+        encoder.
+
+    Encoders which are registered with
+    :meth:`jsoner.registry.Registry.register_batch` receive a list of all
+    their objects found in the lists, tuples and dicts of the encoded
+    object and return the list of encoded values. Objects which are only
+    reachable through the data of other objects are encoded one by one.
     """
+    def __init__(self, *args, columnar: bool = False, memo: T.Optional[LRUCache] = None,
+                 envelope: bool = True, canonical: bool = False, iterative: bool = False, **kwargs):
+        if canonical:
+            kwargs.update(sort_keys=True, separators=(',', ':'), indent=None, ensure_ascii=False,
+                          allow_nan=False)
+        super().__init__(*args, **kwargs)
+        self.canonical = canonical
+        self.iterative = iterative
+        self.columnar = columnar
+        self.memo = memo
+        self.envelope = envelope
+        self._batch_data = {}  # type: T.Dict[int, T.Any]
+        # the results of default of a failed attempt of the builtin encoder,
+        # which are reused when the objects are encoded again
+        self._defaults = {}  # type: T.Dict[int, T.Tuple[T.Any, T.Any]]
+        # the results of default during the current attempt
+        self._attempt = None  # type: T.Optional[T.Dict[int, T.Tuple[T.Any, T.Any]]]
+        self._retrying = False
+
+    def iterencode(self, o, _one_shot=False):
+        o = self._prepare(o)
+        if _one_shot and not self.iterative:
+            try:
+                return self._encode_builtin(o, 0)
+            except (_LazyValue, RecursionError):
+                pass
+        return self._iterencode_lazy(o, 0, {} if self.check_circular else None)
+
+    def _prepare(self, o: T.Any) -> T.Any:
+        """
+        Calls the batch encoders and applies the canonical and the columnar
+        representation before ``o`` is encoded.
+        """
+        self._batch_data = self._encode_batches(o)
+        self._defaults = {}
+        self._retrying = False
+        if self.canonical:
+            o = _canonical(o)
+        if self.columnar:
+            o = self._columnarize(o)
+        return o
+
+    def estimate_size(self, o: T.Any, sample: T.Optional[int] = None) -> int:
+        """
+        Returns the size of the UTF-8 encoded json of ``o`` in bytes without
+        building the json. Objects are converted by :meth:`default`. The
+        strings and numbers are collected and measured with the builtin
+        encoder in slices of :data:`ESTIMATE_SLICE_SIZE` values.
+
+        :param o:
+        :param sample: If given, the size of lists and tuples with more
+            elements is extrapolated from this many evenly spaced elements,
+            so the result is not exact for such lists and may be too small.
+            By default the exact size is returned, which takes two to three
+            times as long as :func:`dumps`.
+        :return:
+        :raise JsonEncodingError: If ``o`` contains an iterator, which would
+            be consumed.
+        """
+        o = self._prepare(o)
+        markers = set() if self.check_circular else None  # type: T.Optional[T.Set[int]]
+        length = len if self.ensure_ascii else _utf8_length  # type: T.Callable[[str], int]
+        size = 0.0
+        # the strings, numbers, booleans and None by the number of values
+        # they stand for, which are measured at the end
+        scalars = {}  # type: T.Dict[float, T.List[T.Any]]
+        # each entry holds a value, its level and the number of values it
+        # stands for, or the id of a container whose values were counted
+        stack = [(o, 0, 1.0)]  # type: T.List[T.Tuple[T.Any, int, float]]
+        while stack:
+            value, level, weight = stack.pop()
+            if value is _MISSING:
+                if markers is not None:
+                    markers.discard(level)
+                continue
+
+            if type(value) in _SCALAR_TYPES:
+                items = scalars.setdefault(weight, [])
+                items.append(value)
+                if len(items) >= ESTIMATE_SLICE_SIZE:
+                    size += weight * self._scalars_size(items, length)
+                    items.clear()
+                continue
+            if isinstance(value, (str, int, float)):
+                size += weight * length(self._encode_scalar(value))
+                continue
+
+            if not isinstance(value, (dict, list, tuple, _JsonItems)):
+                if isinstance(value, Iterator):
+                    raise JsonEncodingError('The size of an iterator cannot be estimated without consuming it.')
+                stack.append((self.default(value), level, weight))
+                continue
+
+            if markers is not None:
+                if id(value) in markers:
+                    raise ValueError('Circular reference detected')
+                markers.add(id(value))
+                stack.append((_MISSING, id(value), weight))
+
+            if isinstance(value, (list, tuple)):
+                count = len(value)
+                values = value  # type: T.Sequence[T.Any]
+                item_weight = weight
+                if sample is not None and count > sample > 0:
+                    step = count / sample
+                    values = [value[int(i * step)] for i in range(sample)]
+                    item_weight = weight * step
+                items = scalars.setdefault(item_weight, [])
+                for item in values:
+                    if type(item) in _SCALAR_TYPES:
+                        items.append(item)
+                    else:
+                        stack.append((item, level + 1, item_weight))
+            else:
+                item_weight = weight
+                items = scalars.setdefault(weight, [])
+                count = 0
+                for key, item in (value.items() if isinstance(value, dict) else value):
+                    if type(key) is str:
+                        items.append(key)
+                    else:
+                        key = self._encode_key(key)
+                        if key is None:
+                            continue
+                        size += weight * length(key)
+                    count += 1
+                    if type(item) in _SCALAR_TYPES:
+                        items.append(item)
+                    else:
+                        stack.append((item, level + 1, weight))
+                size += weight * count * len(self.key_separator)
+
+            size += weight * self._brackets_size(count, level)
+            if len(items) >= ESTIMATE_SLICE_SIZE:
+                size += item_weight * self._scalars_size(items, length)
+                items.clear()
+
+        for weight, items in scalars.items():
+            size += weight * self._scalars_size(items, length)
+        return int(round(size))
+
+    def _scalars_size(self, items: T.List[T.Any], length: T.Callable[[str], int]) -> int:
+        """
+        Returns the size of the given strings, numbers, booleans and
+        ``None`` without separators. They are encoded by the builtin encoder
+        in slices of :data:`ESTIMATE_SLICE_SIZE` values.
+        """
+        size = 0
+        for start in range(0, len(items), ESTIMATE_SLICE_SIZE):
+            part = items[start:start + ESTIMATE_SLICE_SIZE]
+            size += length(self._encode_at_level(part, 0)) - self._brackets_size(len(part), 0)
+        return size
+
+    def _brackets_size(self, count: int, level: int) -> int:
+        """
+        Returns the size of the brackets, the item separators and the
+        whitespace of a container with ``count`` items at the given level.
+        """
+        if not count:
+            return 2
+        separator, closing = self._separators(level)
+        return 2 + count * len(separator) + (count - 1) * len(self.item_separator) + len(closing)
+
+    def _iterencode_lazy(self, o: T.Any, level: int, markers: T.Optional[dict]) -> T.Iterator[str]:
+        """
+        Encodes ``o`` chunk by chunk. Iterators are encoded as arrays and only
+        consumed while the chunks are written. Values which contain no
+        iterators are encoded at once by the builtin encoder, unless they are
+        nested too deeply for it.
+
+        The containers are walked with an explicit stack, so the nesting depth
+        is not limited by the recursion limit.
+        """
+        # each frame holds the items of a container, whether it is a dict,
+        # the whitespace in front of the items and of the closing bracket,
+        # the id of the container and whether no item was written yet
+        stack = []  # type: T.List[list]
+        # levels at which the builtin encoder is not tried, since it hit the
+        # recursion limit above them
+        skip_from, skip_to = 0, 0
+        fast = False
+
+        while True:
+            while True:
+                if isinstance(o, (str, int, float, type(None))):
+                    yield self._encode_scalar(o)
+                    break
+
+                is_iterator = isinstance(o, Iterator)
+                if not is_iterator and not isinstance(o, (dict, list, tuple)):
+                    o = self.default(o)
+                    continue
+
+                if fast and not is_iterator and not skip_from <= level < skip_to:
+                    try:
+                        chunks = self._encode_builtin(o, level)
+                    except _LazyValue:
+                        pass
+                    except RecursionError:
+                        skip_from, skip_to = level, level + sys.getrecursionlimit()
+                    else:
+                        yield from chunks
+                        break
+
+                if markers is not None:
+                    if id(o) in markers:
+                        raise ValueError('Circular reference detected')
+                    markers[id(o)] = o
+                is_dict = isinstance(o, (dict, _JsonItems))
+                items = o.items() if isinstance(o, dict) else o
+                if is_dict and self.sort_keys:
+                    items = sorted(items, key=lambda item: item[0])
+                separator, closing = self._separators(level)
+                stack.append([iter(items), is_dict, level, separator, closing, id(o), True])
+                break
+
+            while stack:
+                frame = stack[-1]
+                items, is_dict, frame_level, separator, closing, marker, first = frame
+                for value in items:
+                    if is_dict:
+                        key, value = value
+                        key = self._encode_key(key)
+                        if key is None:
+                            continue
+                        yield ('{' if first else self.item_separator) + separator + key + self.key_separator
+                    else:
+                        yield ('[' if first else self.item_separator) + separator
+                    frame[6] = False
+                    o, level, fast = value, frame_level + 1, not self.iterative
+                    break
+                else:
+                    stack.pop()
+                    if first:
+                        yield '{}' if is_dict else '[]'
+                    else:
+                        yield closing + ('}' if is_dict else ']')
+                    if markers is not None:
+                        del markers[marker]
+                    continue
+                break
+            else:
+                return
+
+    def _separators(self, level: int) -> T.Tuple[str, str]:
+        """
+        Returns the whitespace in front of the items and in front of the
+        closing bracket of a container at the given indentation level.
+        """
+        if self.indent is None:
+            return '', ''
+        indent = self.indent if isinstance(self.indent, str) else ' ' * self.indent
+        return '\n' + indent * (level + 1), '\n' + indent * level
+
+    def _encode_scalar(self, o: T.Any) -> str:
+        """
+        Encodes a string, number, boolean or ``None`` like the builtin
+        encoder does.
+        """
+        if isinstance(o, str):
+            if self.ensure_ascii:
+                return json.encoder.encode_basestring_ascii(o)
+            return json.encoder.encode_basestring(o)
+        elif o is None:
+            return 'null'
+        elif o is True:
+            return 'true'
+        elif o is False:
+            return 'false'
+        elif isinstance(o, int):
+            return int.__repr__(o)
+        return ''.join(super().iterencode(o, _one_shot=True))
+
+    def _encode_builtin(self, o: T.Any, level: int) -> T.Sequence[str]:
+        """
+        Encodes ``o`` at once with the builtin encoder and returns the
+        chunks. Once an attempt failed, the results of :meth:`default` of the
+        failed attempts are kept, so the objects are not converted again when
+        the containers of ``o`` are encoded one by one.
+
+        :raise _LazyValue: If ``o`` contains an iterator.
+        :raise RecursionError: If ``o`` is nested too deeply.
+        """
+        attempt = self._attempt = {}
+        try:
+            if level:
+                return [self._encode_at_level(o, level)]
+            chunks = super().iterencode(o, _one_shot=True)
+            return chunks if isinstance(chunks, (list, tuple)) else list(chunks)
+        except (_LazyValue, RecursionError):
+            self._retrying = True
+            self._defaults.update(attempt)
+            raise
+        finally:
+            self._attempt = None
+
+    def _encode_at_level(self, o: T.Any, level: int) -> str:
+        chunk = ''.join(super().iterencode(o, _one_shot=True))
+        if self.indent is not None and level:
+            # json strings cannot contain line breaks, thus all of them are indentation
+            chunk = chunk.replace('\n', self._separators(level - 1)[0])
+        return chunk
+
+    def _encode_key(self, key: T.Any) -> T.Optional[str]:
+        """
+        Converts the key like the builtin encoder does and returns it as
+        json string or ``None`` if it is skipped.
+        """
+        if isinstance(key, str):
+            pass
+        elif isinstance(key, float):
+            key = ''.join(super().iterencode(key, _one_shot=True))
+        elif key is True:
+            key = 'true'
+        elif key is False:
+            key = 'false'
+        elif key is None:
+            key = 'null'
+        elif isinstance(key, int):
+            key = int.__repr__(key)
+        elif self.skipkeys:
+            return None
+        else:
+            msg = 'keys must be str, int, float, bool or None, not {}'.format(key.__class__.__name__)
+            raise TypeError(msg)
+        return self._encode_scalar(key)
+
+    def _encode_batches(self, o: T.Any) -> T.Dict[int, T.Any]:
+        """
+        Collects all objects with a batch encoder within the containers of
+        ``o`` and calls each batch encoder once.
+
+        :return: A mapping from the object id to its encoded data.
+        """
+        if not any(isinstance(encoder, BatchFunction) for encoder in encoders.data.values()):
+            return {}
+
+        found = {}  # type: T.Dict[BatchFunction, T.Dict[int, T.Any]]
+        lookup = {}  # type: T.Dict[type, T.Any]
+        seen = set()  # type: T.Set[int]
+        stack = [o]
+        while stack:
+            obj = stack.pop()
+            if isinstance(obj, (dict, list, tuple)):
+                # circular references are reported by the encoder itself
+                if id(obj) in seen:
+                    continue
+                seen.add(id(obj))
+                stack.extend(obj.values() if isinstance(obj, dict) else obj)
+            elif not isinstance(obj, (str, int, float, type(None))):
+                obj_type = type(obj)
+                if obj_type not in lookup:
+                    serializable = (isinstance(obj, JsonerSerializable) and
+                                    not isinstance(obj, (ItemsConvertible, DictConvertible, StrConvertible)))
+                    lookup[obj_type] = encoders.get(obj) if serializable else None
+                encoder = lookup[obj_type]
+                if isinstance(encoder, BatchFunction):
+                    found.setdefault(encoder, {})[id(obj)] = obj
+
+        batch_data = {}  # type: T.Dict[int, T.Any]
+        for encoder, objs in found.items():
+            values = list(encoder(list(objs.values())))
+            if len(values) != len(objs):
+                msg = 'Batch encoder `{}` returned {} values for {} objects.'.format(
+                    encoder.func, len(values), len(objs))
+                raise JsonEncodingError(msg)
+            batch_data.update(zip(objs, values))
+        return batch_data
+
+    def _columnarize(self, o: T.Any) -> T.Any:
+        """
+        Returns a copy of the containers in ``o`` in which all homogeneous
+        lists of :class:`DictConvertible` objects are replaced by their
+        columnar representation.
+
+        :raise ValueError: If a container contains itself.
+        """
+        root = [o]
+        # the containers and keys of the values which are still to be replaced,
+        # or _MISSING and the id of a container whose values were replaced
+        stack = [(root, 0)]  # type: T.List[T.Tuple[T.Any, T.Any]]
+        # the ids of the containers on the path to the current value
+        markers = set()  # type: T.Set[int]
+        while stack:
+            container, index = stack.pop()
+            if container is _MISSING:
+                markers.discard(index)
+                continue
+            value = container[index]
+            if isinstance(value, (dict, list, tuple)):
+                if id(value) in markers:
+                    raise ValueError('Circular reference detected')
+                markers.add(id(value))
+                stack.append((_MISSING, id(value)))
+            if isinstance(value, dict):
+                result = dict(value)  # type: T.Any
+                keys = (key for key, item in result.items() if not _is_scalar(item))  # type: T.Iterable
+            elif isinstance(value, (list, tuple)):
+                result = self._encode_columnar(value)
+                if result is not None:
+                    container[index] = result
+                    continue
+                result = list(value)
+                keys = (i for i, item in enumerate(result) if not _is_scalar(item))
+            else:
+                continue
+            container[index] = result
+            stack.extend((result, key) for key in keys)
+        return root[0]
+
+    def _encode_columnar(self, objs: T.Sequence) -> T.Any:
+        """
+        Tries to encode the sequence of objects in the columnar
+        representation. ``None`` is returned if the sequence does not
+        qualify.
+        """
+        if len(objs) < COLUMNAR_MIN_ROWS:
+            return None
+
+        cls = type(objs[0])
+        if not issubclass(cls, DictConvertible):
+            return None
+        if any(type(obj) is not cls for obj in objs):
+            return None
+
+        rows = [obj.to_dict() for obj in objs]
+        if not all(isinstance(row, dict) for row in rows):
+            return None
+
+        path = obj_spec(cls)
+        names = list(rows[0])
+        if not names:
+            return None
+        if any(row.keys() != rows[0].keys() for row in rows):
+            # the field names differ, thus each row gets its own envelope
+            if not self.envelope:
+                return [self._columnarize(row) for row in rows]
+            return [{'__obj_cls__': path, '__json_data__': self._columnarize(row)}
+                    for row in rows]
+
+        columns = [self._columnarize([row[name] for row in rows]) for name in names]
+        if not self.envelope:
+            return {'__columns__': names, '__json_data__': columns}
+        return {
+            '__columnar_cls__': path,
+            '__columns__': names,
+            '__json_data__': columns
+        }
+
     def default(self, obj, *args, **kwargs):
+        entry = self._defaults.pop(id(obj), None)
+        if entry is not None and entry[0] is obj:
+            obj_dict = entry[1]
+        else:
+            obj_dict = self._memoized(obj)
+            if self.canonical:
+                obj_dict = _canonical(obj_dict)
+        # until an attempt of the builtin encoder failed, only the envelopes
+        # of iterators are kept, so the encoder of an iterator is called once
+        if self._attempt is not None and (self._retrying or _holds_iterator(obj_dict)):
+            self._attempt[id(obj)] = (obj, obj_dict)
+        return obj_dict
 
+    def _memoized(self, obj: T.Any) -> T.Any:
+        if self.memo is None:
+            return self._default(obj)
+
+        if type(obj).__hash__ is object.__hash__:
+            # hashed by identity, thus it may have changed since it was cached
+            return self._default(obj)
+        try:
+            # the type is part of the key, since e.g. 1 == 1.0 == True, and
+            # the options, since the memo can be shared between encoders
+            key = (type(obj), self.envelope, self.columnar, self.canonical, obj)
+            obj_dict = self.memo.get(key)
+        except TypeError:
+            return self._default(obj)
+
+        if obj_dict is None:
+            obj_dict = self._default(obj)
+            if not _holds_iterator(obj_dict):
+                self.memo[key] = obj_dict
+        return obj_dict
+
+    def _default(self, obj: T.Any) -> T.Any:
         if isinstance(obj, JsonerSerializable):
             obj_dict = {
                 '__obj_cls__': obj_spec(obj),
                 '__json_data__': None
-            }
-            if isinstance(obj, DictConvertible):
+            }  # type: T.Any
+            if isinstance(obj, ItemsConvertible):
+                obj_data = _JsonItems(obj.iter_json_items())  # type: T.Any
+            elif isinstance(obj, DictConvertible):
                 obj_data = obj.to_dict()
             elif isinstance(obj, StrConvertible):
                 obj_data = obj.to_str()
             else:
                 encoder = encoders.get(obj)
-                if isinstance(encoder, T.Callable):
+                if isinstance(encoder, BatchFunction):
+                    try:
+                        obj_data = self._batch_data[id(obj)]
+                    except KeyError:
+                        obj_data = encoder([obj])[0]
+                elif callable(encoder):
                     obj_data = encoder(obj)
                 else:
                     obj_data = encoder
-            obj_dict['__json_data__'] = obj_data
+            if self.columnar:
+                obj_data = self._columnarize(obj_data)
+            if self.envelope:
+                obj_dict['__json_data__'] = obj_data
+            else:
+                obj_dict = obj_data
             return obj_dict
 
         elif _is_instance_of_type(obj):
             return {'__cls__': obj_spec(obj)}
 
+        elif not self.envelope and _is_dataclass_instance(obj):
+            import dataclasses
+            return {field.name: getattr(obj, field.name) for field in dataclasses.fields(obj)}
+
+        elif isinstance(obj, array) or _is_numpy_array(obj):
+            return obj.tolist()
+
+        elif isinstance(obj, Iterator):
+            raise _LazyValue()
+
         else:
             return super().default(obj)
 
@@ -179,17 +931,20 @@ def json_hook(primitive: T.Any) -> T.Any:
     :param primitive:
     :return:
     """
-    if not isinstance(primitive, T.Dict):
+    if not isinstance(primitive, dict):
         return primitive
     else:
         return maybe_convert_to_obj(primitive)
 
 
-def maybe_convert_to_obj(data: dict) -> T.Any:
+def maybe_convert_to_obj(data: dict, batch: T.Optional['BatchQueue'] = None) -> T.Any:
     """
     This function will try to create an object from the data dictionary.
 
     :param data:
+    :param batch: If given, objects with a batch decoder are not decoded
+        at once. A placeholder is returned instead and the object is
+        decoded when the :class:`BatchQueue` is resolved.
     :return:
     """
     if '__cls__' in data:
@@ -207,9 +962,20 @@ def maybe_convert_to_obj(data: dict) -> T.Any:
         except ImportError:
             return data
 
-        obj_data = data.get('__json_data__')
+        obj_data = data.get('__json_data__')  # type: T.Any
+        if batch and _contains_pending(obj_data):
+            # the object is decoded after the objects in its data, which
+            # are resolved together with the other objects of the document
+            decoder = None
+            if not issubclass(cls, (ItemsConvertible, DictConvertible, StrConvertible)):
+                decoder = decoders.get(cls)
+            if isinstance(decoder, BatchFunction):
+                return batch.add(decoder, cls, obj_data)
+            return batch.add(None, cls, data)
 
-        if issubclass(cls, DictConvertible):
+        if issubclass(cls, ItemsConvertible):
+            return cls.from_json_items(iter(obj_data.items()))
+        elif issubclass(cls, DictConvertible):
             return cls.from_dict(obj_data)
         elif issubclass(cls, StrConvertible):
             return cls.from_str(obj_data)
@@ -217,19 +983,739 @@ def maybe_convert_to_obj(data: dict) -> T.Any:
             decoder = decoders.get(cls)
             if decoder is None:
                 return data
-            if callable(decoder):
-                sig = signature(decoder)
-                if len(sig.parameters) == 1:
-                    return decoder(obj_data)
-                else:
-                    return decoder(obj_data, cls)
+            if isinstance(decoder, BatchFunction):
+                if batch is None:
+                    return _call_decoder(decoder, [obj_data], cls)[0]
+                return batch.add(decoder, cls, obj_data)
+            elif callable(decoder):
+                return _call_decoder(decoder, obj_data, cls)
             else:
                 return decoder or data
+    elif '__columnar_cls__' in data:
+        if batch and _contains_pending(data.get('__json_data__')):
+            return batch.add(None, None, data)
+        return _convert_columnar_to_objs(data)
+
     else:
         return data
 
 
+def _call_decoder(decoder: T.Callable, obj_data: T.Any, cls: T.Optional[type]) -> T.Any:
+    """
+    Calls the decoder with the object data and, if the decoder takes a
+    second argument, with the class of the object.
+    """
+    if _takes_cls(decoder):
+        return decoder(obj_data, cls)
+    else:
+        return decoder(obj_data)
+
+
+_decoder_arity = {}  # type: T.Dict[T.Any, bool]
+
+
+def _takes_cls(decoder: T.Callable) -> bool:
+    """
+    Returns ``True`` if the decoder takes the class as second argument. The
+    result is cached, so :mod:`inspect` is only used once per decoder.
+    """
+    try:
+        return _decoder_arity[decoder]
+    except (KeyError, TypeError):
+        pass
+
+    from inspect import signature
+    func = decoder.func if isinstance(decoder, BatchFunction) else decoder
+    takes_cls = len(signature(func).parameters) != 1
+    try:
+        _decoder_arity[decoder] = takes_cls
+    except TypeError:
+        pass
+    return takes_cls
+
+
+def _convert_columnar_to_objs(data: dict) -> T.Any:
+    """
+    Recreates the list of objects from the columnar representation written
+    by :class:`JsonEncoder`. If the class cannot be imported, the data is
+    returned unchanged.
+
+    :param data:
+    :return:
+    """
+    try:
+        cls = import_object(data.get('__columnar_cls__', ''))
+    except ImportError:
+        return data
+
+    if not issubclass(cls, DictConvertible):
+        return data
+
+    return [cls.from_dict(row) for row in _columnar_rows(data)]
+
+
+def _columnar_rows(data: dict) -> T.List[dict]:
+    """
+    Returns the rows of the columnar representation written by
+    :class:`JsonEncoder` as dicts of the field names and values.
+
+    :param data:
+    :return:
+    :raise JsonDecodingError: If the number of columns does not match the
+        number of names or if the columns differ in length.
+    """
+    names = data.get('__columns__', [])
+    columns = data.get('__json_data__', [])
+    if not isinstance(names, list) or not isinstance(columns, list) or len(names) != len(columns):
+        raise JsonDecodingError('The columnar data does not hold one column for each name.')
+    if not all(isinstance(column, list) for column in columns) or len({len(column) for column in columns}) > 1:
+        raise JsonDecodingError('The columns of the columnar data differ in length.')
+    return [dict(zip(names, row)) for row in zip(*columns)]
+
+
+class Pending:
+    """
+    Placeholder for an object which is decoded by a batch decoder, or whose
+    data contains such placeholders. In the latter case :attr:`decoder` is
+    ``None`` and :attr:`data` is the envelope of the object. After the
+    :class:`BatchQueue` is resolved, :attr:`value` holds the object.
+    """
+    __slots__ = ('decoder', 'cls', 'data', 'value', 'done')
+
+    def __init__(self, decoder: T.Optional[BatchFunction], cls: T.Optional[type], data: T.Any) -> None:
+        self.decoder = decoder
+        self.cls = cls
+        self.data = data
+        self.value = None  # type: T.Any
+        self.done = False
+
+
+class BatchQueue:
+    """
+    The :class:`BatchQueue` collects the objects of one document which are
+    decoded by batch decoders. :meth:`resolve` calls each batch decoder once
+    per class with the data of all collected objects.
+    """
+
+    def __init__(self) -> None:
+        self.pending = []  # type: T.List[Pending]
+        self.used = False
+
+    def __bool__(self) -> bool:
+        return bool(self.pending)
+
+    def add(self, decoder: T.Optional[BatchFunction], cls: T.Optional[type], data: T.Any) -> Pending:
+        """
+        Adds an object to the queue. If ``decoder`` is ``None``, ``data``
+        is the envelope of an object which is revived with
+        :func:`maybe_convert_to_obj` once the placeholders in its data are
+        resolved.
+        """
+        item = Pending(decoder, cls, data)
+        self.pending.append(item)
+        self.used = True
+        return item
+
+    def resolve(self) -> None:
+        """
+        Decodes all pending objects. The objects whose data contains other
+        pending objects are decoded after them, thus a batch decoder is only
+        called more than once if its objects are nested in each other's
+        data.
+
+        :raise JsonDecodingError: If a batch decoder does not return one
+            object for each item.
+        """
+        while self.pending:
+            # the objects were added bottom-up, thus the data of an object
+            # is resolved before the object itself
+            items, self.pending = self.pending, []
+            groups = {}  # type: T.Dict[T.Tuple[BatchFunction, T.Optional[type]], T.List[Pending]]
+            for item in items:
+                if item.decoder is None:
+                    continue
+                if _contains_pending(item.data, unresolved=True):
+                    self.pending.append(item)
+                else:
+                    groups.setdefault((item.decoder, item.cls), []).append(item)
+
+            for (decoder, cls), group in groups.items():
+                data = [splice_pending(item.data) for item in group]
+                values = list(_call_decoder(decoder, data, cls))
+                if len(values) != len(group):
+                    msg = 'Batch decoder `{}` returned {} objects for {} items.'.format(
+                        decoder.func, len(values), len(group))
+                    raise JsonDecodingError(msg)
+                for item, value in zip(group, values):
+                    item.value = value
+                    item.done = True
+
+            for item in items:
+                if item.decoder is not None:
+                    continue
+                if _contains_pending(item.data, unresolved=True):
+                    self.pending.append(item)
+                else:
+                    item.value = maybe_convert_to_obj(splice_pending(item.data))
+                    item.done = True
+
+
+def _contains_pending(data: T.Any, unresolved: bool = False) -> bool:
+    """
+    Returns ``True`` if any :class:`Pending` is found within the dicts and
+    lists of ``data``. If ``unresolved`` is ``True``, resolved placeholders
+    are ignored.
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        if isinstance(value, Pending):
+            if not (unresolved and value.done):
+                return True
+        elif isinstance(value, dict):
+            stack.extend(value.values())
+        elif isinstance(value, list):
+            stack.extend(value)
+    return False
+
+
+def splice_pending(data: T.Any) -> T.Any:
+    """
+    Replaces all resolved :class:`Pending` placeholders within the dicts
+    and lists of ``data`` by their values. The containers are changed in
+    place.
+
+    :param data:
+    :return: The data with all placeholders replaced.
+    """
+    if isinstance(data, Pending):
+        return data.value
+
+    stack = [data]
+    while stack:
+        container = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()  # type: T.Iterable[T.Tuple[T.Any, T.Any]]
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+        for key, value in items:
+            if isinstance(value, Pending):
+                container[key] = value.value
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+    return data
+
+
+MARKERS = ('__cls__', '__obj_cls__', '__columnar_cls__')
+"""
+The keys which mark a dict as encoded object or class.
+"""
+
+_QUOTED_MARKERS = tuple('"{}"'.format(marker) for marker in MARKERS)
+
+
+def has_markers(s: str) -> bool:
+    """
+    Returns ``True`` if one of the :data:`MARKERS` occurs as a json string
+    in ``s``. If not, the document contains no encoded objects.
+
+    Usage::
+        >>> from jsoner.serialization import has_markers
+        >>> has_markers('{"a": [1, 2, 3]}')
+        False
+        >>> has_markers('{"__cls__": "datetime.datetime"}')
+        True
+
+    :param s:
+    :return:
+    """
+    for marker in _QUOTED_MARKERS:
+        if marker in s:
+            return True
+    return False
+
+
+class JsonDecoder(json.JSONDecoder):
+    """
+    :class:`JsonDecoder` recreates the objects which were encoded by
+    :class:`JsonEncoder`.
+
+    Objects whose decoder was registered with
+    :meth:`jsoner.registry.Registry.register_batch` are collected while the
+    document is parsed. Each batch decoder is called once per class with
+    the data of all these objects, and the results are put in place of the
+    objects.
+
+    :param fast_path: If ``True``, documents which do not contain any of the
+        :data:`MARKERS` are parsed without the object hook, which is about as
+        fast as :func:`json.loads`. Note that this does not detect markers
+        which are written with escape sequences, e.g. ``"\\u005f_cls__"``,
+        which *Jsoner* never writes.
+    :param into: If given, the document is decoded into this type, e.g.
+        ``List[Order]``, based on the type annotations instead of the
+        envelopes. See :mod:`jsoner.typed`.
+    :param limits: The :class:`jsoner.limits.Limits` for each document.
+    :param cache: An optional :class:`jsoner.cache.DecodeCache`. Payloads
+        which were decoded before are taken from the cache.
+    :param arrays: An optional :class:`jsoner.arrays.NumericArrays`, which
+        selects the lists of numbers which are turned into arrays.
+    :param iterative: If ``True``, documents are always parsed by
+        :mod:`jsoner.iterative`, which is slower than the builtin parser but
+        not limited by the recursion limit. Otherwise it is only used for
+        documents which are nested too deeply for the builtin parser.
+    :param intern: If ``True``, repeated string values up to
+        :data:`INTERN_MAX_LENGTH` characters are replaced by a single
+        instance, and the classes of ``__cls__`` envelopes are only imported
+        once. The table is kept for all documents which are decoded by this
+        decoder and holds at most :data:`INTERN_MAX_SIZE` strings and
+        classes, or the given number of them. Keys are not interned, since the parser
+        already reuses repeated keys within a document.
+    """
+    def __init__(self, *args, fast_path: bool = False, into: T.Any = None,
+                 limits: T.Optional[Limits] = None, intern: T.Union[bool, int] = False,
+                 cache: T.Optional[DecodeCache] = None, arrays: T.Optional[NumericArrays] = None,
+                 iterative: bool = False, **kwargs):
+        self.limits = limits
+        self.iterative = iterative
+        self.cache = cache
+        self.arrays = arrays
+        self._objects = 0
+        self._classes = set()  # type: T.Set[str]
+        custom_hook = 'object_hook' in kwargs or 'object_pairs_hook' in kwargs
+        self.fast_path = fast_path and not custom_hook
+        self._interned = None  # type: T.Optional[T.Dict[str, str]]
+        self._intern_size = INTERN_MAX_SIZE if intern is True else int(intern)
+        self._imported = {}  # type: T.Dict[str, T.Any]
+        if intern and not custom_hook:
+            self._interned = {}
+        self._into_plan = None  # type: T.Optional[T.Callable]
+        if into is not None:
+            from .typed import compile_plan
+            self._into_plan = compile_plan(into)
+        if self.fast_path or self._into_plan is not None:
+            plain_kwargs = dict(kwargs)
+            if self._interned is not None:
+                plain_kwargs['object_hook'] = self._intern_values
+            self._plain = json.JSONDecoder(*args, **plain_kwargs)
+        kwargs.setdefault('object_hook', self.json_hook)
+        super().__init__(*args, **kwargs)
+        self._batch = BatchQueue()
+
+    def decode(self, s, *args, **kwargs):
+        if self.limits is not None:
+            self.limits.check_size(s)
+        if self.cache is None:
+            return self._decode(s, *args, **kwargs)
+
+        key = self.cache.key(s)
+        obj = self.cache.get(key, _MISSING)
+        if obj is _MISSING:
+            obj = self._decode(s, *args, **kwargs)
+            self.cache.set(key, obj, weight=len(s))
+        return self.cache.copy(obj)
+
+    def _decode(self, s, *args, **kwargs):
+        if self._into_plan is None and self.fast_path and not has_markers(s):
+            if self.limits is not None:
+                self.limits.check_structure(s)
+            obj = self._parse(self._plain, s)
+            if self._interned is not None:
+                obj = self._intern(obj)
+            if self.arrays is not None:
+                obj = self.arrays.apply(obj)
+            return obj
+        return super().decode(s, *args, **kwargs)
+
+    def raw_decode(self, s, idx=0):
+        """
+        Decodes the json value which starts at the given index of ``s`` and
+        returns the value and the index where it ends. The batch decoders
+        are resolved for this value.
+        """
+        if self.limits is not None:
+            self.limits.check_structure(s, idx)
+            self._objects = 0
+            self._classes = set()
+
+        if self._into_plan is not None:
+            obj, end = self._parse(self._plain, s, idx)
+            if self._interned is not None:
+                obj = self._intern(obj)
+            obj = self._into_plan(obj)
+            if self.arrays is not None:
+                obj = self.arrays.apply(obj)
+            return obj, end
+
+        self._batch = BatchQueue()
+        obj, end = self._parse(self, s, idx)
+        return self._complete(obj), end
+
+    def revive(self, primitive: T.Any) -> T.Any:
+        """
+        Revives the objects within a json value which was parsed without
+        the object hook, like :meth:`decode` does for a document. The lists
+        and dicts of ``primitive`` are copied, so it is not changed. The
+        limits of the objects and classes apply, the cache is not used.
+
+        :param primitive:
+        :return:
+        """
+        if self.limits is not None:
+            self._objects = 0
+            self._classes = set()
+
+        if self._into_plan is not None:
+            obj = _revive_copy(primitive, self._intern_values if self._interned is not None else None)
+            if self._interned is not None:
+                obj = self._intern(obj)
+            obj = self._into_plan(obj)
+            if self.arrays is not None:
+                obj = self.arrays.apply(obj)
+            return obj
+
+        hook = self.object_hook  # type: T.Optional[T.Callable[[dict], T.Any]]
+        object_pairs_hook = self.object_pairs_hook
+        if object_pairs_hook is not None:
+            hook = lambda primitive: object_pairs_hook(list(primitive.items()))  # noqa: E731
+        self._batch = BatchQueue()
+        return self._complete(_revive_copy(primitive, hook))
+
+    def _complete(self, obj: T.Any) -> T.Any:
+        """
+        Resolves the batch queue for the parsed value ``obj`` and applies
+        the interning and the arrays.
+        """
+        if self._batch.used:
+            self._batch.resolve()
+            obj = splice_pending(obj)
+        if self._interned is not None:
+            obj = self._intern(obj)
+        if self.arrays is not None:
+            obj = self.arrays.apply(obj)
+        return obj
+
+    def _parse(self, decoder: json.JSONDecoder, s: str, idx: T.Optional[int] = None) -> T.Any:
+        """
+        Parses the document ``s``, or the value which starts at ``idx``, with
+        the hooks of ``decoder``. Documents which are nested too deeply for
+        the builtin parser, or all documents if :attr:`iterative` is set, are
+        parsed by :mod:`jsoner.iterative`.
+        """
+        if not self.iterative:
+            pending, objects, classes = len(self._batch.pending), self._objects, set(self._classes)
+            try:
+                if idx is None:
+                    return json.JSONDecoder.decode(decoder, s)
+                return json.JSONDecoder.raw_decode(decoder, s, idx)
+            except RecursionError:
+                # forget the objects which were revived by this attempt
+                del self._batch.pending[pending:]
+                self._objects = objects
+                self._classes = classes
+
+        from . import iterative
+        if idx is None:
+            return iterative.decode(decoder, s)
+        return iterative.raw_decode(decoder, s, idx)
+
+    def json_hook(self, primitive: T.Any) -> T.Any:
+        """
+        Works like :func:`json_hook`, but defers objects with a batch
+        decoder.
+        """
+        if self._interned is not None:
+            primitive = self._intern_values(primitive)
+        if isinstance(primitive, dict) and ('__obj_cls__' in primitive or
+                                            '__cls__' in primitive or
+                                            '__columnar_cls__' in primitive):
+            if self.limits is not None:
+                self._count(primitive)
+            if self.arrays is not None:
+                primitive = self.arrays.convert_envelope(primitive)
+            if self._interned is not None and '__cls__' in primitive:
+                return self._import_class(primitive)
+            return self._convert(primitive)
+        return primitive
+
+    def _convert(self, primitive: dict) -> T.Any:
+        """
+        Revives an encoded object or class.
+        """
+        return maybe_convert_to_obj(primitive, batch=self._batch)
+
+    def _intern(self, value: T.Any) -> T.Any:
+        """
+        Returns the interned instance of a string. The strings of lists are
+        replaced in place. Dicts are handled by the object hook.
+        """
+        table = self._interned
+        if table is None:
+            return value
+        if type(value) is str:
+            if len(value) > INTERN_MAX_LENGTH:
+                return value
+            interned = table.get(value)
+            if interned is not None:
+                return interned
+            if len(table) < self._intern_size:
+                table[value] = value
+            return value
+        elif type(value) is list:
+            stack = [value]
+            while stack:
+                items = stack.pop()
+                for i, item in enumerate(items):
+                    if type(item) is str:
+                        items[i] = self._intern(item)
+                    elif type(item) is list:
+                        stack.append(item)
+        return value
+
+    def _intern_values(self, primitive: dict) -> dict:
+        for key, value in primitive.items():
+            if type(value) is str or type(value) is list:
+                primitive[key] = self._intern(value)
+        return primitive
+
+    def _import_class(self, primitive: dict) -> T.Any:
+        path = primitive['__cls__']
+        try:
+            return self._imported[path]
+        except (KeyError, TypeError):
+            pass
+        obj = maybe_convert_to_obj(primitive, batch=self._batch)
+        if obj is not primitive and len(self._imported) < self._intern_size:
+            self._imported[path] = obj
+        return obj
+
+    def _count(self, primitive: dict) -> None:
+        """
+        Counts the object and its class before it is revived.
+        """
+        limits = self.limits
+        counted = _count_envelope(primitive)
+        if limits is None or counted is None:
+            return
+        path, count = counted
+        if path not in self._classes:
+            self._classes.add(path)
+            limits.check_classes(len(self._classes))
+
+        self._objects += count
+        limits.check_objects(self._objects)
+
+
+def _revive_copy(value: T.Any, hook: T.Optional[T.Callable[[dict], T.Any]]) -> T.Any:
+    """
+    Returns a copy of the json value ``value`` in which each dict is
+    replaced by the result of ``hook``, like the object hook of a parser
+    does. The containers are copied top-down and the dicts are passed to the
+    hook bottom-up with an explicit stack.
+    """
+    root = [value]
+    # the containers and keys of the values, and whether the dict at the key
+    # is to be passed to the hook, since its items are revived already
+    stack = [(root, 0, False)]  # type: T.List[T.Tuple[T.Any, T.Any, bool]]
+    while stack:
+        container, index, revive = stack.pop()
+        value = container[index]
+        if revive and hook is not None:
+            container[index] = hook(value)
+            continue
+        if isinstance(value, dict):
+            value = container[index] = dict(value)
+            if hook is not None:
+                stack.append((container, index, True))
+            keys = list(value)  # type: T.List[T.Any]
+        elif isinstance(value, list):
+            value = container[index] = list(value)
+            keys = list(range(len(value)))
+        else:
+            continue
+        # in reverse, so the items are revived in order
+        stack.extend((value, key, False) for key in reversed(keys) if isinstance(value[key], (dict, list)))
+    return root[0]
+
+
+def _count_envelope(primitive: dict) -> T.Optional[T.Tuple[str, int]]:
+    """
+    Returns the class path of an envelope and the number of objects it
+    holds, or ``None`` if its class path is not a string, in which case it
+    is not revived. The malformed columns of a columnar envelope are
+    counted as no objects, they are rejected when it is revived.
+    """
+    for key in ('__cls__', '__obj_cls__', '__columnar_cls__'):
+        if key in primitive:
+            break
+    else:
+        return None
+    path = primitive[key]
+    if not isinstance(path, str):
+        return None
+    if key != '__columnar_cls__':
+        return path, 1
+
+    columns = primitive.get('__json_data__')
+    if isinstance(columns, list) and columns and isinstance(columns[0], list):
+        return path, len(columns[0])
+    return path, 0
+
+
 dump = partial(json.dump, cls=JsonEncoder)
 dumps = partial(json.dumps, cls=JsonEncoder)
-load = partial(json.load, object_hook=json_hook)
-loads = partial(json.loads, object_hook=json_hook)
+load = partial(json.load, cls=JsonDecoder)
+loads = partial(json.loads, cls=JsonDecoder)
+
+
+def dumps_bytes(obj: T.Any, **kwargs) -> bytes:
+    """
+    Serializes ``obj`` to UTF-8 encoded json.
+
+    Usage::
+        >>> from jsoner.serialization import dumps_bytes
+        >>> dumps_bytes({'a': 'b'})
+        b'{"a": "b"}'
+
+    :param obj:
+    :param kwargs: Passed to :func:`dumps`.
+    :return:
+    """
+    return dumps(obj, **kwargs).encode('utf-8')
+
+
+def digest(obj: T.Any, algo: str = 'blake2b', **kwargs) -> str:
+    """
+    Returns the hex digest of the canonical encoding of ``obj``. Equal
+    objects have the same digest, so it can be used as cache key. The json
+    is hashed chunk by chunk while it is encoded.
+
+    Usage::
+        >>> from jsoner.serialization import digest
+        >>> digest({'b': 1.0, 'a': [2]}, 'md5') == digest({'a': (2,), 'b': 1}, 'md5')
+        True
+
+    :param obj:
+    :param algo: The name of a :mod:`hashlib` algorithm.
+    :param kwargs: Passed to :class:`JsonEncoder`.
+    :return:
+    """
+    import hashlib
+    hasher = hashlib.new(algo)
+    for chunk in JsonEncoder(canonical=True, **kwargs).iterencode(obj):
+        hasher.update(chunk.encode('utf-8', 'surrogatepass'))
+    return hasher.hexdigest()
+
+
+def estimate_size(obj: T.Any, sample: T.Optional[int] = None, **kwargs) -> int:
+    """
+    Returns the size of :func:`dumps_bytes` in bytes without building the
+    json, e.g. to check the size limit of a message broker before a large
+    payload is encoded. The encoders of the objects are called.
+
+    By default the exact size is returned, which takes two to three times as
+    long as :func:`dumps`, but needs no memory for the json. With ``sample``
+    only that many elements of long lists are looked at, which is much
+    faster. The result is then extrapolated and underestimates lists whose
+    elements differ a lot in size, so it must not be relied on for hard
+    limits.
+
+    Usage::
+        >>> from jsoner.serialization import estimate_size
+        >>> estimate_size({'a': ['b', 1.5, None]})
+        23
+        >>> estimate_size(list(range(1000, 2000)), sample=10)
+        6000
+
+    :param obj:
+    :param sample: If given, the size of lists and tuples with more
+        elements is extrapolated from this many evenly spaced elements.
+    :param kwargs: Passed to :class:`JsonEncoder`.
+    :return:
+    :raise JsonEncodingError: If ``obj`` contains an iterator.
+    """
+    return JsonEncoder(**kwargs).estimate_size(obj, sample)
+
+
+DUMP_PIECE_SIZE = 1 << 12
+"""
+The number of chunks of the encoder which :func:`dump_into` joins and
+encodes to UTF-8 at once.
+"""
+
+
+def dump_into(obj: T.Any, buffer: T.Union[bytearray, memoryview], offset: int = 0, **kwargs) -> int:
+    """
+    Serializes ``obj`` to UTF-8 encoded json and writes it into ``buffer``.
+    A :class:`bytearray` is extended by the json, so the same buffer can be
+    reused for many documents. Other writable buffers, e.g. a
+    :class:`memoryview` of preallocated memory, are written from ``offset``
+    on and must be large enough.
+
+    The chunks of the builtin encoder are encoded to UTF-8 and added to a
+    :class:`bytearray` piece by piece, so the whole json string is never
+    held in memory. This is about as fast as :func:`dumps_bytes`. For other
+    buffers the UTF-8 pieces are kept until the size is known, so nothing is
+    written into a buffer which is too small. To check the size without
+    encoding, use :func:`estimate_size`, which takes two to three times as
+    long.
+
+    Usage::
+        >>> from jsoner.serialization import dump_into
+        >>> buffer = bytearray(b'1:')
+        >>> dump_into([1, 2], buffer)
+        6
+        >>> buffer
+        bytearray(b'1:[1, 2]')
+
+    :param obj:
+    :param buffer:
+    :param offset: The position in fixed-size buffers at which the json is
+        written. It is ignored for :class:`bytearray`.
+    :param kwargs: Passed to :class:`JsonEncoder`.
+    :return: The number of bytes written.
+    :raise ValueError: If a fixed-size buffer is too small.
+    """
+    pieces = _utf8_pieces(JsonEncoder(**kwargs).iterencode(obj, _one_shot=True))
+
+    if isinstance(buffer, bytearray):
+        start = len(buffer)
+        try:
+            for piece in pieces:
+                buffer += piece
+        except Exception:
+            # the buffer only ever holds complete documents
+            del buffer[start:]
+            raise
+        return len(buffer) - start
+
+    encoded = list(pieces)
+    size = sum(len(piece) for piece in encoded)
+    view = memoryview(buffer).cast('B')
+    if offset + size > len(view):
+        msg = 'The buffer is too small, {} bytes are needed from offset {}.'.format(size, offset)
+        raise ValueError(msg)
+    pos = offset
+    for piece in encoded:
+        view[pos:pos + len(piece)] = piece
+        pos += len(piece)
+    return size
+
+
+def _utf8_pieces(chunks: T.Iterable[str]) -> T.Iterator[bytes]:
+    """
+    Joins the chunks of the encoder into UTF-8 encoded pieces of
+    :data:`DUMP_PIECE_SIZE` chunks.
+    """
+    if isinstance(chunks, (list, tuple)):
+        for start in range(0, len(chunks), DUMP_PIECE_SIZE):
+            yield ''.join(chunks[start:start + DUMP_PIECE_SIZE]).encode('utf-8')
+        return
+
+    chunks = iter(chunks)
+    while True:
+        parts = list(islice(chunks, DUMP_PIECE_SIZE))
+        if not parts:
+            return
+        yield ''.join(parts).encode('utf-8')
@@ -0,0 +1,125 @@
+# -*- coding: utf-8 -*-
+
+"""
+Hand-off of encoded documents between processes through shared memory.
+
+Arguments and results of a :mod:`multiprocessing` pool are pickled and
+copied through a pipe. :func:`dump_shared` writes the json into a
+:class:`multiprocessing.shared_memory.SharedMemory` block instead and
+returns a :class:`SharedPayload`, which only holds the name and the size of
+the block. The receiving process passes it to :func:`load_shared`::
+
+    def work(handle: SharedPayload) -> int:
+        orders = load_shared(handle)
+        ...
+
+    with ProcessPoolExecutor() as executor:
+        result = executor.submit(work, dump_shared(orders)).result()
+
+By default the block is removed once the payload is loaded, so every
+payload is loaded exactly once. Payloads which are never loaded must be
+removed with :meth:`SharedPayload.unlink`.
+
+Shared memory requires Python 3.8 or later.
+"""
+
+import typing as T
+
+from .serialization import dumps
+from .serialization import loads
+
+SHARED_PIECE_SIZE = 1 << 20
+"""
+The number of characters of ASCII json which :func:`dump_shared` encodes
+and writes into the block at once.
+"""
+
+
+class SharedPayload:
+    """
+    The handle of json in a shared memory block. It is small and can be
+    pickled.
+
+    :param name: The name of the shared memory block.
+    :param size: The number of bytes of the json, which can be smaller than
+        the block.
+    """
+
+    __slots__ = ('name', 'size')
+
+    def __init__(self, name: str, size: int) -> None:
+        self.name = name
+        self.size = size
+
+    def __repr__(self) -> str:
+        return '{}(name={!r}, size={!r})'.format(type(self).__name__, self.name, self.size)
+
+    def unlink(self) -> None:
+        """
+        Removes the shared memory block.
+        """
+        block = _shared_memory().SharedMemory(self.name)
+        block.close()
+        block.unlink()
+
+
+def _shared_memory() -> T.Any:
+    # not imported with the module, multiprocessing takes a while to import
+    from multiprocessing import shared_memory
+    return shared_memory
+
+
+def dump_shared(obj: T.Any, **kwargs) -> SharedPayload:
+    """
+    Serializes ``obj`` to UTF-8 encoded json in a new shared memory block.
+
+    The json is ASCII unless ``ensure_ascii=False`` is passed, so its size
+    is known without encoding it, and it is written into the block in pieces
+    of :data:`SHARED_PIECE_SIZE` characters. Thus the json is held twice,
+    once as string and once in the block. Other json is encoded as a whole
+    first.
+
+    :param obj:
+    :param kwargs: Passed to :func:`jsoner.serialization.dumps`.
+    :return: The handle of the block.
+    """
+    s = dumps(obj, **kwargs)
+    if not s.isascii():
+        data = s.encode('utf-8')
+        del s
+        block = _create(len(data))
+        block.buf[:len(data)] = data
+        block.close()
+        return SharedPayload(block.name, len(data))
+
+    block = _create(len(s))
+    for start in range(0, len(s), SHARED_PIECE_SIZE):
+        piece = s[start:start + SHARED_PIECE_SIZE].encode('ascii')
+        block.buf[start:start + len(piece)] = piece
+    block.close()
+    return SharedPayload(block.name, len(s))
+
+
+def _create(size: int) -> T.Any:
+    # blocks cannot be empty
+    return _shared_memory().SharedMemory(create=True, size=max(size, 1))
+
+
+def load_shared(handle: SharedPayload, unlink: bool = True, **kwargs) -> T.Any:
+    """
+    Deserializes the json in the shared memory block of ``handle``.
+
+    :param handle:
+    :param unlink: Whether the block is removed after it is read.
+    :param kwargs: Passed to :func:`jsoner.serialization.loads`.
+    :return:
+    """
+    block = _shared_memory().SharedMemory(handle.name)
+    try:
+        with block.buf[:handle.size] as view:
+            s = str(view, 'utf-8')
+    finally:
+        block.close()
+        if unlink:
+            block.unlink()
+    return loads(s, **kwargs)
@@ -0,0 +1,243 @@
+# -*- coding: utf-8 -*-
+
+"""
+Streaming decoding of large documents and `JSON Lines`_ files.
+
+The elements of a top-level json array are parsed and revived one after
+another, so only the current part of the raw text is kept in memory::
+
+    >>> import io
+    >>> from jsoner.stream import iterload
+    >>> list(iterload(io.StringIO('[1, {"a": 2}, "b"]')))
+    [1, {'a': 2}, 'b']
+
+.. _JSON Lines: http://jsonlines.org
+"""
+
+import codecs
+import json
+import typing as T
+from json.decoder import WHITESPACE  # type: ignore
+
+from .errors import JsonDecodingError
+from .serialization import JsonDecoder
+from .serialization import JsonEncoder
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+"""
+The number of bytes or characters which are read at once.
+"""
+
+
+def iterload(fp: T.Any, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> T.Iterator[T.Any]:
+    """
+    Yields the revived elements of the top-level json array in ``fp``.
+
+    :param fp: A text or binary file object or anything else with a
+        ``read`` method, e.g. an :class:`mmap.mmap`. Bytes are decoded
+        as UTF-8.
+    :param chunk_size: The number of bytes or characters read at once.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    :return:
+    :raise JsonDecodingError: If the document is not a json array.
+    """
+    reader = _ChunkReader(fp, chunk_size)
+    decoder = JsonDecoder(**kwargs)
+
+    if reader.peek() != '[':
+        raise JsonDecodingError('The document is not a json array.')
+    reader.pos += 1
+
+    if reader.peek() == ']':
+        reader.pos += 1
+        reader.expect_end()
+        return
+
+    while True:
+        reader.skip_whitespace()
+        yield reader.decode_value(decoder)
+
+        char = reader.peek()
+        reader.pos += 1
+        if char == ']':
+            break
+        elif char != ',':
+            raise reader.error("Expecting ',' delimiter")
+
+    reader.expect_end()
+
+
+def load_path(path: str, mmap: bool = True, chunk_size: int = DEFAULT_CHUNK_SIZE, **kwargs) -> T.Any:
+    """
+    Loads the json document in the file at ``path``.
+
+    If the document is an array, its elements are parsed and revived one
+    after another, so the raw text is never held in memory as a whole. With
+    ``mmap=True`` the file is memory-mapped instead of read, thus the text is
+    decoded directly from the page cache.
+
+    :param path:
+    :param mmap: Whether the file is memory-mapped.
+    :param chunk_size: The number of bytes read at once.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    :return:
+    """
+    with open(path, 'rb') as fp:
+        if mmap:
+            import mmap as _mmap
+            try:
+                source = _mmap.mmap(fp.fileno(), 0, access=_mmap.ACCESS_READ)  # type: T.Any
+            except ValueError:
+                # empty files cannot be mapped
+                source = fp
+        else:
+            source = fp
+
+        try:
+            reader = _ChunkReader(source, chunk_size)
+            if reader.peek() == '[':
+                source.seek(0)
+                return list(iterload(source, chunk_size, **kwargs))
+            # the mapping is decoded without copying it to bytes first
+            source.seek(0)
+            text = codecs.decode(source if source is not fp else fp.read(), 'utf-8-sig')
+            return JsonDecoder(**kwargs).decode(text)
+        finally:
+            if source is not fp:
+                source.close()
+
+
+def dump_lines(iterable: T.Iterable, fp: T.IO[str], **kwargs) -> int:
+    """
+    Writes each element of ``iterable`` as json document on its own line
+    (JSON Lines).
+
+    Usage::
+        >>> import io
+        >>> from jsoner.stream import dump_lines
+        >>> fp = io.StringIO()
+        >>> dump_lines([{'a': 1}, [2]], fp)
+        2
+        >>> fp.getvalue()
+        '{"a": 1}\\n[2]\\n'
+
+    :param iterable:
+    :param fp: A text file object.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonEncoder`.
+    :return: The number of written lines.
+    :raise ValueError: If an indent is given.
+    """
+    if kwargs.get('indent') is not None:
+        raise ValueError('JSON Lines cannot be indented.')
+
+    encoder = JsonEncoder(**kwargs)
+    count = 0
+    for obj in iterable:
+        fp.write(encoder.encode(obj))
+        fp.write('\n')
+        count += 1
+    return count
+
+
+def iterload_lines(fp: T.Iterable, **kwargs) -> T.Iterator[T.Any]:
+    """
+    Yields the revived json documents of a JSON Lines file. Empty lines
+    are skipped.
+
+    :param fp: A text or binary file object.
+    :param kwargs: Passed to :class:`jsoner.serialization.JsonDecoder`.
+    :return:
+    """
+    decoder = JsonDecoder(**kwargs)
+    for line in fp:
+        if isinstance(line, bytes):
+            line = line.decode('utf-8')
+        if line.strip():
+            yield decoder.decode(line)
+
+
+class _ChunkReader:
+    """
+    Keeps a window of the text of a file object. Consumed text is dropped
+    when the next chunk is read.
+    """
+
+    def __init__(self, fp: T.Any, chunk_size: int) -> None:
+        self.fp = fp
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.offset = 0
+        self.eof = False
+        self._decoder = codecs.getincrementaldecoder('utf-8-sig')()
+
+    def read(self, size: T.Optional[int] = None) -> bool:
+        """
+        Appends the next chunk to the buffer.
+
+        :param size: The size of the chunk, defaults to the chunk size.
+        :return: ``False`` if the end of the file is reached.
+        """
+        if self.eof:
+            return False
+
+        chunk = self.fp.read(size or self.chunk_size)
+        if isinstance(chunk, str):
+            text = chunk
+        else:
+            text = self._decoder.decode(chunk, final=not chunk)
+        self.eof = not chunk
+
+        self.offset += self.pos
+        self.buffer = self.buffer[self.pos:] + text
+        self.pos = 0
+        return True
+
+    def skip_whitespace(self) -> None:
+        while True:
+            self.pos = WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.read():
+                return
+
+    def peek(self) -> str:
+        """
+        Returns the next character which is not whitespace or an empty string
+        at the end of the file.
+        """
+        self.skip_whitespace()
+        return self.buffer[self.pos:self.pos + 1]
+
+    def decode_value(self, decoder: JsonDecoder) -> T.Any:
+        """
+        Decodes the value at the current position. More chunks are read
+        until the value is complete.
+        """
+        # values larger than a chunk are parsed again after each read, thus
+        # the chunks grow to keep the number of attempts small
+        size = self.chunk_size
+        while True:
+            try:
+                obj, end = decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError as error:
+                if decoder.limits is not None:
+                    # the limit applies to each element, so the buffer stays bounded
+                    decoder.limits.check_size(self.buffer[self.pos:])
+                size *= 2
+                if self.read(size):
+                    continue
+                raise self.error(error.msg, error.pos) from error
+
+            # a number at the end of the buffer might continue in the next chunk
+            if end == len(self.buffer) and self.read(size):
+                continue
+
+            self.pos = end
+            return obj
+
+    def expect_end(self) -> None:
+        if self.peek():
+            raise self.error('Extra data')
+
+    def error(self, msg: str, pos: T.Optional[int] = None) -> JsonDecodingError:
+        pos = self.pos if pos is None else pos
+        return JsonDecodingError('{} at character {}'.format(msg, self.offset + pos))
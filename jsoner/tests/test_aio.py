@@ -0,0 +1,106 @@
+import asyncio
+import json
+import unittest
+
+from ..aio import async_loads
+from ..cache import DecodeCache
+from ..registry import decoders
+from ..serialization import obj_spec
+from .test_serialization import Holder
+from .test_serialization import Record
+
+
+class Model:
+    def __init__(self, pk):
+        self.pk = pk
+
+
+class Pair:
+    def __init__(self, first, second):
+        self.first = first
+        self.second = second
+
+
+def envelope(cls, data):
+    return {'__obj_cls__': obj_spec(cls), '__json_data__': data}
+
+
+class TestAsyncLoads(unittest.TestCase):
+    def setUp(self):
+        self.running = 0
+        self.max_running = 0
+        self.calls = []
+
+        @decoders.register(Model)
+        async def from_primary_key(pk, cls):
+            self.calls.append(pk)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            await asyncio.sleep(0.01)
+            self.running -= 1
+            return cls(pk)
+
+        @decoders.register(Pair)
+        async def from_pair(data):
+            await asyncio.sleep(0)
+            return Pair(*data)
+
+    def tearDown(self):
+        del decoders[Model]
+        del decoders[Pair]
+
+    def test_000_concurrent(self):
+        data = json.dumps({'a': [envelope(Model, i) for i in range(10)], 'b': envelope(Model, 10)})
+
+        result = asyncio.run(async_loads(data))
+
+        self.assertEqual([m.pk for m in result['a']], list(range(10)))
+        self.assertEqual(result['b'].pk, 10)
+        self.assertEqual(self.max_running, 11)
+
+    def test_001_limit(self):
+        data = json.dumps([envelope(Model, i) for i in range(10)])
+
+        result = asyncio.run(async_loads(data, limit=3))
+
+        self.assertEqual([m.pk for m in result], list(range(10)))
+        self.assertEqual(self.max_running, 3)
+
+    def test_002_nested(self):
+        holder = envelope(Holder, {'record': envelope(Model, 1)})
+        pair = envelope(Pair, [envelope(Model, 2), envelope(Pair, [envelope(Model, 3), 4])])
+
+        result = asyncio.run(async_loads(json.dumps([holder, pair])))
+
+        self.assertIsInstance(result[0], Holder)
+        self.assertEqual(result[0].record.pk, 1)
+        self.assertEqual(result[1].first.pk, 2)
+        self.assertEqual(result[1].second.first.pk, 3)
+        self.assertEqual(result[1].second.second, 4)
+
+    def test_003_cache(self):
+        data = json.dumps([envelope(Model, 1)])
+        cache = DecodeCache()
+
+        first = asyncio.run(async_loads(data, cache=cache))
+        second = asyncio.run(async_loads(data.encode('utf-8'), cache=cache))
+
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(first[0].pk, second[0].pk)
+
+    def test_004_batch_objects_in_data(self):
+        self.addCleanup(decoders.__delitem__, Record)
+        batches = []
+
+        @decoders.register_batch(Record)
+        def decode(pks, cls):
+            batches.append(pks)
+            return [cls(pk) for pk in pks]
+
+        pairs = [envelope(Pair, [envelope(Record, i), envelope(Holder, {'record': envelope(Record, -i)})])
+                 for i in range(3)]
+
+        result = asyncio.run(async_loads(json.dumps(pairs)))
+
+        self.assertEqual(batches, [[0, 0, 1, -1, 2, -2]])
+        self.assertEqual([(p.first.pk, p.second.record.pk) for p in result], [(0, 0), (1, -1), (2, -2)])
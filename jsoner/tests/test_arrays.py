@@ -0,0 +1,69 @@
+import unittest
+from array import array
+
+from ..arrays import NumericArrays
+from ..arrays import to_array
+from ..registry import decoders
+from ..registry import encoders
+from ..serialization import dumps
+from ..serialization import loads
+from ..serialization import obj_spec
+from .test_serialization import Point
+
+
+class Series:
+    def __init__(self, values):
+        self.values = values
+
+
+class TestToArray(unittest.TestCase):
+    def test_000_integers(self):
+        self.assertEqual(to_array([1, 2]), array('q', [1, 2]))
+
+    def test_001_floats(self):
+        self.assertEqual(to_array([1, 2.5]), array('d', [1.0, 2.5]))
+
+    def test_002_other_lists(self):
+        for values in ([1, 'a'], [True, False], [1, None], [2 ** 64]):
+            self.assertIs(to_array(values), values)
+
+    def test_003_invalid_backend(self):
+        self.assertRaises(ValueError, NumericArrays, backend='foo')
+
+
+class TestNumericArrays(unittest.TestCase):
+    def setUp(self):
+        encoders.add(Series, lambda series: series.values)
+        decoders.add(Series, lambda values: Series(values))
+
+    def tearDown(self):
+        del encoders[Series]
+        del decoders[Series]
+
+    def test_000_paths(self):
+        arrays = NumericArrays(['/series/*/values', '/total'], min_length=2)
+        doc = {'series': [{'values': [1, 2]}, {'values': [1.5, 2]}, {}], 'total': [1], 'other': [1, 2]}
+
+        result = loads(dumps(doc), arrays=arrays)
+
+        self.assertEqual(result['series'][0]['values'], array('q', [1, 2]))
+        self.assertEqual(result['series'][1]['values'], array('d', [1.5, 2.0]))
+        self.assertEqual(result['total'], [1])
+        self.assertEqual(result['other'], [1, 2])
+
+    def test_001_document(self):
+        arrays = NumericArrays([''], min_length=1)
+
+        self.assertEqual(loads('[1, 2]', arrays=arrays), array('q', [1, 2]))
+        self.assertEqual(loads('[1, 2]', arrays=arrays, fast_path=True), array('q', [1, 2]))
+
+    def test_002_types(self):
+        data = dumps([Series([1, 2, 3]), Point([1, 2], [0.5])])
+
+        result = loads(data, arrays=NumericArrays(types=[Series, obj_spec(Point)], min_length=1))
+
+        self.assertEqual(result[0].values, array('q', [1, 2, 3]))
+        self.assertEqual(result[1], Point(array('q', [1, 2]), array('d', [0.5])))
+
+    def test_003_encoded_as_lists(self):
+        self.assertEqual(dumps({'a': array('d', [1.5])}), '{"a": [1.5]}')
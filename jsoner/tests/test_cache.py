@@ -0,0 +1,107 @@
+import unittest
+
+from ..cache import DecodeCache
+from ..cache import LRUCache
+from ..serialization import loads
+
+
+class TestLRUCache(unittest.TestCase):
+    def test_000_get_missing(self):
+        cache = LRUCache()
+
+        self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.get('a', 42), 42)
+        self.assertEqual(cache.misses, 2)
+
+    def test_001_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+
+    def test_002_overwrite(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['a'] = 2
+
+        self.assertEqual(cache.get('a'), 2)
+        self.assertEqual(len(cache), 1)
+
+    def test_003_clear(self):
+        cache = LRUCache()
+        cache['a'] = 1
+        cache.get('a')
+        cache.clear()
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.hits, 0)
+
+    def test_004_invalid_maxsize(self):
+        with self.assertRaises(ValueError):
+            LRUCache(maxsize=0)
+
+    def test_005_maxweight(self):
+        cache = LRUCache(maxweight=10)
+        cache.set('a', 1, weight=4)
+        cache.set('b', 2, weight=4)
+        cache.set('c', 3, weight=4)
+
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.weight, 8)
+
+        cache.set('b', 2, weight=1)
+        self.assertEqual(cache.weight, 5)
+
+    def test_006_too_heavy(self):
+        cache = LRUCache(maxweight=10)
+        cache.set('a', 1, weight=11)
+
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(cache.weight, 0)
+
+    def test_007_too_heavy_keeps_others(self):
+        cache = LRUCache(maxweight=10)
+        cache.set('a', 1, weight=4)
+        cache.set('b', 2, weight=4)
+        cache.set('c', 3, weight=11)
+
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(cache.weight, 8)
+
+        cache.set('a', 4, weight=11)
+        self.assertNotIn('a', cache)
+        self.assertEqual(cache.weight, 4)
+
+
+class TestDecodeCache(unittest.TestCase):
+    def test_000_hit(self):
+        cache = DecodeCache()
+        first = loads('{"a": [1]}', cache=cache)
+        second = loads(b'{"a": [1]}', cache=cache)
+
+        self.assertEqual(first, second)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_001_deep_copy(self):
+        cache = DecodeCache(deep_copy=True)
+        loads('{"a": [1]}', cache=cache)['a'].append(2)
+
+        self.assertEqual(loads('{"a": [1]}', cache=cache), {'a': [1]})
+
+    def test_002_shared(self):
+        cache = DecodeCache()
+
+        self.assertIs(loads('{"a": [1]}', cache=cache), loads('{"a": [1]}', cache=cache))
+
+    def test_003_maxbytes(self):
+        cache = DecodeCache(maxbytes=20)
+        loads('[1, 2, 3, 4, 5]', cache=cache)
+        loads('[6, 7, 8, 9, 10]', cache=cache)
+
+        self.assertEqual(len(cache), 1)
+        self.assertNotIn(DecodeCache.key('[1, 2, 3, 4, 5]'), cache)
@@ -0,0 +1,39 @@
+import unittest
+
+from ..chunks import dump_chunks
+from ..chunks import load_chunks
+from ..errors import JsonDecodingError
+from ..errors import JsonEncodingError
+from ..serialization import loads
+from .test_serialization import Point
+
+
+class TestChunks(unittest.TestCase):
+    def test_000_round_trip(self):
+        objs = [Point(i, 'ä' * (i % 5)) for i in range(100)]
+
+        chunks = list(dump_chunks(objs, max_bytes=500))
+
+        self.assertGreater(len(chunks), 1)
+        for chunk in chunks:
+            self.assertLessEqual(len(chunk), 500)
+            self.assertIsInstance(loads(chunk), list)
+        self.assertEqual(load_chunks(chunks), objs)
+
+    def test_001_filled_up(self):
+        chunks = list(dump_chunks(range(10), max_bytes=12, separators=(',', ':')))
+
+        self.assertEqual(chunks, [b'[0,1,2,3,4]', b'[5,6,7,8,9]'])
+        self.assertEqual(load_chunks(c.decode('utf-8') for c in chunks), list(range(10)))
+
+    def test_002_empty(self):
+        self.assertEqual(list(dump_chunks([], max_bytes=10)), [])
+        self.assertEqual(load_chunks([]), [])
+
+    def test_003_element_too_large(self):
+        with self.assertRaises(JsonEncodingError):
+            list(dump_chunks(['a', 'b' * 10], max_bytes=10))
+
+    def test_004_not_an_array(self):
+        with self.assertRaises(JsonDecodingError):
+            load_chunks([b'[1]', b'{"a": 1}'])
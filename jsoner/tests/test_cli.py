@@ -0,0 +1,138 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from ..cli import main
+from ..serialization import dumps
+from ..serialization import loads
+from .test_serialization import Point
+
+
+class TestCli(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.data = [Point(1, 2), {'a': [Point(3, 4), 'ä']}, 5, Point(5, 6)]
+
+    def path(self, name: str) -> str:
+        return os.path.join(self.directory, name)
+
+    def write(self, name: str, text: str) -> str:
+        path = self.path(name)
+        opener = gzip.open if name.endswith('.gz') else open
+        with opener(path, 'wt', encoding='utf-8') as fp:
+            fp.write(text)
+        return path
+
+    def run_main(self, *argv):
+        stdout, stderr = io.StringIO(), io.StringIO()
+        with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+            status = main(list(argv))
+        return status, stdout.getvalue(), stderr.getvalue()
+
+    def test_000_validate(self):
+        path = self.write('data.json', dumps(self.data))
+
+        status, out, _ = self.run_main('validate', path)
+
+        self.assertEqual(status, 0)
+        self.assertIn('4 records, 3 objects, 1 classes, 0 not importable', out)
+
+    def test_001_validate_missing_class(self):
+        text = '{"a": {"__obj_cls__": "missing.Class", "__json_data__": 1}}\n[1]\n'
+        path = self.write('data.jsonl', text)
+
+        status, out, _ = self.run_main('validate', path)
+
+        self.assertEqual(status, 1)
+        self.assertIn('cannot import `missing.Class` (1 objects)', out)
+        self.assertIn('2 records', out)
+
+    def test_002_invalid_json(self):
+        path = self.write('data.json', '[1, 2')
+
+        status, _, err = self.run_main('validate', path)
+
+        self.assertEqual(status, 1)
+        self.assertTrue(err.startswith('error: '))
+
+    def test_003_convert(self):
+        source = self.write('data.json.gz', dumps(self.data, indent=4))
+
+        for to in ('pretty', 'compact', 'jsonl'):
+            target = self.path('out.' + to)
+            status, _, _ = self.run_main('convert', source, target, '--to', to)
+            self.assertEqual(status, 0)
+
+            with open(target, encoding='utf-8') as fp:
+                text = fp.read()
+            if to == 'jsonl':
+                self.assertEqual([loads(line) for line in text.splitlines()], self.data)
+            else:
+                self.assertEqual(loads(text), self.data)
+                self.assertEqual(text, json.dumps(json.loads(text), indent=2 if to == 'pretty' else None,
+                                                  separators=(',', ': ') if to == 'pretty' else (',', ':'),
+                                                  ensure_ascii=False) + '\n')
+
+    def test_004_convert_compressed(self):
+        source = self.write('data.jsonl', '\n'.join(dumps(obj) for obj in self.data))
+        target = self.path('out.json.gz')
+
+        self.assertEqual(self.run_main('convert', source, target)[0], 0)
+
+        with gzip.open(target, 'rt', encoding='utf-8') as fp:
+            self.assertEqual(loads(fp.read()), self.data)
+
+    def test_005_convert_document(self):
+        source = self.write('data.json', dumps({'p': Point(1, 2)}))
+        target = self.path('out.jsonl')
+
+        self.assertEqual(self.run_main('convert', source, target, '--to', 'jsonl')[0], 0)
+
+        with open(target, encoding='utf-8') as fp:
+            self.assertEqual(loads(fp.read()), {'p': Point(1, 2)})
+
+    def test_006_stats(self):
+        data = self.data + [[Point(7, 8), Point(9, 10)]]
+        path = self.write('data.json', dumps(data, columnar=True))
+
+        status, out, _ = self.run_main('stats', path)
+
+        self.assertEqual(status, 0)
+        lines = out.splitlines()
+        self.assertEqual(lines[0], '5 records')
+        self.assertEqual(lines[1].split(), ['jsoner.tests.test_serialization.Point', '5'])
+
+    def test_007_bench(self):
+        path = self.write('data.json', dumps(self.data))
+
+        status, out, _ = self.run_main('bench', path, '--number', '1')
+
+        self.assertEqual(status, 0)
+        self.assertIn('jsoner.loads', out)
+
+    def test_008_module(self):
+        path = self.write('data.json', dumps(self.data))
+        root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+        result = subprocess.run([sys.executable, '-m', 'jsoner', 'convert', path, '-'], cwd=root,
+                                stdout=subprocess.PIPE, check=True)
+
+        self.assertEqual(loads(result.stdout.decode('utf-8')), self.data)
+
+    def test_009_stats_of_malformed_envelopes(self):
+        data = [{'__obj_cls__': ['x']}, {'__columnar_cls__': 'y', '__json_data__': 5},
+                {'__columnar_cls__': 'y', '__json_data__': {'a': 1}}]
+        path = self.write('data.json', json.dumps(data))
+
+        status, out, _ = self.run_main('stats', path)
+
+        self.assertEqual(status, 0)
+        self.assertEqual(out.splitlines()[1].split(), ['y', '0'])
@@ -0,0 +1,13 @@
+import subprocess
+import sys
+import unittest
+
+HEAVY_MODULES = ('pydoc', 'inspect', 'dataclasses', 'hashlib', 'asyncio', 'multiprocessing')
+
+
+class TestImport(unittest.TestCase):
+    def test_000_no_heavy_modules(self):
+        code = 'import sys, jsoner; print(" ".join(sys.modules))'
+        output = subprocess.check_output([sys.executable, '-c', code], universal_newlines=True)
+
+        self.assertEqual([name for name in HEAVY_MODULES if name in output.split()], [])
@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..errors import JsonDecodingError
+from ..index import INDEX_SUFFIX
+from ..index import JsonLinesReader
+from ..index import build_index
+from ..index import read_index
+from ..stream import dump_lines
+from .test_serialization import Point
+
+
+class TestIndex(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'data.jsonl')
+        self.objs = [Point(i, 'ä' * i) if i % 3 else {'i': i} for i in range(50)]
+        with open(self.path, 'w', encoding='utf-8') as fp:
+            dump_lines(self.objs, fp, ensure_ascii=False)
+            fp.write('\n')
+
+    def test_000_build_and_read_index(self):
+        offsets = build_index(self.path)
+
+        self.assertEqual(len(offsets), 50)
+        self.assertEqual(offsets[0], 0)
+        self.assertTrue(os.path.exists(self.path + INDEX_SUFFIX))
+        self.assertEqual(read_index(self.path), offsets)
+
+    def test_001_outdated_index(self):
+        build_index(self.path)
+        with open(self.path, 'a') as fp:
+            fp.write('1\n')
+
+        self.assertIsNone(read_index(self.path))
+        with JsonLinesReader(self.path) as reader:
+            self.assertEqual(len(reader), 51)
+
+    def test_002_rewritten_file_of_same_size(self):
+        build_index(self.path)
+        with open(self.path, 'rb') as fp:
+            data = fp.read()
+        with open(self.path, 'wb') as fp:
+            fp.write(b'\n' + data[:-1])
+        stat = os.stat(self.path)
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+
+        self.assertIsNone(read_index(self.path))
+        with JsonLinesReader(self.path) as reader:
+            self.assertEqual(reader[0], self.objs[0])
+            self.assertEqual(reader[49], self.objs[49])
+
+    def test_003_random_access(self):
+        with JsonLinesReader(self.path) as reader:
+            self.assertEqual(len(reader), 50)
+            self.assertEqual(reader[0], self.objs[0])
+            self.assertEqual(reader[37], self.objs[37])
+            self.assertEqual(reader[-1], self.objs[-1])
+            self.assertEqual(reader[10:20], self.objs[10:20])
+            self.assertEqual(reader[::7], self.objs[::7])
+            self.assertEqual(reader[20:10], [])
+            with self.assertRaises(IndexError):
+                reader[50]
+
+    def test_004_iterate(self):
+        with JsonLinesReader(self.path) as reader:
+            result = []
+            for obj in reader:
+                reader[0]
+                result.append(obj)
+
+        self.assertEqual(result, self.objs)
+
+    def test_005_truncated_file(self):
+        build_index(self.path)
+        stat = os.stat(self.path)
+        with open(self.path, 'r+b') as fp:
+            size = fp.seek(0, os.SEEK_END)
+            fp.truncate(size // 2)
+            fp.seek(0, os.SEEK_END)
+            fp.write(b' ' * (size - size // 2))
+        # a change which the index cannot detect
+        os.utime(self.path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+        with JsonLinesReader(self.path) as reader:
+            with self.assertRaises((JsonDecodingError, ValueError)):
+                reader[49]
+
+    def test_006_damaged_index(self):
+        offsets = build_index(self.path)
+        index_path = self.path + INDEX_SUFFIX
+        with open(index_path, 'rb') as fp:
+            data = fp.read()
+
+        for damaged in (data[:-3], data[:-8] + (os.path.getsize(self.path)).to_bytes(8, 'little')):
+            with open(index_path, 'wb') as fp:
+                fp.write(damaged)
+            self.assertIsNone(read_index(self.path))
+
+        with JsonLinesReader(self.path) as reader:
+            self.assertEqual(reader.offsets, offsets)
+        self.assertEqual(sorted(os.listdir(os.path.dirname(self.path))), ['data.jsonl', 'data.jsonl' + INDEX_SUFFIX])
@@ -0,0 +1,189 @@
+import asyncio
+import json
+import typing as T
+import unittest
+
+from ..aio import async_loads
+from ..cache import DecodeCache
+from ..iterative import decode
+from ..iterative import raw_decode
+from ..patch import DeltaDecoder
+from ..patch import DeltaEncoder
+from ..registry import decoders
+from ..serialization import JsonDecoder
+from ..serialization import digest
+from ..serialization import dumps
+from ..serialization import loads
+from ..serialization import obj_spec
+from .test_serialization import Point
+from .test_serialization import Record
+
+DEPTH = 20000
+
+
+class Node:
+    def __init__(self, child):
+        self.child = child
+
+    def to_dict(self) -> dict:
+        return {'child': self.child}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Node':
+        return cls(d['child'])
+
+
+def nested_lists(depth: int) -> list:
+    doc = inner = []  # type: list
+    for _ in range(depth - 1):
+        inner.append([])
+        inner = inner[0]
+    inner.append(1)
+    return doc
+
+
+def depth_of(doc) -> int:
+    depth = 0
+    while isinstance(doc, list):
+        doc = doc[0] if doc else None
+        depth += 1
+    return depth
+
+
+class TestParser(unittest.TestCase):
+    def test_000_like_json(self):
+        documents = [
+            '{"a": [1, -2.5e3, "x\\u00e4", true, false, null, {}], "b": {"c": []}}',
+            ' [1 , 2 ] ', '"s"', '-0', '1E+2', '-Infinity', '[{"a": 1, "a": 2}]',
+        ]
+        for doc in documents:
+            self.assertEqual(decode(json.JSONDecoder(), doc), json.loads(doc), doc)
+
+    def test_001_errors_like_json(self):
+        for doc in ('[1,]', '{"a" 1}', '{a: 1}', '[1 2]', '[', '{"a": 1', '[1] x', '', 'tru', '"\n"'):
+            with self.assertRaises(json.JSONDecodeError) as expected:
+                json.loads(doc)
+            with self.assertRaises(json.JSONDecodeError, msg=doc) as raised:
+                decode(json.JSONDecoder(), doc)
+            self.assertEqual((raised.exception.msg, raised.exception.pos),
+                             (expected.exception.msg, expected.exception.pos))
+
+    def test_002_hooks(self):
+        decoder = json.JSONDecoder(object_pairs_hook=list, parse_int=str, parse_float=str)
+
+        self.assertEqual(raw_decode(decoder, 'x {"a": [1, 2.5]} y', 2), ([('a', ['1', '2.5'])], 17))
+
+
+class TestDeepNesting(unittest.TestCase):
+    def test_000_lists(self):
+        doc = nested_lists(DEPTH)
+
+        data = dumps(doc)
+
+        self.assertEqual(data, '[' * DEPTH + '1' + ']' * DEPTH)
+        for kwargs in ({}, {'fast_path': True}, {'intern': True}, {'iterative': True}):
+            self.assertEqual(depth_of(loads(data, **kwargs)), DEPTH, kwargs)
+
+    def test_001_objects(self):
+        node = None
+        for i in range(DEPTH):
+            node = Node(node)
+
+        result = loads(dumps(node))
+
+        depth = 0
+        while result is not None:
+            self.assertIsInstance(result, Node)
+            result = result.child
+            depth += 1
+        self.assertEqual(depth, DEPTH)
+
+    def test_002_iterative_encoder(self):
+        doc = {'b': [Point(1, 2), iter([1, 'ä', None]), (), {}], 'a': {'y': {1: 2.5}, 'x': [True]}}
+        options = [{}, {'indent': 2}, {'sort_keys': True}, {'ensure_ascii': False}, {'canonical': True}]
+
+        for kwargs in options:
+            expected = dumps({'b': [Point(1, 2), [1, 'ä', None], (), {}], 'a': {'y': {1: 2.5}, 'x': [True]}}, **kwargs)
+            doc['b'][1] = iter([1, 'ä', None])
+            self.assertEqual(dumps(doc, iterative=True, **kwargs), expected, kwargs)
+
+    def test_003_circular_reference(self):
+        doc = nested_lists(DEPTH)
+        doc.append(doc)
+        obj = {'a': [1]}
+        obj['a'].append(obj)
+
+        for value in (doc, obj):
+            with self.assertRaises(ValueError):
+                dumps(value)
+            with self.assertRaises(ValueError):
+                dumps(value, canonical=True)
+            with self.assertRaises(ValueError):
+                digest(value)
+            with self.assertRaises(ValueError):
+                dumps(value, columnar=True)
+
+    def test_004_batch_decoder(self):
+        decoders.register_batch(Record)(lambda pks, cls: [cls(pk) for pk in pks])
+        self.addCleanup(decoders.__delitem__, Record)
+        envelope = json.dumps({'__obj_cls__': obj_spec(Record), '__json_data__': 7})
+        data = '[' * DEPTH + envelope + ']' * DEPTH
+
+        result = loads(data)
+
+        for _ in range(DEPTH):
+            result = result[0]
+        self.assertEqual(result.pk, 7)
+
+    def test_005_iterative_decoder(self):
+        decoder = JsonDecoder(iterative=True)
+
+        self.assertEqual(decoder.decode(dumps([Point(1, 2), {'a': 'b'}])), [Point(1, 2), {'a': 'b'}])
+
+    def test_006_canonical_and_columnar(self):
+        doc = leaf = {2: 1.0, 'points': [Point(1, 2), Point(3, 4)]}
+        for _ in range(DEPTH):
+            doc = [doc]
+        inner = '{"2":1,"points":' + dumps(leaf['points'], canonical=True) + '}'
+
+        self.assertEqual(dumps(doc, canonical=True), '[' * DEPTH + inner + ']' * DEPTH)
+        data = dumps(doc, columnar=True)
+        self.assertIn('__columnar_cls__', data)
+        result = loads(data)
+        for _ in range(DEPTH):
+            result = result[0]
+        self.assertEqual(result['points'], leaf['points'])
+        self.assertEqual(digest(doc), digest(loads(dumps(doc))))
+
+    def test_007_typed_any(self):
+        data = dumps(nested_lists(DEPTH))
+
+        self.assertEqual(depth_of(loads(data, into=T.Any)), DEPTH)
+
+    def test_008_patch(self):
+        encoder, decoder = DeltaEncoder(), DeltaDecoder()
+        decoder.apply(encoder.encode(nested_lists(DEPTH)))
+        doc = nested_lists(DEPTH)
+        inner = doc
+        while inner[0] != 1:
+            inner = inner[0]
+        inner[0] = 2
+
+        self.assertEqual(len(encoder.diff(doc)), 1)
+        result = decoder.apply(json.dumps([{'op': 'replace', 'path': '/0' * (DEPTH - 1) + '/0', 'value': 2}]))
+        self.assertEqual(depth_of(result), DEPTH)
+
+    def test_009_async(self):
+        result = asyncio.run(async_loads(dumps(nested_lists(DEPTH))))
+
+        self.assertEqual(depth_of(result), DEPTH)
+
+    def test_010_cache_copies(self):
+        cache = DecodeCache(deep_copy=True)
+        data = dumps([nested_lists(DEPTH), Point(1, 2)])
+        loads(data, cache=cache)
+
+        result = loads(data, cache=cache)
+        self.assertEqual(depth_of(result[0]), DEPTH)
+        self.assertEqual(result[1], Point(1, 2))
+        self.assertEqual(cache.hits, 1)
@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+import io
+import time
+import unittest
+
+from ..errors import JsonDecodingError
+from ..errors import LimitExceededError
+from ..limits import Limits
+from ..serialization import dumps
+from ..serialization import loads
+from ..serialization import obj_spec
+from ..stream import iterload
+from .test_serialization import Point
+
+
+class TestLimits(unittest.TestCase):
+    def test_000_within_limits(self):
+        limits = Limits(max_bytes=200, max_depth=3, max_objects=2, max_classes=1, max_string_length=50)
+
+        self.assertEqual(loads(dumps([Point(1, 2)]), limits=limits), [Point(1, 2)])
+
+    def test_001_max_bytes(self):
+        self.assertEqual(loads('"ä"', limits=Limits(max_bytes=4)), 'ä')
+        self.assertRaises(LimitExceededError, loads, '"ä"', limits=Limits(max_bytes=3))
+        self.assertRaises(LimitExceededError, loads, b'[1, 2]', limits=Limits(max_bytes=5))
+
+    def test_002_max_depth(self):
+        limits = Limits(max_depth=2)
+
+        self.assertEqual(loads('[{"a": 1}, ["]]]"]]', limits=limits), [{'a': 1}, [']]]']])
+        self.assertRaises(LimitExceededError, loads, '[{"a": [1]}]', limits=limits)
+        self.assertRaises(LimitExceededError, loads, '[[[1]]]', limits=limits, fast_path=True)
+
+    def test_003_max_string_length(self):
+        limits = Limits(max_string_length=3)
+
+        self.assertEqual(loads('{"abc": "\\""}', limits=limits), {'abc': '"'})
+        self.assertRaises(LimitExceededError, loads, '{"abcd": 1}', limits=limits)
+        self.assertRaises(LimitExceededError, loads, '"abcd"', limits=limits)
+
+    def test_004_max_objects(self):
+        data = dumps([Point(1, 2)] * 3)
+
+        self.assertEqual(len(loads(data, limits=Limits(max_objects=3))), 3)
+        self.assertRaises(LimitExceededError, loads, data, limits=Limits(max_objects=2))
+
+    def test_005_max_objects_columnar(self):
+        data = dumps([Point(1, 2)] * 3, columnar=True)
+
+        self.assertRaises(LimitExceededError, loads, data, limits=Limits(max_objects=2))
+
+    def test_006_max_classes(self):
+        data = '[{"__cls__": "jsoner.limits.Limits"}, {"__cls__": "jsoner.errors.JsonerException"}]'
+
+        self.assertEqual(len(loads(data, limits=Limits(max_classes=2))), 2)
+        self.assertRaises(LimitExceededError, loads, data, limits=Limits(max_classes=1))
+
+    def test_007_decoding_error(self):
+        self.assertTrue(issubclass(LimitExceededError, JsonDecodingError))
+
+    def test_008_stream(self):
+        fp = io.StringIO('[[1], "{}", [[2]]]'.format('x' * 100))
+
+        with self.assertRaises(LimitExceededError):
+            list(iterload(fp, limits=Limits(max_depth=1)))
+
+    def test_009_stream_element_size(self):
+        fp = io.StringIO('[1, "{}"]'.format('x' * 100))
+
+        with self.assertRaises(LimitExceededError):
+            list(iterload(fp, chunk_size=8, limits=Limits(max_bytes=50)))
+
+    def test_010_unterminated_escaped_string(self):
+        limits = Limits(max_bytes=1 << 20, max_depth=32, max_string_length=1 << 20)
+        data = '["' + '\\"' * 100000
+
+        start = time.perf_counter()
+        with self.assertRaises(ValueError):
+            loads(data, limits=limits)
+
+        self.assertLess(time.perf_counter() - start, 1)
+
+    def test_011_malformed_envelopes(self):
+        documents = ['{"__columnar_cls__": "x", "__json_data__": 5}',
+                     '{"__columnar_cls__": "x", "__json_data__": {"a": [1]}}',
+                     '{"__columnar_cls__": "x", "__json_data__": [5]}',
+                     '{"__obj_cls__": ["x"], "__json_data__": 1}',
+                     '{"__cls__": {"a": 1}}']
+
+        for data in documents:
+            self.assertEqual(loads(data, limits=Limits()), loads(data))
+
+        with self.assertRaises(JsonDecodingError):
+            data = '{{"__columnar_cls__": "{}", "__json_data__": [[1], 2]}}'.format(obj_spec(Point))
+            loads(data, limits=Limits())
@@ -0,0 +1,156 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from ..errors import LimitExceededError
+from ..limits import Limits
+from ..parallel import MANIFEST_NAME
+from ..parallel import ShardedReader
+from ..parallel import _decode_part
+from ..parallel import _find_boundaries
+from ..parallel import dump_sharded
+from ..parallel import loads_parallel
+from ..registry import decoders
+from ..serialization import dumps
+from ..serialization import obj_spec
+from .test_serialization import Point
+from .test_serialization import Record
+
+
+class TestSharded(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.objs = [Point(i, str(i)) if i % 2 else {'i': i} for i in range(25)]
+
+    def test_000_number_of_shards(self):
+        manifest = dump_sharded(self.objs, self.directory, shards=4, processes=1)
+
+        self.assertEqual(manifest['count'], 25)
+        self.assertEqual([s['count'] for s in manifest['shards']], [7, 7, 7, 4])
+        self.assertEqual([s['start'] for s in manifest['shards']], [0, 7, 14, 21])
+        self.assertEqual(manifest['classes'], ['jsoner.tests.test_serialization.Point'])
+        self.assertTrue(os.path.exists(os.path.join(self.directory, MANIFEST_NAME)))
+
+    def test_001_shard_size_with_iterator(self):
+        manifest = dump_sharded(iter(self.objs), self.directory, shard_size=10, processes=1)
+
+        self.assertEqual([s['count'] for s in manifest['shards']], [10, 10, 5])
+
+    def test_002_read(self):
+        dump_sharded(self.objs, self.directory, shard_size=10, processes=1)
+        reader = ShardedReader(self.directory)
+
+        self.assertEqual(len(reader), 25)
+        self.assertEqual(reader.load_shard(1), self.objs[10:20])
+        self.assertEqual(list(reader), self.objs)
+        self.assertEqual(reader.load(processes=1), self.objs)
+
+    def test_003_process_pool(self):
+        dump_sharded(self.objs, self.directory, shards=3, processes=2)
+        reader = ShardedReader(os.path.join(self.directory, MANIFEST_NAME))
+
+        self.assertEqual(reader.load(processes=2), self.objs)
+
+    def test_004_columnar_classes(self):
+        manifest = dump_sharded([[Point(1, 2), Point(3, 4)]], self.directory, shards=1, processes=1,
+                                columnar=True)
+
+        self.assertEqual(manifest['classes'], ['jsoner.tests.test_serialization.Point'])
+
+    def test_005_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            dump_sharded(self.objs, self.directory)
+        with self.assertRaises(ValueError):
+            dump_sharded(self.objs, self.directory, shards=1, indent=2)
+
+    def test_006_not_a_manifest(self):
+        path = os.path.join(self.directory, 'foo.json')
+        with open(path, 'w') as fp:
+            fp.write('{}')
+
+        with self.assertRaises(ValueError):
+            ShardedReader(path)
+
+
+class TestLoadsParallel(unittest.TestCase):
+    def setUp(self):
+        self.objs = [{'a': [i, 'x],{"'], 'b': Point(i, '"[')} for i in range(40)] + list(range(20))
+
+    def test_000_boundaries(self):
+        data = json.dumps([{'a': ['],{"'] * i} for i in range(20)] + ['",['] * 20)
+
+        for parts in range(2, 8):
+            boundaries = _find_boundaries(data, 0, parts)
+            self.assertEqual(len(boundaries), parts - 1)
+            self.assertTrue(all(data[pos] == ',' for pos in boundaries))
+            self.assertTrue(all(json.loads('[' + data[pos + 1:]) for pos in boundaries))
+
+    def test_001_array(self):
+        data = dumps(self.objs)
+
+        self.assertEqual(loads_parallel(data, processes=3, min_size=0), self.objs)
+        self.assertEqual(loads_parallel(data.encode(), processes=1), self.objs)
+
+    def test_002_object(self):
+        objs = {str(i): obj for i, obj in enumerate(self.objs)}
+
+        self.assertEqual(loads_parallel(dumps(objs), processes=3, min_size=0), objs)
+
+    def test_003_envelope(self):
+        data = dumps(Point(list(range(100)), ['a'] * 100))
+
+        self.assertEqual(loads_parallel(data, processes=2, min_size=0), Point(list(range(100)), ['a'] * 100))
+
+    def test_004_other_documents(self):
+        for data in ('[]', '{}', ' [1] ', '"a"', '1'):
+            self.assertEqual(loads_parallel(data, processes=2, min_size=0), json.loads(data))
+
+    def test_005_invalid(self):
+        for data in ('[1, 2, 3, 4,]', '{"a": 1, "b": 2, "c" 3}', '[1, 2, 3, 4] 5'):
+            with self.assertRaises(ValueError):
+                loads_parallel(data, processes=2, min_size=0)
+
+    def test_006_limits(self):
+        data = dumps(self.objs)
+
+        with self.assertRaises(LimitExceededError):
+            loads_parallel(data, processes=3, min_size=0, limits=Limits(max_bytes=len(data) - 1))
+        # each part holds less than 40 objects, the document holds 40
+        with self.assertRaises(LimitExceededError):
+            loads_parallel(data, processes=3, min_size=0, limits=Limits(max_objects=39))
+        objs = {str(i): obj for i, obj in enumerate(self.objs)}
+        with self.assertRaises(LimitExceededError):
+            loads_parallel(dumps(objs), processes=3, min_size=0, limits=Limits(max_objects=39))
+        self.assertEqual(loads_parallel(data, processes=3, min_size=0, limits=Limits(max_objects=40)), self.objs)
+
+    def test_007_batch_decoder_per_part(self):
+        calls = []
+
+        @decoders.register_batch(Record)
+        def decode(pks, cls):
+            calls.append(pks)
+            return [cls(pk) for pk in pks]
+        self.addCleanup(decoders.__delitem__, Record)
+
+        def envelope(pk):
+            return {'__obj_cls__': obj_spec(Record), '__json_data__': pk}
+
+        part = json.dumps({'a': envelope(1), 'b': [envelope(2)], 'c': {'d': envelope(3)}})
+        result, objects, classes = _decode_part(part, {'limits': Limits()})
+
+        self.assertEqual(calls, [[1, 2, 3]])
+        self.assertEqual([result['a'].pk, result['b'][0].pk, result['c']['d'].pk], [1, 2, 3])
+        self.assertEqual((objects, classes), (3, {obj_spec(Record)}))
+
+    def test_008_batch_decoder_of_envelope(self):
+        decoders.register_batch(Record)(lambda data, cls: [cls(item['pk']) for item in data])
+        self.addCleanup(decoders.__delitem__, Record)
+        data = json.dumps({'__json_data__': {'pk': 7, 'names': ['a'] * 100}, '__obj_cls__': obj_spec(Record)})
+
+        result = loads_parallel(data, processes=2, min_size=10)
+
+        self.assertIsInstance(result, Record)
+        self.assertEqual(result.pk, 7)
@@ -0,0 +1,210 @@
+import json
+import typing as T
+import unittest
+
+from ..errors import JsonDecodingError
+from ..errors import LimitExceededError
+from ..limits import Limits
+from ..patch import DeltaDecoder
+from ..patch import DeltaEncoder
+from ..patch import apply_patch
+from ..patch import make_patch
+
+
+class Counter:
+    def __init__(self, name, values):
+        self.name = name
+        self.values = values
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Counter) and (self.name, self.values) == (other.name, other.values)
+
+    def to_dict(self) -> dict:
+        return {'name': self.name, 'values': self.values}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Counter':
+        return cls(**d)
+
+
+class TestMakePatch(unittest.TestCase):
+    def test_000_equal(self):
+        self.assertEqual(make_patch({'a': [1, {'b': None}]}, {'a': [1, {'b': None}]}), [])
+
+    def test_001_replace_value(self):
+        self.assertEqual(make_patch({'a': 1}, {'a': 2}), [{'op': 'replace', 'path': '/a', 'value': 2}])
+
+    def test_002_replace_type(self):
+        self.assertEqual(make_patch([1], {'a': 1}), [{'op': 'replace', 'path': '', 'value': {'a': 1}}])
+
+    def test_003_shrink_list(self):
+        patch = make_patch([1, 2, 3], [1])
+
+        self.assertEqual(patch, [{'op': 'remove', 'path': '/2'}, {'op': 'remove', 'path': '/1'}])
+        self.assertEqual(apply_patch([1, 2, 3], patch), [1])
+
+    def test_004_escape_keys(self):
+        patch = make_patch({}, {'a/b~c': 1})
+
+        self.assertEqual(patch, [{'op': 'add', 'path': '/a~1b~0c', 'value': 1}])
+        self.assertEqual(apply_patch({}, patch), {'a/b~c': 1})
+
+    def test_005_round_trip(self):
+        old = {'a': [1, 2, {'b': 'c'}], 'd': {'e': None}, 'f': 1}
+        new = {'a': [1, 3, {'b': 'd'}, 4], 'd': {}, 'g': True}
+
+        self.assertEqual(apply_patch(json.loads(json.dumps(old)), make_patch(old, new)), new)
+
+
+class TestApplyPatch(unittest.TestCase):
+    def test_000_test_operation(self):
+        self.assertEqual(apply_patch({'a': 1}, [{'op': 'test', 'path': '/a', 'value': 1}]), {'a': 1})
+
+        with self.assertRaises(JsonDecodingError):
+            apply_patch({'a': 1}, [{'op': 'test', 'path': '/a', 'value': 2}])
+
+    def test_001_missing_target(self):
+        with self.assertRaises(JsonDecodingError):
+            apply_patch({'a': 1}, [{'op': 'replace', 'path': '/b', 'value': 2}])
+
+        with self.assertRaises(JsonDecodingError):
+            apply_patch([], [{'op': 'remove', 'path': '/0'}])
+
+    def test_002_unsupported_operation(self):
+        with self.assertRaises(JsonDecodingError):
+            apply_patch({'a': 1}, [{'op': 'move', 'from': '/a', 'path': '/b'}])
+
+    def test_003_invalid_pointer(self):
+        with self.assertRaises(JsonDecodingError):
+            apply_patch({'a': 1}, [{'op': 'remove', 'path': 'a'}])
+
+    def test_004_array_indices(self):
+        for path in ('/-1', '/01', '/+1', '/ 1', '/3', '/-'):
+            with self.assertRaises(JsonDecodingError):
+                apply_patch([1, 2], [{'op': 'replace', 'path': path, 'value': 0}])
+        for path in ('/-1', '/01', '/3', '/10'):
+            with self.assertRaises(JsonDecodingError):
+                apply_patch([1, 2], [{'op': 'add', 'path': path, 'value': 0}])
+
+        self.assertEqual(apply_patch([1, 2], [{'op': 'add', 'path': '/2', 'value': 0}]), [1, 2, 0])
+        self.assertEqual(apply_patch([1, 2], [{'op': 'add', 'path': '/0', 'value': 0}]), [0, 1, 2])
+        self.assertEqual(apply_patch({'01': 1}, [{'op': 'remove', 'path': '/01'}]), {})
+
+    def test_005_atomic(self):
+        doc = {'a': [1, {'b': 2}], 'c': {'d': 3}}
+        patch = [
+            {'op': 'replace', 'path': '/a/1/b', 'value': 4},
+            {'op': 'add', 'path': '/a/-', 'value': 5},
+            {'op': 'remove', 'path': '/c/d'},
+            {'op': 'remove', 'path': '/c/e'}
+        ]
+
+        with self.assertRaises(JsonDecodingError):
+            apply_patch(doc, patch)
+        self.assertEqual(doc, {'a': [1, {'b': 2}], 'c': {'d': 3}})
+
+        patched = apply_patch(doc, patch[:-1])
+        self.assertEqual(patched, {'a': [1, {'b': 4}, 5], 'c': {}})
+        self.assertEqual(doc, {'a': [1, {'b': 2}], 'c': {'d': 3}})
+
+    def test_006_invalid_operations(self):
+        doc = {'a': 1}
+        patches = [
+            {'op': 'remove', 'path': '/a'},
+            ['remove'],
+            [{'op': 'remove'}],
+            [{'op': 'remove', 'path': 1}],
+            [{'path': '/a'}],
+            [{'op': 'add', 'path': '/b'}],
+            [{'op': 'test', 'path': ''}],
+        ]
+        for patch in patches:
+            with self.assertRaises(JsonDecodingError):
+                apply_patch(doc, patch)
+        self.assertEqual(apply_patch(doc, [{'op': 'test', 'path': '/a', 'value': 1}]), {'a': 1})
+
+
+class TestDelta(unittest.TestCase):
+    def test_000_revive_objects(self):
+        encoder = DeltaEncoder()
+        decoder = DeltaDecoder()
+
+        counter = Counter('foo', [1, 2])
+        self.assertEqual(decoder.apply(encoder.encode(counter)), counter)
+
+        counter.values.append(3)
+        patch = encoder.encode(counter)
+        self.assertEqual(json.loads(patch), [{'op': 'add', 'path': '/__json_data__/values/2', 'value': 3}])
+        self.assertEqual(decoder.apply(patch), counter)
+
+    def test_001_unchanged(self):
+        encoder = DeltaEncoder()
+        encoder.encode(Counter('foo', []))
+
+        self.assertEqual(encoder.diff(Counter('foo', [])), [])
+
+    def test_002_failed_patch_keeps_state(self):
+        decoder = DeltaDecoder()
+        decoder.apply([{'op': 'replace', 'path': '', 'value': {'a': [1, 2]}}])
+
+        with self.assertRaises(JsonDecodingError):
+            decoder.apply([{'op': 'add', 'path': '/a/-', 'value': 3}, {'op': 'remove', 'path': '/b'}])
+
+        self.assertEqual(decoder.state, {'a': [1, 2]})
+        self.assertEqual(decoder.apply([{'op': 'add', 'path': '/a/-', 'value': 3}]), {'a': [1, 2, 3]})
+
+    def test_003_reset(self):
+        encoder = DeltaEncoder()
+        encoder.encode([1])
+        encoder.reset()
+
+        self.assertEqual(encoder.diff([1]), [{'op': 'replace', 'path': '', 'value': [1]}])
+
+    def test_004_numbers_of_other_types(self):
+        encoder = DeltaEncoder()
+        encoder.encode({'a': [1, 2.5, float('nan')], 'b': {'c': 1}})
+
+        self.assertEqual(encoder.diff({'a': [1, 2.5, float('nan')], 'b': {'c': 1}}), [])
+        patch = encoder.diff({'a': [True, 2.5, float('nan')], 'b': {'c': 1.0}})
+        self.assertEqual(patch, [{'op': 'replace', 'path': '/a/0', 'value': True},
+                                 {'op': 'replace', 'path': '/b/c', 'value': 1.0}])
+        self.assertIs(patch[0]['value'], True)
+        self.assertIsInstance(patch[1]['value'], float)
+
+    def test_005_numbers_within_added_values(self):
+        encoder = DeltaEncoder()
+        encoder.encode({'a': []})
+
+        patch = encoder.diff({'a': [{'b': [1, 1.5]}]})
+        self.assertEqual(patch, [{'op': 'add', 'path': '/a/0', 'value': {'b': [1, 1.5]}}])
+        self.assertIsInstance(patch[0]['value']['b'][0], int)
+
+    def test_006_state_not_changed_by_revival(self):
+        decoder = DeltaDecoder()
+        patch = [{'op': 'replace', 'path': '', 'value': {'c': {'__obj_cls__': __name__ + '.Counter',
+                                                               '__json_data__': {'name': 'foo', 'values': [1]}}}}]
+
+        self.assertEqual(decoder.apply(patch), {'c': Counter('foo', [1])})
+        self.assertEqual(decoder.apply([{'op': 'add', 'path': '/c/__json_data__/values/-', 'value': 2}]),
+                         {'c': Counter('foo', [1, 2])})
+        self.assertEqual(decoder.state['c']['__json_data__'], {'name': 'foo', 'values': [1, 2]})
+
+    def test_007_limits(self):
+        decoder = DeltaDecoder(limits=Limits(max_bytes=300, max_depth=6, max_objects=1))
+        encoder = DeltaEncoder()
+        decoder.apply(encoder.encode([Counter('foo', [])]))
+
+        with self.assertRaises(LimitExceededError):
+            decoder.apply(encoder.encode([Counter('foo', []), Counter('bar', [])]))
+        with self.assertRaises(LimitExceededError):
+            decoder.apply('[{"op": "add", "path": "/-", "value": [[[[[1]]]]]}]')
+        with self.assertRaises(LimitExceededError):
+            decoder.apply(b'[{"op": "add", "path": "/-", "value": "' + b'x' * 300 + b'"}]')
+
+    def test_008_into(self):
+        decoder = DeltaDecoder(into=T.Dict[str, T.List[float]])
+
+        self.assertEqual(decoder.apply([{'op': 'replace', 'path': '', 'value': {'a': [1]}}]), {'a': [1.0]})
+        revived = decoder.apply([{'op': 'add', 'path': '/a/-', 'value': 2}])
+        self.assertEqual(revived, {'a': [1.0, 2.0]})
+        self.assertIsNot(revived['a'], decoder.state['a'])
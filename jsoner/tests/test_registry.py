@@ -1,7 +1,10 @@
 from unittest import TestCase
 
+from jsoner.registry import BatchFunction
 from jsoner.registry import Registry
 from jsoner.registry import SubclassRegistry
+from jsoner.registry import IMPORT_CACHE_SIZE
+from jsoner.registry import _import_object
 from jsoner.registry import import_object
 
 
@@ -67,6 +70,17 @@ class TestRegistry(TestCase):
 
         self.assertIsNone(r.get(42))
 
+    def test_008_register_batch(self):
+        r = Registry()
+
+        @r.register_batch('A')
+        def foo(values):
+            return values
+
+        self.assertIsInstance(r['A'], BatchFunction)
+        self.assertIs(r['A'].func, foo)
+        self.assertEqual(r['A']([1]), [1])
+
 
 class DummyObject:
     pass
@@ -214,3 +228,27 @@ class TestImportObject(TestCase):
     def test_002_pass_invalid_argument(self):
         with self.assertRaises(ImportError):
             import_object('jsoner.tests.test_registry.Bar')
+
+    def test_003_builtins_and_modules(self):
+        import collections.abc
+
+        self.assertIs(import_object('dict'), dict)
+        self.assertIs(import_object('collections.abc'), collections.abc)
+        self.assertIs(import_object('collections.abc.Mapping.get'), collections.abc.Mapping.get)
+
+    def test_004_invalid_paths(self):
+        for path in ('', 'jsoner..registry', 'jsoner.tests.<locals>.A'):
+            with self.assertRaises(ImportError):
+                import_object(path)
+
+    def test_005_bounded_cache(self):
+        """
+        The paths come from the documents, thus the cache must not grow
+        with the number of different paths.
+        """
+        path = 'os'
+        for _ in range(IMPORT_CACHE_SIZE + 10):
+            path += '.path.os'
+            import_object(path)
+
+        self.assertLessEqual(_import_object.cache_info().currsize, IMPORT_CACHE_SIZE)
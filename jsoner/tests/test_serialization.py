@@ -1,16 +1,32 @@
 
 
+import typing as T
 import json
 import unittest
+from unittest import mock
 
+from ..cache import LRUCache
+from ..errors import JsonDecodingError
+from ..errors import JsonEncodingError
 from ..registry import decoders
 from ..registry import encoders
+from ..registry import import_object
+from ..serialization import DUMP_PIECE_SIZE
 from ..serialization import DictConvertible
+from ..serialization import ItemsConvertible
 from ..serialization import JsonEncoder
 from ..serialization import JsonerSerializable
+from ..serialization import JsonDecoder
 from ..serialization import StrConvertible
+from ..serialization import digest
+from ..serialization import dump_into
+from ..serialization import dumps_bytes
+from ..serialization import estimate_size
+from ..serialization import has_markers
 from ..serialization import json_hook
+from ..serialization import loads
 from ..serialization import maybe_convert_to_obj
+from ..serialization import obj_spec
 
 
 class TestStrSerializable(unittest.TestCase):
@@ -368,3 +384,670 @@ class TestJsonHook(unittest.TestCase):
         result = json_hook(data)
 
         self.assertIsInstance(result, DummyStrConvertible)
+
+
+class Point:
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Point) and (self.x, self.y) == (other.x, other.y)
+
+    def to_dict(self) -> dict:
+        return {'x': self.x, 'y': self.y}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Point':
+        return cls(**d)
+
+
+class TestColumnar(unittest.TestCase):
+    def test_000_encode_homogeneous_list(self):
+        encoder = JsonEncoder(columnar=True)
+
+        result = json.loads(encoder.encode([Point(1, 2), Point(3, 4)]))
+        expected = {
+            '__columnar_cls__': 'jsoner.tests.test_serialization.Point',
+            '__columns__': ['x', 'y'],
+            '__json_data__': [[1, 3], [2, 4]]
+        }
+
+        self.assertDictEqual(result, expected)
+
+    def test_001_round_trip(self):
+        points = [Point(i, str(i)) for i in range(10)]
+
+        result = json.loads(JsonEncoder(columnar=True).encode({'points': points}), object_hook=json_hook)
+
+        self.assertEqual(result, {'points': points})
+
+    def test_002_disabled_by_default(self):
+        result = json.loads(JsonEncoder().encode([Point(1, 2), Point(3, 4)]))
+
+        self.assertEqual(len(result), 2)
+        self.assertIn('__obj_cls__', result[0])
+
+    def test_003_mixed_list_is_not_columnar(self):
+        encoder = JsonEncoder(columnar=True)
+
+        result = json.loads(encoder.encode([Point(1, 2), DummyDictConvertible()]))
+
+        self.assertIsInstance(result, list)
+        self.assertEqual(len(result), 2)
+
+    def test_004_single_object_is_not_columnar(self):
+        encoder = JsonEncoder(columnar=True)
+
+        result = json.loads(encoder.encode([Point(1, 2)]))
+
+        self.assertIn('__obj_cls__', result[0])
+
+    def test_005_nested_lists(self):
+        encoder = JsonEncoder(columnar=True)
+        points = [Point([Point(1, 2), Point(3, 4)], 0), Point([], 1)]
+
+        data = encoder.encode(points)
+        result = json.loads(data, object_hook=json_hook)
+
+        self.assertEqual(result, points)
+        self.assertEqual(data.count('__columnar_cls__'), 2)
+
+    def test_006_different_fields(self):
+        class P(Point):
+            def to_dict(self) -> dict:
+                return {'x': self.x} if self.y is None else super().to_dict()
+
+        encoder = JsonEncoder(columnar=True)
+        result = json.loads(encoder.encode([P(1, None), P(1, 2)]))
+
+        self.assertEqual([r['__json_data__'] for r in result], [{'x': 1}, {'x': 1, 'y': 2}])
+
+    def test_007_class_not_found(self):
+        data = {'__columnar_cls__': 'abc.abc', '__columns__': [], '__json_data__': []}
+
+        self.assertIs(maybe_convert_to_obj(data), data)
+
+    def test_008_columns_of_different_length(self):
+        cls = obj_spec(Point)
+        for columns, data in ((['x', 'y'], [[1, 2], [3]]), (['x', 'y'], [[1, 2]]), (['x'], [[1], [2]]),
+                              (['x', 'y'], [[1], 2])):
+            with self.assertRaises(JsonDecodingError):
+                loads(json.dumps({'__columnar_cls__': cls, '__columns__': columns, '__json_data__': data}))
+        with self.assertRaises(JsonDecodingError):
+            loads(json.dumps({'__columns__': ['x', 'y'], '__json_data__': [[1, 2], [3]]}), into=T.List[Point])
+
+
+class Record:
+    def __init__(self, pk):
+        self.pk = pk
+
+
+class Holder:
+    def __init__(self, record):
+        self.record = record
+
+    def to_dict(self) -> dict:
+        return {'record': self.record}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> 'Holder':
+        return cls(d['record'])
+
+
+class TestBatchDecoding(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @decoders.register_batch(Record)
+        def decode(pks, cls):
+            self.calls.append(pks)
+            return [cls(pk) for pk in pks]
+
+    def tearDown(self):
+        del decoders[Record]
+
+    def envelope(self, pk):
+        return {'__obj_cls__': obj_spec(Record), '__json_data__': pk}
+
+    def test_000_one_call_per_document(self):
+        data = json.dumps({'a': [self.envelope(1), self.envelope(2)], 'b': self.envelope(3)})
+
+        result = loads(data)
+
+        self.assertEqual(self.calls, [[1, 2, 3]])
+        self.assertEqual([r.pk for r in result['a']], [1, 2])
+        self.assertEqual(result['b'].pk, 3)
+
+    def test_001_top_level_object(self):
+        result = loads(json.dumps(self.envelope(1)))
+
+        self.assertIsInstance(result, Record)
+        self.assertEqual(self.calls, [[1]])
+
+    def test_002_nested_in_other_object(self):
+        holder = {'__obj_cls__': obj_spec(Holder), '__json_data__': {'record': self.envelope(1)}}
+
+        result = loads(json.dumps([holder, self.envelope(2)]))
+
+        self.assertIsInstance(result[0], Holder)
+        self.assertEqual(result[0].record.pk, 1)
+        self.assertEqual(result[1].pk, 2)
+        self.assertEqual(self.calls, [[1, 2]])
+
+    def test_005_many_holders(self):
+        holders = [{'__obj_cls__': obj_spec(Holder), '__json_data__': {'record': self.envelope(i)}}
+                   for i in range(10)]
+        data = {'holders': holders, 'nested': {'__obj_cls__': obj_spec(Holder), '__json_data__': {
+            'record': {'__obj_cls__': obj_spec(Holder), '__json_data__': {'record': self.envelope(10)}}}}}
+
+        result = loads(json.dumps(data))
+
+        self.assertEqual([h.record.pk for h in result['holders']], list(range(10)))
+        self.assertEqual(result['nested'].record.record.pk, 10)
+        self.assertEqual(self.calls, [list(range(11))])
+
+    def test_006_nested_batch_objects(self):
+        inner = self.envelope(self.envelope(1))
+
+        result = loads(json.dumps([inner, self.envelope(2)]))
+
+        self.assertEqual(self.calls, [[1, 2], [result[0].pk]])
+        self.assertEqual(result[0].pk.pk, 1)
+        self.assertEqual(result[1].pk, 2)
+
+    def test_003_without_batch(self):
+        result = maybe_convert_to_obj(self.envelope(1))
+
+        self.assertEqual(result.pk, 1)
+        self.assertEqual(self.calls, [[1]])
+
+    def test_004_wrong_number_of_results(self):
+        del decoders[Record]
+        decoders.register_batch(Record)(lambda pks: [])
+
+        with self.assertRaises(JsonDecodingError):
+            loads(json.dumps([self.envelope(1)]))
+
+
+class TestBatchEncoding(unittest.TestCase):
+    def setUp(self):
+        self.calls = []
+
+        @encoders.register_batch(Record)
+        def encode(records):
+            self.calls.append([r.pk for r in records])
+            return [r.pk for r in records]
+
+        decoders.register_batch(Record)(lambda pks, cls: [cls(pk) for pk in pks])
+
+    def tearDown(self):
+        del encoders[Record]
+        del decoders[Record]
+
+    def test_000_one_call_per_document(self):
+        records = [Record(1), Record(2)]
+
+        result = json.loads(JsonEncoder().encode({'a': records, 'b': (Record(3),)}))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual(sorted(self.calls[0]), [1, 2, 3])
+        self.assertEqual([r['__json_data__'] for r in result['a']], [1, 2])
+
+    def test_001_nested_in_object(self):
+        result = json.loads(JsonEncoder().encode(Holder(Record(1))))
+
+        self.assertEqual(result['__json_data__']['record']['__json_data__'], 1)
+        self.assertEqual(self.calls, [[1]])
+
+    def test_002_round_trip(self):
+        result = loads(JsonEncoder(columnar=True).encode([Record(1), Record(2)]))
+
+        self.assertEqual([r.pk for r in result], [1, 2])
+
+    def test_003_wrong_number_of_values(self):
+        del encoders[Record]
+        encoders.register_batch(Record)(lambda records: [])
+
+        with self.assertRaises(JsonEncodingError):
+            JsonEncoder().encode([Record(1)])
+
+    def test_004_circular_reference(self):
+        data = [Record(1)]
+        data.append(data)
+
+        with self.assertRaises(ValueError):
+            JsonEncoder().encode(data)
+
+
+class Currency:
+    # the number of calls of to_str
+    encoded = 0
+
+    def __init__(self, code):
+        self.code = code
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Currency) and self.code == other.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def to_str(self) -> str:
+        Currency.encoded += 1
+        return self.code
+
+    @classmethod
+    def from_str(cls, s: str) -> 'Currency':
+        return cls(s)
+
+
+class TestMemo(unittest.TestCase):
+    def setUp(self):
+        Currency.encoded = 0
+
+    def test_000_encode_once(self):
+        memo = LRUCache()
+        encoder = JsonEncoder(memo=memo)
+
+        result = loads(encoder.encode([Currency('EUR'), Currency('USD'), Currency('EUR')]))
+
+        self.assertEqual(result, [Currency('EUR'), Currency('USD'), Currency('EUR')])
+        self.assertEqual(Currency.encoded, 2)
+        self.assertEqual(memo.hits, 1)
+
+    def test_001_shared_between_calls(self):
+        memo = LRUCache()
+        JsonEncoder(memo=memo).encode(Currency('EUR'))
+        JsonEncoder(memo=memo).encode(Currency('EUR'))
+
+        self.assertEqual(Currency.encoded, 1)
+
+    def test_002_unhashable_objects(self):
+        memo = LRUCache()
+        encoder = JsonEncoder(memo=memo)
+
+        result = json.loads(encoder.encode([Point(1, 2), Point(1, 2)]))
+
+        self.assertEqual(len(result), 2)
+        self.assertEqual(len(memo), 0)
+
+    def test_003_not_serializable(self):
+        encoder = JsonEncoder(memo=LRUCache())
+
+        self.assertRaises(TypeError, encoder.encode, object())
+
+    def test_004_identity_hashed_objects(self):
+        class Mutable(DictConvertible):
+            def __init__(self, b):
+                self.b = b
+
+            def to_dict(self) -> dict:
+                return {'b': self.b}
+
+            @classmethod
+            def from_dict(cls, d: dict) -> 'Mutable':
+                return cls(**d)
+
+        memo = LRUCache()
+        a = Mutable(1)
+        JsonEncoder(memo=memo).encode(a)
+        a.b = 2
+
+        self.assertEqual(json.loads(JsonEncoder(memo=memo).encode(a))['__json_data__'], {'b': 2})
+        self.assertEqual(len(memo), 0)
+
+    def test_005_options_are_part_of_the_key(self):
+        memo = LRUCache()
+
+        with_envelope = JsonEncoder(memo=memo).encode(Currency('EUR'))
+        without_envelope = JsonEncoder(memo=memo, envelope=False).encode(Currency('EUR'))
+
+        self.assertEqual(json.loads(with_envelope)['__json_data__'], 'EUR')
+        self.assertEqual(without_envelope, '"EUR"')
+        self.assertEqual(Currency.encoded, 2)
+
+
+class TestFastPath(unittest.TestCase):
+    def test_000_has_markers(self):
+        self.assertFalse(has_markers('{"cls": "a.__cls__"}'))
+        self.assertTrue(has_markers('{"__cls__": 1}'))
+        self.assertTrue(has_markers('{"__obj_cls__": 1}'))
+        self.assertTrue(has_markers('{"__columnar_cls__": 1}'))
+
+    def test_001_plain_document(self):
+        decoder = JsonDecoder(fast_path=True)
+
+        self.assertEqual(decoder.decode('{"a": [{"b": 1}]}'), {'a': [{'b': 1}]})
+
+    def test_002_document_with_objects(self):
+        data = JsonEncoder().encode({'a': [DummyDictConvertible()]})
+
+        result = JsonDecoder(fast_path=True).decode(data)
+
+        self.assertIsInstance(result['a'][0], DummyDictConvertible)
+
+    def test_003_keeps_parse_options(self):
+        result = loads('[1.5]', fast_path=True, parse_float=str)
+
+        self.assertEqual(result, ['1.5'])
+
+    def test_004_custom_hook_disables_fast_path(self):
+        decoder = JsonDecoder(fast_path=True, object_hook=lambda d: 42)
+
+        self.assertFalse(decoder.fast_path)
+        self.assertEqual(decoder.decode('[{}]'), [42])
+
+
+class TestBytes(unittest.TestCase):
+    def test_000_dumps_bytes(self):
+        result = dumps_bytes({'a': 'ä'}, ensure_ascii=False)
+
+        self.assertEqual(result, '{"a": "ä"}'.encode('utf-8'))
+        self.assertEqual(loads(result), {'a': 'ä'})
+
+    def test_001_dump_into_bytearray(self):
+        buffer = bytearray()
+
+        self.assertEqual(dump_into(Point(1, 2), buffer), len(buffer))
+        dump_into([], buffer)
+
+        self.assertTrue(buffer.endswith(b'[]'))
+        self.assertEqual(loads(bytes(buffer[:-2])), Point(1, 2))
+
+    def test_002_dump_into_memoryview(self):
+        buffer = memoryview(bytearray(16))
+
+        size = dump_into([1, 2], buffer, offset=4)
+
+        self.assertEqual(bytes(buffer[4:4 + size]), b'[1, 2]')
+        self.assertEqual(bytes(buffer[:4]), bytes(4))
+
+    def test_003_buffer_too_small(self):
+        buffer = bytearray(4)
+
+        with self.assertRaisesRegex(ValueError, '6 bytes'):
+            dump_into([1, 2], memoryview(buffer))
+        self.assertEqual(buffer, bytes(4))
+
+    def test_004_large_document(self):
+        doc = [{'i': i, 'ä': [Point(i, str(i))]} for i in range(20000)]
+        expected = dumps_bytes(doc, ensure_ascii=False)
+        buffer = memoryview(bytearray(len(expected) + 1))
+
+        self.assertEqual(dump_into(doc, buffer, offset=1, ensure_ascii=False), len(expected))
+        self.assertEqual(bytes(buffer[1:]), expected)
+
+        buffer[:] = bytes(len(buffer))
+        with self.assertRaisesRegex(ValueError, '{} bytes'.format(len(expected))):
+            dump_into(doc, buffer, offset=2, ensure_ascii=False)
+        self.assertEqual(bytes(buffer), bytes(len(buffer)))
+
+    def test_005_iterators(self):
+        buffer = bytearray()
+
+        dump_into({'a': iter([Point(1, 2)] * DUMP_PIECE_SIZE)}, buffer)
+
+        self.assertEqual(loads(bytes(buffer)), {'a': [Point(1, 2)] * DUMP_PIECE_SIZE})
+
+    def test_006_failed_encoding(self):
+        buffer = bytearray(b'[]')
+
+        with self.assertRaises(TypeError):
+            dump_into([1] * DUMP_PIECE_SIZE + [object()], buffer)
+        self.assertEqual(buffer, b'[]')
+
+
+class Cursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+
+class TestLazyEncoding(unittest.TestCase):
+    def setUp(self):
+        @encoders.register(Cursor)
+        def encode_cursor(cursor):
+            return iter(cursor.rows)
+
+        decoders.add(Cursor, lambda rows: Cursor(rows))
+
+    def tearDown(self):
+        del encoders[Cursor]
+        del decoders[Cursor]
+
+    def test_000_generator(self):
+        result = JsonEncoder().encode({'a': (i for i in range(3)), 'b': [1, iter([])]})
+
+        self.assertEqual(json.loads(result), {'a': [0, 1, 2], 'b': [1, []]})
+
+    def test_001_consumed_while_writing(self):
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield i
+
+        chunks = JsonEncoder().iterencode([rows()])
+
+        self.assertEqual(consumed, [])
+        self.assertEqual(json.loads(''.join(chunks)), [[0, 1, 2]])
+
+    def test_002_registered_encoder(self):
+        data = JsonEncoder().encode([Cursor([1, 2]), Cursor([Point(1, 2)])])
+
+        self.assertEqual([cursor.rows for cursor in loads(data)], [[1, 2], [Point(1, 2)]])
+        self.assertIn('"__json_data__": [1, 2]', data)
+
+    def test_003_formatting(self):
+        value = {'b': [1, {'c': [1, 2]}], 'a': ('x' for _ in range(2))}
+        expected = {'b': [1, {'c': [1, 2]}], 'a': ['x', 'x']}
+
+        for kwargs in ({'indent': 2}, {'indent': '\t', 'sort_keys': True}, {'separators': (',', ':')}):
+            value['a'] = ('x' for _ in range(2))
+            self.assertEqual(JsonEncoder(**kwargs).encode(value), json.dumps(expected, **kwargs))
+
+    def test_004_circular_reference(self):
+        a = []  # type: list
+        a.append(iter([a]))
+
+        self.assertRaises(ValueError, JsonEncoder().encode, a)
+
+    def test_005_converted_once_or_twice(self):
+        calls = []  # type: list
+        cursors = []  # type: list
+
+        class Wrapper:
+            def __init__(self, child):
+                self.child = child
+
+            def to_dict(self) -> dict:
+                calls.append(self)
+                return {'child': self.child, 'siblings': [Point(1, 2)]}
+
+            @classmethod
+            def from_dict(cls, d: dict) -> 'Wrapper':
+                return cls(d['child'])
+
+        del encoders[Cursor]
+        encoders.register(Cursor)(lambda cursor: cursors.append(cursor) or iter(cursor.rows))
+        doc = Cursor([1])
+        for _ in range(10):
+            doc = Wrapper(doc)
+
+        for encode in (JsonEncoder().encode, lambda value: ''.join(JsonEncoder().iterencode(value))):
+            calls.clear()
+            cursors.clear()
+            result = json.loads(encode([doc]))[0]
+
+            self.assertEqual(len(cursors), 1)
+            self.assertLessEqual(max(calls.count(wrapper) for wrapper in calls), 2)
+            for _ in range(10):
+                result = result['__json_data__']['child']
+            self.assertEqual(result['__json_data__'], [1])
+
+
+class TestIntern(unittest.TestCase):
+    def test_000_repeated_values(self):
+        result = JsonDecoder(intern=True).decode('[{"a": "EUR1", "b": ["EUR1"]}, {"a": "EUR1"}, "EUR1"]')
+
+        self.assertIs(result[0]['a'], result[1]['a'])
+        self.assertIs(result[0]['a'], result[0]['b'][0])
+        self.assertIs(result[0]['a'], result[2])
+
+    def test_001_shared_between_documents(self):
+        decoder = JsonDecoder(intern=True)
+
+        self.assertIs(decoder.decode('["EUR1"]')[0], decoder.decode('{"a": "EUR1"}')['a'])
+
+    def test_002_bounded(self):
+        result = JsonDecoder(intern=1).decode('["EUR1", "USD1", "USD1"]')
+
+        self.assertIsNot(result[1], result[2])
+        self.assertEqual(result[1], result[2])
+
+    def test_003_long_strings(self):
+        value = 'x' * 100
+        result = JsonDecoder(intern=True).decode(json.dumps([value, value]))
+
+        self.assertIsNot(result[0], result[1])
+
+    def test_004_classes_imported_once(self):
+        data = json.dumps([{'__cls__': obj_spec(Point)}] * 3)
+
+        with mock.patch('jsoner.serialization.import_object', wraps=import_object) as imported:
+            result = JsonDecoder(intern=True).decode(data)
+
+        self.assertEqual(result, [Point] * 3)
+        self.assertEqual(imported.call_count, 1)
+
+    def test_005_objects(self):
+        data = dumps_bytes([Point('a', 'EUR1'), Point('b', 'EUR1')]).decode()
+
+        for kwargs in ({}, {'fast_path': True}):
+            result = JsonDecoder(intern=True, **kwargs).decode(data)
+            self.assertEqual(result, [Point('a', 'EUR1'), Point('b', 'EUR1')])
+            self.assertIs(result[0].y, result[1].y)
+
+
+class TestEstimateSize(unittest.TestCase):
+    def test_000_exact(self):
+        docs = [
+            {'a': ['b', 1.5, None, True]},
+            {'äö€😀': [Point(1, 'x"\n'), (), {}, {1: False, None: [2 ** 70]}]},
+            [[[]], {}, ''],
+            [Point(1, 2), Point(3, 4)],
+        ]
+        options = [{}, {'indent': 2}, {'indent': '\t'}, {'ensure_ascii': False}, {'separators': (',', ':')},
+                   {'canonical': True}, {'columnar': True}, {'envelope': False}]
+        for doc in docs:
+            for kwargs in options:
+                self.assertEqual(estimate_size(doc, sample=None, **kwargs), len(dumps_bytes(doc, **kwargs)),
+                                 (doc, kwargs))
+
+    def test_001_sample(self):
+        doc = [{'id': i, 'p': Point(i, 'x' * (i % 7))} for i in range(1000)]
+
+        estimated = estimate_size(doc, sample=50)
+
+        self.assertAlmostEqual(estimated / len(dumps_bytes(doc)), 1, delta=0.01)
+
+    def test_002_large_lists(self):
+        doc = {'rows': [{'id': i, 'name': 'ä' * (i % 7), 'p': Point(i, [1.5] * (i % 3))} for i in range(5000)],
+               'values': list(range(3000)), 1: [None, True]}
+
+        for kwargs in ({}, {'indent': 2, 'ensure_ascii': False}):
+            self.assertEqual(estimate_size(doc, sample=None, **kwargs), len(dumps_bytes(doc, **kwargs)), kwargs)
+        self.assertAlmostEqual(estimate_size(doc, sample=1000) / len(dumps_bytes(doc)), 1, delta=0.01)
+
+    def test_003_exact_by_default(self):
+        doc = [1] * 5000 + ['x' * 10 ** 6]
+
+        self.assertEqual(estimate_size(doc), len(dumps_bytes(doc)))
+        self.assertEqual(estimate_size(doc, indent=2), len(dumps_bytes(doc, indent=2)))
+
+    def test_004_errors(self):
+        with self.assertRaises(JsonEncodingError):
+            estimate_size([iter([1])])
+
+        doc = [1]
+        doc.append(doc)
+        with self.assertRaises(ValueError):
+            estimate_size(doc)
+
+
+class TestCanonical(unittest.TestCase):
+    def test_000_canonical(self):
+        result = JsonEncoder(canonical=True, indent=2).encode({'b': -0.0, 'a': [1.0, 1.5, 'ä'], 2: None})
+
+        self.assertEqual(result, '{"2":null,"a":[1,1.5,"ä"],"b":0}')
+
+    def test_001_objects(self):
+        encoder = JsonEncoder(canonical=True)
+
+        self.assertEqual(encoder.encode(Point(1.0, -0.0)), encoder.encode(Point(1, 0)))
+        self.assertEqual(loads(encoder.encode(Point(1.5, 2))), Point(1.5, 2))
+
+    def test_002_iterators(self):
+        result = JsonEncoder(canonical=True).encode({'a': iter([{'c': 1.0, 'b': 2}])})
+
+        self.assertEqual(result, '{"a":[{"b":2,"c":1}]}')
+
+    def test_003_invalid(self):
+        encoder = JsonEncoder(canonical=True)
+
+        self.assertRaises(ValueError, encoder.encode, float('nan'))
+        self.assertRaises(JsonEncodingError, encoder.encode, {1: 'a', '1': 'b'})
+
+    def test_004_digest(self):
+        self.assertEqual(digest({'a': 1, 'b': [Point(1.0, 2)]}), digest({'b': (Point(1, 2.0),), 'a': 1.0}))
+        self.assertNotEqual(digest({'a': 1}), digest({'a': 2}))
+        self.assertEqual(len(digest([], algo='sha256')), 64)
+
+
+class Table:
+    def __init__(self, name, rows):
+        self.name = name
+        self.rows = rows
+
+    def __eq__(self, other):
+        return isinstance(other, Table) and (self.name, list(self.rows)) == (other.name, list(other.rows))
+
+    def iter_json_items(self):
+        yield 'name', self.name
+        yield 'rows', iter(self.rows)
+
+    @classmethod
+    def from_json_items(cls, items):
+        data = dict(items)
+        return cls(data['name'], data['rows'])
+
+
+class TestItemsConvertible(unittest.TestCase):
+    def test_000_subclass(self):
+        self.assertTrue(issubclass(Table, ItemsConvertible))
+        self.assertTrue(isinstance(Table('a', []), JsonerSerializable))
+
+    def test_001_round_trip(self):
+        table = Table('a', [Point(1, 2), {'b': 3}])
+
+        self.assertEqual(loads(JsonEncoder().encode([table, Table('b', [])])), [table, Table('b', [])])
+
+    def test_002_consumed_while_writing(self):
+        consumed = []
+
+        def rows():
+            for i in range(3):
+                consumed.append(i)
+                yield [i]
+
+        chunks = JsonEncoder().iterencode(Table('a', rows()))
+        first = next(chunks)
+
+        self.assertEqual(consumed, [])
+        self.assertEqual(json.loads(first + ''.join(chunks))['__json_data__']['rows'], [[0], [1], [2]])
+
+    def test_003_canonical(self):
+        result = JsonEncoder(canonical=True, envelope=False).encode(Table('a', [1.0]))
+
+        self.assertEqual(result, '{"name":"a","rows":[1]}')
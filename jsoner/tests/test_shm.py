@@ -0,0 +1,68 @@
+import pickle
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+
+from ..serialization import dumps
+from ..shm import SHARED_PIECE_SIZE
+from ..shm import SharedPayload
+from ..shm import dump_shared
+from ..shm import load_shared
+from .test_serialization import Point
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:  # Python < 3.8
+    shared_memory = None  # type: ignore
+
+
+def _load_and_count(handle: SharedPayload) -> int:
+    return len(load_shared(handle))
+
+
+@unittest.skipIf(shared_memory is None, 'shared memory requires Python 3.8')
+class TestSharedMemory(unittest.TestCase):
+    def test_000_round_trip(self):
+        data = {'points': [Point(i, 'ä') for i in range(10)]}
+
+        handle = dump_shared(data)
+
+        self.assertEqual(handle.size, len(dumps(data).encode('utf-8')))
+        self.assertEqual(load_shared(handle), data)
+        with self.assertRaises(FileNotFoundError):
+            shared_memory.SharedMemory(handle.name)
+
+    def test_001_keep_block(self):
+        handle = dump_shared([1, 2])
+        self.addCleanup(handle.unlink)
+
+        self.assertEqual(load_shared(handle, unlink=False), [1, 2])
+        self.assertEqual(load_shared(handle, unlink=False), [1, 2])
+
+    def test_002_pickle(self):
+        handle = dump_shared('')
+        self.addCleanup(handle.unlink)
+
+        copy = pickle.loads(pickle.dumps(handle))
+
+        self.assertEqual((copy.name, copy.size), (handle.name, 2))
+        self.assertEqual(repr(copy), 'SharedPayload(name={!r}, size=2)'.format(handle.name))
+
+    def test_003_process_pool(self):
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            count = executor.submit(_load_and_count, dump_shared([Point(i, i) for i in range(1000)])).result()
+
+        self.assertEqual(count, 1000)
+
+    def test_004_non_ascii(self):
+        handle = dump_shared(['ä', 'ö'], ensure_ascii=False)
+
+        self.assertEqual(handle.size, len(dumps(['ä', 'ö'], ensure_ascii=False).encode('utf-8')))
+        self.assertEqual(load_shared(handle), ['ä', 'ö'])
+
+    def test_005_pieces(self):
+        data = ['x' * SHARED_PIECE_SIZE, Point(1, 'ä')]
+
+        handle = dump_shared(data)
+
+        self.assertEqual(handle.size, len(dumps(data)))
+        self.assertEqual(load_shared(handle), data)
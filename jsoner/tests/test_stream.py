@@ -0,0 +1,97 @@
+import io
+import os
+import tempfile
+import unittest
+
+from ..errors import JsonDecodingError
+from ..serialization import dumps
+from ..stream import dump_lines
+from ..stream import iterload
+from ..stream import iterload_lines
+from ..stream import load_path
+from .test_serialization import Point
+
+
+class TestIterload(unittest.TestCase):
+    def test_000_small_chunks(self):
+        data = [12345, 'abc', {'a': [1, 2.5, None]}, [], True, Point(1, 2)]
+        text = dumps(data)
+
+        for chunk_size in (1, 2, 3, 7, 1000):
+            result = list(iterload(io.StringIO(text), chunk_size=chunk_size))
+            self.assertEqual(result, data)
+
+    def test_001_bytes(self):
+        text = dumps(['äöü€', Point('ß', 1)], ensure_ascii=False)
+
+        result = list(iterload(io.BytesIO(text.encode('utf-8')), chunk_size=1))
+
+        self.assertEqual(result, ['äöü€', Point('ß', 1)])
+
+    def test_002_empty_array(self):
+        self.assertEqual(list(iterload(io.StringIO(' [ ] '))), [])
+
+    def test_003_not_an_array(self):
+        with self.assertRaises(JsonDecodingError):
+            list(iterload(io.StringIO('{"a": 1}')))
+
+    def test_004_invalid_documents(self):
+        for text in ('[1 2]', '[1, 2', '[1, }', '[1] 2'):
+            with self.assertRaises(JsonDecodingError, msg=text):
+                list(iterload(io.StringIO(text), chunk_size=2))
+
+    def test_005_lazy(self):
+        elements = iterload(io.StringIO('[1, 2, x]'))
+
+        self.assertEqual(next(elements), 1)
+        self.assertEqual(next(elements), 2)
+        with self.assertRaises(JsonDecodingError):
+            next(elements)
+
+
+class TestLoadPath(unittest.TestCase):
+    def write(self, text: str) -> str:
+        fd, path = tempfile.mkstemp(suffix='.json')
+        with os.fdopen(fd, 'w', encoding='utf-8') as fp:
+            fp.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def test_000_array(self):
+        path = self.write(dumps([Point(1, 2), {'a': 'ä'}]))
+
+        for mmap in (True, False):
+            self.assertEqual(load_path(path, mmap=mmap, chunk_size=4), [Point(1, 2), {'a': 'ä'}])
+
+    def test_001_object(self):
+        path = self.write(dumps({'a': Point(1, 2)}))
+
+        for mmap in (True, False):
+            self.assertEqual(load_path(path, mmap=mmap), {'a': Point(1, 2)})
+
+    def test_002_empty_file(self):
+        path = self.write('')
+
+        with self.assertRaises(ValueError):
+            load_path(path)
+
+
+class TestLines(unittest.TestCase):
+    def test_000_round_trip(self):
+        fp = io.StringIO()
+        data = [Point(1, 2), {'a': 'b\nc'}, [1]]
+
+        self.assertEqual(dump_lines(data, fp), 3)
+        self.assertEqual(fp.getvalue().count('\n'), 3)
+
+        fp.seek(0)
+        self.assertEqual(list(iterload_lines(fp)), data)
+
+    def test_001_bytes_and_empty_lines(self):
+        fp = io.BytesIO(b'1\n\n"\xc3\xa4"\n')
+
+        self.assertEqual(list(iterload_lines(fp)), [1, 'ä'])
+
+    def test_002_indent(self):
+        with self.assertRaises(ValueError):
+            dump_lines([1], io.StringIO(), indent=2)
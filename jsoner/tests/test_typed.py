@@ -0,0 +1,149 @@
+import json
+import typing as T
+import unittest
+
+from ..errors import JsonDecodingError
+from ..registry import decoders
+from ..serialization import JsonEncoder
+from ..serialization import loads
+from ..typed import compile_plan
+from ..typed import decode_into
+from .test_serialization import Point
+from .test_serialization import Record
+from .test_serialization import Table
+
+try:
+    import dataclasses
+except ImportError:  # pragma: no cover
+    dataclasses = None  # type: ignore
+
+if dataclasses is not None:
+    @dataclasses.dataclass
+    class Node:
+        name: str
+        weight: float = 0.0
+        children: T.List['Node'] = dataclasses.field(default_factory=list)
+        point: T.Optional[Point] = None
+
+    @dataclasses.dataclass
+    class Holder:
+        names: T.Dict[int, str]
+
+
+class TestCompilePlan(unittest.TestCase):
+    def test_000_primitives(self):
+        self.assertEqual(decode_into(1, int), 1)
+        self.assertEqual(decode_into(1, float), 1.0)
+        self.assertIsInstance(decode_into(1, float), float)
+        self.assertEqual(decode_into('a', str), 'a')
+        self.assertIsNone(decode_into(None, type(None)))
+
+    def test_001_containers(self):
+        self.assertEqual(decode_into([[1, 2]], T.List[T.Tuple[int, float]]), [(1, 2.0)])
+        self.assertEqual(decode_into([1, 1], T.Set[int]), {1})
+        self.assertEqual(decode_into([1], T.FrozenSet[int]), frozenset({1}))
+        self.assertEqual(decode_into([1, 2], T.Tuple[int, ...]), (1, 2))
+        self.assertEqual(decode_into({'a': [1]}, T.Dict[str, T.List[float]]), {'a': [1.0]})
+        self.assertEqual(decode_into([1], list), [1])
+
+    def test_002_plans_are_cached(self):
+        self.assertIs(compile_plan(T.List[Point]), compile_plan(T.List[Point]))
+
+    def test_003_optional(self):
+        plan = compile_plan(T.Optional[Point])
+
+        self.assertIsNone(plan(None))
+        self.assertEqual(plan({'x': 1, 'y': 2}), Point(1, 2))
+
+    def test_004_union(self):
+        plan = compile_plan(T.Union[T.Tuple[int, int], int])
+
+        self.assertEqual(plan([1, 2]), (1, 2))
+        self.assertEqual(plan(3), 3)
+        with self.assertRaises(JsonDecodingError):
+            plan([1, 2, 3])
+
+    def test_005_envelopes_are_accepted(self):
+        data = json.loads(JsonEncoder().encode([Point(1, 2)]))
+
+        self.assertEqual(decode_into(data, T.List[Point]), [Point(1, 2)])
+
+    def test_006_any_revives_envelopes(self):
+        data = json.loads(JsonEncoder().encode({'a': Point(1, 2)}))
+
+        self.assertEqual(decode_into(data, T.Dict[str, T.Any]), {'a': Point(1, 2)})
+
+    def test_007_unknown_type(self):
+        class A:
+            pass
+
+        with self.assertRaises(TypeError):
+            compile_plan(A)
+
+    def test_008_scalar_keys(self):
+        data = json.loads(JsonEncoder().encode({1: 'a', -2: 'b'}))
+
+        self.assertEqual(decode_into(data, T.Dict[int, str]), {1: 'a', -2: 'b'})
+        self.assertEqual(decode_into({'1.5': 1, 'Infinity': 2}, T.Dict[float, int]), {1.5: 1, float('inf'): 2})
+        self.assertEqual(decode_into({'true': 1, 'false': 0}, T.Dict[bool, int]), {True: 1, False: 0})
+        self.assertEqual(decode_into({'null': 1}, T.Dict[None, int]), {None: 1})
+        self.assertEqual(decode_into({'1': 2}, T.Dict[str, int]), {'1': 2})
+        with self.assertRaises(JsonDecodingError):
+            decode_into({'a': 1}, T.Dict[int, int])
+
+    def test_009_batch_decoder(self):
+        calls = []
+
+        @decoders.register_batch(Record)
+        def decode(pks, cls):
+            calls.append(pks)
+            return [cls(pk) for pk in pks]
+
+        try:
+            result = decode_into([1, 2], T.List[Record])
+        finally:
+            del decoders[Record]
+
+        self.assertEqual([r.pk for r in result], [1, 2])
+        self.assertEqual(calls, [[1, 2]])
+
+
+class TestLoadsInto(unittest.TestCase):
+    def test_000_without_envelope(self):
+        data = JsonEncoder(envelope=False).encode([Point(1, 2), Point(3, 4)])
+
+        self.assertEqual(json.loads(data), [{'x': 1, 'y': 2}, {'x': 3, 'y': 4}])
+        self.assertEqual(loads(data, into=T.List[Point]), [Point(1, 2), Point(3, 4)])
+
+    def test_001_columnar_without_envelope(self):
+        points = [Point(1, 2), Point(3, 4)]
+        data = JsonEncoder(envelope=False, columnar=True).encode(points)
+
+        self.assertNotIn('__columnar_cls__', data)
+        self.assertEqual(loads(data, into=T.List[Point]), points)
+
+    @unittest.skipIf(dataclasses is None, 'dataclasses are not available')
+    def test_002_dataclass(self):
+        tree = Node('root', 1.5, [Node('leaf', point=Point(1, 2))])
+        data = JsonEncoder(envelope=False).encode(tree)
+
+        self.assertNotIn('__obj_cls__', data)
+        self.assertEqual(loads(data, into=Node), tree)
+
+    @unittest.skipIf(dataclasses is None, 'dataclasses are not available')
+    def test_003_dataclass_with_envelope_is_not_serializable(self):
+        with self.assertRaises(TypeError):
+            JsonEncoder().encode(Node('root'))
+
+    @unittest.skipIf(dataclasses is None, 'dataclasses are not available')
+    def test_004_dataclass_with_int_keys(self):
+        holder = Holder({5: 'a', 7: 'b'})
+
+        self.assertEqual(loads(JsonEncoder(envelope=False).encode(holder), into=Holder), holder)
+        self.assertEqual(loads('{"1": 2}', into=T.Dict[int, int]), {1: 2})
+
+    def test_005_items_convertible(self):
+        tables = [Table('a', [1, 2]), Table('b', [])]
+        data = JsonEncoder(envelope=False).encode(tables)
+
+        self.assertEqual(loads(data, into=T.List[Table]), tables)
@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+
+"""
+Decoding driven by type annotations.
+
+If both sides know the schema, the objects can be written without
+envelopes (``dumps(obj, envelope=False)``) and the type is passed to
+:func:`jsoner.loads` instead::
+
+    >>> from typing import List
+    >>> from jsoner import dumps, loads
+
+    >>> class Order:
+    ...     def __init__(self, amount):
+    ...         self.amount = amount
+    ...
+    ...     def to_dict(self):
+    ...         return {'amount': self.amount}
+    ...
+    ...     @classmethod
+    ...     def from_dict(cls, data):
+    ...         return cls(**data)
+
+    >>> data = dumps([Order(1), Order(2)], envelope=False)
+    >>> data
+    '[{"amount": 1}, {"amount": 2}]'
+    >>> [order.amount for order in loads(data, into=List[Order])]
+    [1, 2]
+
+For each type a decoding plan is compiled once and cached, so decoding does
+neither inspect the annotations nor import classes.
+
+Supported are ``List``, ``Tuple``, ``Set``, ``FrozenSet``, ``Dict`` and
+their abstract counterparts, ``Union`` and ``Optional``, dataclasses and
+every type which *Jsoner* can decode, i.e. types implementing
+``from_json_items``, ``from_dict`` or ``from_str`` or with a registered
+decoder. Parts which are typed as ``Any`` are decoded like
+:func:`jsoner.loads` does, based on the envelopes.
+"""
+
+import collections.abc
+import typing as T
+
+from .errors import JsonDecodingError
+from .registry import BatchFunction
+from .registry import decoders
+from .serialization import DictConvertible
+from .serialization import ItemsConvertible
+from .serialization import StrConvertible
+from .serialization import _call_decoder
+from .serialization import _columnar_rows
+from .serialization import _revive_copy
+from .serialization import json_hook
+
+Plan = T.Callable[[T.Any], T.Any]
+
+_plans = {}  # type: T.Dict[T.Any, Plan]
+
+_SEQUENCES = (list, collections.abc.Sequence, collections.abc.MutableSequence,
+              collections.abc.Iterable, collections.abc.Collection)
+_SETS = (set, collections.abc.Set, collections.abc.MutableSet)
+_MAPPINGS = (dict, collections.abc.Mapping, collections.abc.MutableMapping)
+
+
+def compile_plan(tp: T.Any) -> Plan:
+    """
+    Returns a function which turns the json primitive into an instance
+    of ``tp``. The plans are cached.
+
+    Usage::
+        >>> from typing import Dict, Tuple
+        >>> from jsoner.typed import compile_plan
+        >>> plan = compile_plan(Dict[str, Tuple[int, float]])
+        >>> plan({'a': [1, 2]})
+        {'a': (1, 2.0)}
+
+    :param tp: A type or typing annotation.
+    :return:
+    :raise TypeError: If no plan can be compiled for the type.
+    """
+    try:
+        return _plans[tp]
+    except KeyError:
+        pass
+    except TypeError:
+        # unhashable annotations are compiled each time
+        return _compile(tp)
+
+    plan = _compile(tp)
+    _plans[tp] = plan
+    return plan
+
+
+def decode_into(primitive: T.Any, tp: T.Any) -> T.Any:
+    """
+    Decodes the json primitive into an instance of ``tp``.
+
+    :param primitive:
+    :param tp:
+    :return:
+    """
+    return compile_plan(tp)(primitive)
+
+
+def _compile(tp: T.Any) -> Plan:
+    if tp is T.Any or tp is object:
+        return _revive
+    if tp is None or tp is type(None):
+        return _identity
+    if tp is float:
+        return _to_float
+    if tp in (int, str, bool):
+        return _identity
+
+    origin = getattr(tp, '__origin__', None)
+    args = getattr(tp, '__args__', None) or ()  # type: T.Tuple[T.Any, ...]
+
+    # ``X | Y`` creates a ``types.UnionType`` instead of ``typing.Union``
+    if origin is T.Union or type(tp).__name__ == 'UnionType':
+        return _compile_union(args)
+    if origin is tuple or tp is tuple:
+        return _compile_tuple(args)
+    if origin in _SEQUENCES or tp in _SEQUENCES:
+        return _compile_list(args[0] if args else T.Any)
+    if origin in _SETS or tp in _SETS:
+        return _compile_collection(set, args[0] if args else T.Any)
+    if origin is frozenset or tp is frozenset:
+        return _compile_collection(frozenset, args[0] if args else T.Any)
+    if origin in _MAPPINGS or tp in _MAPPINGS:
+        key_type, value_type = args if len(args) == 2 else (T.Any, T.Any)
+        return _compile_dict(key_type, value_type)
+
+    if isinstance(tp, type):
+        return _compile_class(tp)
+
+    raise TypeError('Cannot decode into `{!r}`.'.format(tp))
+
+
+def _identity(value: T.Any) -> T.Any:
+    return value
+
+
+def _to_float(value: T.Any) -> T.Any:
+    if type(value) is int:
+        return float(value)
+    return value
+
+
+def _revive(value: T.Any) -> T.Any:
+    """
+    Revives the envelopes within an untyped value, like :func:`jsoner.loads`
+    does.
+    """
+    return _revive_copy(value, json_hook)
+
+
+def _compile_union(args: T.Tuple) -> Plan:
+    optional = type(None) in args
+    plans = [compile_plan(arg) for arg in args if arg is not type(None)]
+
+    if len(plans) == 1:
+        plan = plans[0]
+
+        def decode_optional(value: T.Any) -> T.Any:
+            return None if value is None else plan(value)
+        return decode_optional
+
+    # the plans of primitives do not check the value, thus it is done here
+    primitives = {int: (int,), float: (int, float), str: (str,), bool: (bool,)}
+    checks = [primitives.get(arg) for arg in args if arg is not type(None)]
+
+    def decode_union(value: T.Any) -> T.Any:
+        if value is None and optional:
+            return None
+        errors = []
+        for plan, check in zip(plans, checks):
+            if check is not None:
+                if isinstance(value, check):
+                    return plan(value)
+                continue
+            try:
+                return plan(value)
+            except Exception as error:
+                errors.append(error)
+        raise JsonDecodingError('No type of the union matches `{!r}`: {}'.format(value, errors))
+    return decode_union
+
+
+def _compile_list(item_type: T.Any) -> Plan:
+    plan = compile_plan(item_type)
+    batch = _batch_decoder(item_type)
+
+    def decode_list(value: T.Any) -> T.Any:
+        value = _unwrap_columnar(value)
+        if batch is not None:
+            return list(_call_decoder(batch, [_unwrap(item) for item in value], item_type))
+        if plan is _identity:
+            return value
+        return [plan(item) for item in value]
+    return decode_list
+
+
+def _compile_tuple(args: T.Tuple) -> Plan:
+    if not args:
+        return _compile_collection(tuple, T.Any)
+    if len(args) == 2 and args[1] is Ellipsis:
+        return _compile_collection(tuple, args[0])
+
+    plans = [compile_plan(arg) for arg in args]
+
+    def decode_tuple(value: T.Any) -> T.Any:
+        if len(value) != len(plans):
+            raise JsonDecodingError('Expected {} items, got {}.'.format(len(plans), len(value)))
+        return tuple(plan(item) for plan, item in zip(plans, value))
+    return decode_tuple
+
+
+def _compile_collection(factory: T.Callable, item_type: T.Any) -> Plan:
+    plan = compile_plan(item_type)
+
+    def decode_collection(value: T.Any) -> T.Any:
+        return factory(plan(item) for item in _unwrap_columnar(value))
+    return decode_collection
+
+
+def _compile_dict(key_type: T.Any, value_type: T.Any) -> Plan:
+    key_plan = _compile_key(key_type)
+    value_plan = compile_plan(value_type)
+
+    def decode_dict(value: T.Any) -> T.Any:
+        return {key_plan(key): value_plan(item) for key, item in value.items()}
+    return decode_dict
+
+
+def _compile_key(key_type: T.Any) -> Plan:
+    """
+    The keys of json objects are strings, thus keys of other scalar types
+    are parsed the way the builtin encoder wrote them.
+    """
+    parse = _KEY_PARSERS.get(key_type)
+    if parse is None:
+        plan = compile_plan(key_type)
+        return _identity if plan is _revive else plan
+
+    def decode_key(key: T.Any) -> T.Any:
+        if type(key) is not str:
+            return key
+        try:
+            return parse(key)
+        except ValueError:
+            raise JsonDecodingError('The key `{}` is not a valid `{!r}`.'.format(key, key_type)) from None
+    return decode_key
+
+
+def _parse_bool(key: str) -> bool:
+    if key == 'true':
+        return True
+    elif key == 'false':
+        return False
+    raise ValueError(key)
+
+
+def _parse_none(key: str) -> None:
+    if key != 'null':
+        raise ValueError(key)
+
+
+_KEY_PARSERS = {
+    int: int,
+    float: float,
+    bool: _parse_bool,
+    type(None): _parse_none,
+}  # type: T.Dict[T.Any, T.Callable[[str], T.Any]]
+
+
+def _compile_class(cls: type) -> Plan:
+    if issubclass(cls, ItemsConvertible):
+        def decode_items_convertible(value: T.Any) -> T.Any:
+            return cls.from_json_items(iter(_unwrap(value).items()))
+        return decode_items_convertible
+
+    if issubclass(cls, DictConvertible):
+        def decode_dict_convertible(value: T.Any) -> T.Any:
+            return cls.from_dict(_unwrap(value))
+        return decode_dict_convertible
+
+    if issubclass(cls, StrConvertible):
+        def decode_str_convertible(value: T.Any) -> T.Any:
+            return cls.from_str(_unwrap(value))
+        return decode_str_convertible
+
+    decoder = decoders.get(cls)
+    if decoder is not None:
+        if isinstance(decoder, BatchFunction):
+            def decode_batch(value: T.Any) -> T.Any:
+                return _call_decoder(decoder, [_unwrap(value)], cls)[0]
+            return decode_batch
+        elif callable(decoder):
+            def decode_registered(value: T.Any) -> T.Any:
+                return _call_decoder(decoder, _unwrap(value), cls)
+            return decode_registered
+        else:
+            return lambda value: decoder
+
+    if hasattr(cls, '__dataclass_fields__'):
+        return _compile_dataclass(cls)
+
+    raise TypeError('Cannot decode into `{!r}`.'.format(cls))
+
+
+def _compile_dataclass(cls: type) -> Plan:
+    plans = {}  # type: T.Dict[str, Plan]
+
+    def decode_dataclass(value: T.Any) -> T.Any:
+        if not plans:
+            # compiled on first use, so dataclasses may refer to themselves
+            import dataclasses
+            hints = T.get_type_hints(cls)
+            for field in dataclasses.fields(cls):
+                if field.init:
+                    plans[field.name] = compile_plan(hints.get(field.name, T.Any))
+        value = _unwrap(value)
+        return cls(**{name: plans[name](item) for name, item in value.items() if name in plans})
+    return decode_dataclass
+
+
+def _batch_decoder(tp: T.Any) -> T.Optional[BatchFunction]:
+    if not isinstance(tp, type) or issubclass(tp, (ItemsConvertible, DictConvertible, StrConvertible)):
+        return None
+    decoder = decoders.get(tp)
+    if isinstance(decoder, BatchFunction):
+        return decoder
+    return None
+
+
+def _unwrap(value: T.Any) -> T.Any:
+    """
+    Returns the object data if the value still has an envelope.
+    """
+    if isinstance(value, dict) and '__obj_cls__' in value:
+        return value.get('__json_data__')
+    return value
+
+
+def _unwrap_columnar(value: T.Any) -> T.Any:
+    """
+    Returns the rows of a list which was encoded column-wise.
+    """
+    if isinstance(value, dict) and '__columns__' in value:
+        return _columnar_rows(value)
+    return value
@@ -31,6 +31,9 @@ setup(
         'Programming Language :: Python :: 3.6',
         'Programming Language :: Python :: 3.7',
     ],
+    entry_points={
+        'console_scripts': ['jsoner=jsoner.cli:main'],
+    },
     description="Jsoner allows you to easily "
                 "convert your classes to json and back.",
     long_description_content_type='text/x-rst',